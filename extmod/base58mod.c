@@ -0,0 +1,127 @@
+/*
+  mmgen = Multi-Mode GENerator, command-line Bitcoin cold storage solution
+  Copyright (C)2013-2025 The MMGen Project <mmgen@tuta.io>
+
+  This program is free software: you can redistribute it and/or modify it under
+  the terms of the GNU General Public License as published by the Free Software
+  Foundation, either version 3 of the License, or (at your option) any later
+  version.
+
+  This program is distributed in the hope that it will be useful, but WITHOUT
+  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+  FOR A PARTICULAR PURPOSE.  See the GNU General Public License for more
+  details.
+
+  You should have received a copy of the GNU General Public License along with
+  this program.  If not, see <http://www.gnu.org/licenses/>.
+*/
+
+/*
+   Bitcoin-style Base58 encoding of a list of byte strings.  Checksums, where
+   required, are appended by the caller.
+*/
+
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+#include <string.h>
+
+#define MAX_INPUT_LEN 128
+#define MAX_OUTPUT_LEN (MAX_INPUT_LEN * 138 / 100 + 1)
+
+static const char b58a[] = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz";
+
+static PyObject * encode(const unsigned char *in, Py_ssize_t in_len) {
+	unsigned char digits[MAX_OUTPUT_LEN];
+	char out[MAX_OUTPUT_LEN];
+	Py_ssize_t zeroes = 0, len = 0, size, i, j, k;
+
+	while (zeroes < in_len && in[zeroes] == 0) {
+		zeroes++;
+	}
+	size = (in_len - zeroes) * 138 / 100 + 1; /* log(256) / log(58), rounded up */
+	memset(digits, 0, size);
+
+	/* digits are stored big-endian in the last ‘len’ bytes of ‘digits’ */
+	for (i = zeroes; i < in_len; i++) {
+		unsigned int carry = in[i];
+		for (j = 0, k = size - 1; (carry || j < len) && k >= 0; j++, k--) {
+			carry += 256 * digits[k];
+			digits[k] = carry % 58;
+			carry /= 58;
+		}
+		len = j;
+	}
+
+	for (i = size - len; i < size && digits[i] == 0; i++)
+		;
+	memset(out, '1', zeroes);
+	for (j = zeroes; i < size; i++, j++) {
+		out[j] = b58a[digits[i]];
+	}
+	return PyUnicode_DecodeASCII(out, j, NULL);
+}
+
+static PyObject * b58encode_batch(PyObject *self, PyObject *args) {
+	PyObject *in_list, *seq, *ret;
+	Py_ssize_t n, i;
+
+	if (!PyArg_ParseTuple(args, "O", &in_list)) {
+		return NULL;
+	}
+	if (!(seq = PySequence_Fast(in_list, "argument must be a sequence of bytes objects"))) {
+		return NULL;
+	}
+	n = PySequence_Fast_GET_SIZE(seq);
+	if (!(ret = PyList_New(n))) {
+		Py_DECREF(seq);
+		return NULL;
+	}
+	for (i = 0; i < n; i++) {
+		PyObject *item = PySequence_Fast_GET_ITEM(seq, i), *s;
+		if (!PyBytes_Check(item)) {
+			PyErr_SetString(PyExc_TypeError, "argument must be a sequence of bytes objects");
+			goto error;
+		}
+		if (PyBytes_GET_SIZE(item) > MAX_INPUT_LEN) {
+			PyErr_Format(PyExc_ValueError, "input length exceeds %d bytes", MAX_INPUT_LEN);
+			goto error;
+		}
+		if (!(s = encode((unsigned char *)PyBytes_AS_STRING(item), PyBytes_GET_SIZE(item)))) {
+			goto error;
+		}
+		PyList_SET_ITEM(ret, i, s);
+	}
+	Py_DECREF(seq);
+	return ret;
+
+error:
+	Py_DECREF(seq);
+	Py_DECREF(ret);
+	return NULL;
+}
+
+static PyMethodDef base58_methods[] = {
+	{
+		"b58encode_batch",
+		b58encode_batch,
+		METH_VARARGS,
+		"Base58-encode a sequence of byte strings of at most 128 bytes, returning a list of strings"
+	},
+	{NULL, NULL}
+};
+
+static struct PyModuleDef moduledef = {
+		PyModuleDef_HEAD_INIT,
+		"base58",
+		NULL,
+		0,
+		base58_methods,
+		NULL,
+		NULL,
+		NULL,
+		NULL
+};
+
+PyMODINIT_FUNC PyInit_base58(void) {
+	return PyModule_Create(&moduledef);
+}
@@ -0,0 +1,178 @@
+/*
+  mmgen = Multi-Mode GENerator, command-line Bitcoin cold storage solution
+  Copyright (C)2013-2025 The MMGen Project <mmgen@tuta.io>
+
+  This program is free software: you can redistribute it and/or modify it under
+  the terms of the GNU General Public License as published by the Free Software
+  Foundation, either version 3 of the License, or (at your option) any later
+  version.
+
+  This program is distributed in the hope that it will be useful, but WITHOUT
+  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+  FOR A PARTICULAR PURPOSE.  See the GNU General Public License for more
+  details.
+
+  You should have received a copy of the GNU General Public License along with
+  this program.  If not, see <http://www.gnu.org/licenses/>.
+*/
+
+/*
+   scrypt ROMix function (RFC 7914, section 5), exposed separately so that the
+   independent lanes of a scrypt computation may be processed in parallel.  The
+   surrounding PBKDF2-HMAC-SHA256 steps are performed by the caller.
+*/
+
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+#include <stdint.h>
+#include <stdlib.h>
+#include <string.h>
+
+#define ROTL(a, b) (((a) << (b)) | ((a) >> (32 - (b))))
+
+static void salsa20_8(uint32_t B[16]) {
+	uint32_t x[16];
+	int i;
+	memcpy(x, B, 64);
+	for (i = 8; i > 0; i -= 2) {
+		/* columns */
+		x[ 4] ^= ROTL(x[ 0] + x[12],  7); x[ 8] ^= ROTL(x[ 4] + x[ 0],  9);
+		x[12] ^= ROTL(x[ 8] + x[ 4], 13); x[ 0] ^= ROTL(x[12] + x[ 8], 18);
+		x[ 9] ^= ROTL(x[ 5] + x[ 1],  7); x[13] ^= ROTL(x[ 9] + x[ 5],  9);
+		x[ 1] ^= ROTL(x[13] + x[ 9], 13); x[ 5] ^= ROTL(x[ 1] + x[13], 18);
+		x[14] ^= ROTL(x[10] + x[ 6],  7); x[ 2] ^= ROTL(x[14] + x[10],  9);
+		x[ 6] ^= ROTL(x[ 2] + x[14], 13); x[10] ^= ROTL(x[ 6] + x[ 2], 18);
+		x[ 3] ^= ROTL(x[15] + x[11],  7); x[ 7] ^= ROTL(x[ 3] + x[15],  9);
+		x[11] ^= ROTL(x[ 7] + x[ 3], 13); x[15] ^= ROTL(x[11] + x[ 7], 18);
+		/* rows */
+		x[ 1] ^= ROTL(x[ 0] + x[ 3],  7); x[ 2] ^= ROTL(x[ 1] + x[ 0],  9);
+		x[ 3] ^= ROTL(x[ 2] + x[ 1], 13); x[ 0] ^= ROTL(x[ 3] + x[ 2], 18);
+		x[ 6] ^= ROTL(x[ 5] + x[ 4],  7); x[ 7] ^= ROTL(x[ 6] + x[ 5],  9);
+		x[ 4] ^= ROTL(x[ 7] + x[ 6], 13); x[ 5] ^= ROTL(x[ 4] + x[ 7], 18);
+		x[11] ^= ROTL(x[10] + x[ 9],  7); x[ 8] ^= ROTL(x[11] + x[10],  9);
+		x[ 9] ^= ROTL(x[ 8] + x[11], 13); x[10] ^= ROTL(x[ 9] + x[ 8], 18);
+		x[12] ^= ROTL(x[15] + x[14],  7); x[13] ^= ROTL(x[12] + x[15],  9);
+		x[14] ^= ROTL(x[13] + x[12], 13); x[15] ^= ROTL(x[14] + x[13], 18);
+	}
+	for (i = 0; i < 16; i++) {
+		B[i] += x[i];
+	}
+}
+
+/* B and Y are blocks of 32*r words */
+static void blockmix_salsa8(const uint32_t * B, uint32_t * Y, const size_t r) {
+	uint32_t X[16];
+	size_t i, j;
+	memcpy(X, &B[(2 * r - 1) * 16], 64);
+	for (i = 0; i < 2 * r; i++) {
+		for (j = 0; j < 16; j++) {
+			X[j] ^= B[i * 16 + j];
+		}
+		salsa20_8(X);
+		/* even-numbered blocks go to the first half of the output, odd to the second */
+		memcpy(&Y[((i & 1) * r + i / 2) * 16], X, 64);
+	}
+}
+
+static PyObject * romix(PyObject *self, PyObject *args) {
+	const unsigned char * block_bytes;
+	Py_ssize_t block_bytes_len;
+	Py_ssize_t N;
+	Py_ssize_t r;
+	if (!PyArg_ParseTuple(args, "y#nn", &block_bytes, &block_bytes_len, &N, &r)) {
+		PyErr_SetString(PyExc_ValueError, "Unable to parse extension mod arguments");
+		return NULL;
+	}
+	if (r < 1 || r > 1024) {
+		PyErr_SetString(PyExc_ValueError, "Block size parameter r not in range 1-1024");
+		return NULL;
+	}
+	if (N < 2 || N > (1L << 30) || (N & (N - 1))) {
+		PyErr_SetString(PyExc_ValueError, "Cost parameter N not a power of 2 in range 2-2^30");
+		return NULL;
+	}
+	if (block_bytes_len != 128 * r) {
+		PyErr_SetString(PyExc_ValueError, "Block length not 128*r bytes");
+		return NULL;
+	}
+	const size_t nwords = 32 * r;
+	uint32_t *V = malloc((size_t) N * nwords * 4);
+	uint32_t *X = malloc(nwords * 4);
+	uint32_t *Y = malloc(nwords * 4);
+	if (V == NULL || X == NULL || Y == NULL) {
+		free(V);
+		free(X);
+		free(Y);
+		return PyErr_NoMemory();
+	}
+	PyObject *ret = PyBytes_FromStringAndSize(NULL, block_bytes_len);
+	if (ret == NULL) {
+		free(V);
+		free(X);
+		free(Y);
+		return NULL;
+	}
+	unsigned char *out_bytes = (unsigned char *) PyBytes_AS_STRING(ret);
+	size_t i, k;
+	uint32_t j;
+
+	Py_BEGIN_ALLOW_THREADS
+	/* words are little-endian */
+	for (k = 0; k < nwords; k++) {
+		const unsigned char *p = block_bytes + k * 4;
+		X[k] = (uint32_t) p[0] | (uint32_t) p[1] << 8 | (uint32_t) p[2] << 16 | (uint32_t) p[3] << 24;
+	}
+	for (i = 0; i < (size_t) N; i++) {
+		memcpy(&V[i * nwords], X, nwords * 4);
+		blockmix_salsa8(X, Y, r);
+		memcpy(X, Y, nwords * 4);
+	}
+	for (i = 0; i < (size_t) N; i++) {
+		/* Integerify: first word of the last 64-byte block, modulo N */
+		j = X[(2 * r - 1) * 16] & (uint32_t) (N - 1);
+		for (k = 0; k < nwords; k++) {
+			X[k] ^= V[j * nwords + k];
+		}
+		blockmix_salsa8(X, Y, r);
+		memcpy(X, Y, nwords * 4);
+	}
+	for (k = 0; k < nwords; k++) {
+		unsigned char *p = out_bytes + k * 4;
+		p[0] = X[k] & 0xff;
+		p[1] = (X[k] >> 8) & 0xff;
+		p[2] = (X[k] >> 16) & 0xff;
+		p[3] = (X[k] >> 24) & 0xff;
+	}
+	Py_END_ALLOW_THREADS
+
+	free(V);
+	free(X);
+	free(Y);
+	return ret;
+}
+
+static PyMethodDef romix_methods[] = {
+	{
+		"romix",
+		romix,
+		METH_VARARGS,
+		"Apply the scrypt ROMix function with parameters N and r to a block of 128*r bytes"
+	},
+	{NULL, NULL}
+};
+
+static struct PyModuleDef moduledef = {
+		PyModuleDef_HEAD_INIT,
+		"romix",
+		NULL,
+		0,
+		romix_methods,
+		NULL,
+		NULL,
+		NULL,
+		NULL
+};
+
+PyMODINIT_FUNC PyInit_romix(void) {
+	return PyModule_Create(&moduledef);
+}
@@ -139,6 +139,82 @@ static PyObject * pubkey_gen(PyObject *self, PyObject *args) {
 	return Py_BuildValue("y#", pubkey_bytes, pubkey_bytes_len);
 }
 
+/*
+ * generate serialized pubkeys for a contiguous buffer of 32-byte privkeys, returning
+ * the concatenated pubkeys.  The GIL is released during key generation.
+ */
+static PyObject * pubkey_gen_batch(PyObject *self, PyObject *args) {
+	Py_buffer privkeys;
+	int compressed;
+	if (!PyArg_ParseTuple(args, "y*i", &privkeys, &compressed)) {
+		PyErr_SetString(PyExc_ValueError, "Unable to parse extension mod arguments");
+		return NULL;
+	}
+	if (privkeys.len % 32) {
+		PyBuffer_Release(&privkeys);
+		PyErr_SetString(PyExc_ValueError, "Private key buffer length not a multiple of 32 bytes");
+		return NULL;
+	}
+	const Py_ssize_t nkeys = privkeys.len / 32;
+	const size_t pubkey_bytes_len = compressed == 1 ? 33 : 65;
+	PyObject *ret = PyBytes_FromStringAndSize(NULL, nkeys * pubkey_bytes_len);
+	if (ret == NULL) {
+		PyBuffer_Release(&privkeys);
+		return NULL;
+	}
+	secp256k1_context *ctx = create_context(1);
+	if (ctx == NULL) {
+		Py_DECREF(ret);
+		PyBuffer_Release(&privkeys);
+		PyErr_SetString(PyExc_RuntimeError, "Context initialization failed");
+		return NULL;
+	}
+	const unsigned char *privkey_bytes = privkeys.buf;
+	unsigned char *pubkey_bytes = (unsigned char *) PyBytes_AS_STRING(ret);
+	Py_ssize_t i;
+	int err = 0; /* 1: invalid key, 2: creation failed, 3: serialization failed */
+
+	Py_BEGIN_ALLOW_THREADS
+	secp256k1_pubkey pubkey;
+	size_t len;
+	for (i = 0; i < nkeys; i++) {
+		if (secp256k1_ec_seckey_verify(ctx, privkey_bytes + i * 32) != 1) {
+			err = 1;
+			break;
+		}
+		if (secp256k1_ec_pubkey_create(ctx, &pubkey, privkey_bytes + i * 32) != 1) {
+			err = 2;
+			break;
+		}
+		len = pubkey_bytes_len;
+		if (secp256k1_ec_pubkey_serialize(ctx, pubkey_bytes + i * pubkey_bytes_len, &len, &pubkey,
+				compressed == 1 ? SECP256K1_EC_COMPRESSED : SECP256K1_EC_UNCOMPRESSED) != 1) {
+			err = 3;
+			break;
+		}
+	}
+	Py_END_ALLOW_THREADS
+
+	secp256k1_context_destroy(ctx);
+	PyBuffer_Release(&privkeys);
+
+	if (err) {
+		Py_DECREF(ret);
+		switch (err) {
+			case 1:
+				PyErr_Format(PyExc_ValueError, "Private key #%zd not in allowable range", i);
+				break;
+			case 2:
+				PyErr_Format(PyExc_RuntimeError, "Public key creation failed (key #%zd)", i);
+				break;
+			default:
+				PyErr_Format(PyExc_RuntimeError, "Public key serialization failed (key #%zd)", i);
+		}
+		return NULL;
+	}
+	return ret;
+}
+
 static PyObject * pubkey_tweak_add(PyObject *self, PyObject *args) {
 	const unsigned char * pubkey_bytes;
 	const unsigned char * tweak_bytes;
@@ -182,6 +258,90 @@ static PyObject * pubkey_tweak_add(PyObject *self, PyObject *args) {
 	return Py_BuildValue("y#", new_pubkey_bytes, pubkey_bytes_len);
 }
 
+/*
+ * add each 32-byte scalar in a buffer of concatenated tweaks to a single serialized
+ * pubkey, returning the concatenated serialized results in the format of the input
+ * pubkey.  The GIL is released during the computation.
+ */
+static PyObject * pubkey_tweak_add_batch(PyObject *self, PyObject *args) {
+	const unsigned char * pubkey_bytes;
+	Py_ssize_t pubkey_bytes_len;
+	Py_buffer tweaks;
+	if (!PyArg_ParseTuple(args, "y#y*", &pubkey_bytes, &pubkey_bytes_len, &tweaks)) {
+		PyErr_SetString(PyExc_ValueError, "Unable to parse extension mod arguments");
+		return NULL;
+	}
+	if (tweaks.len % 32) {
+		PyBuffer_Release(&tweaks);
+		PyErr_SetString(PyExc_ValueError, "Tweak buffer length not a multiple of 32 bytes");
+		return NULL;
+	}
+	secp256k1_context *ctx = create_context(1);
+	secp256k1_pubkey parent_pubkey;
+	if (!pubkey_parse_with_check(ctx, &parent_pubkey, pubkey_bytes, pubkey_bytes_len)) {
+		if (ctx != NULL) {
+			secp256k1_context_destroy(ctx);
+		}
+		PyBuffer_Release(&tweaks);
+		return NULL;
+	}
+	const Py_ssize_t ntweaks = tweaks.len / 32;
+	PyObject *ret = PyBytes_FromStringAndSize(NULL, ntweaks * pubkey_bytes_len);
+	if (ret == NULL) {
+		secp256k1_context_destroy(ctx);
+		PyBuffer_Release(&tweaks);
+		return NULL;
+	}
+	const unsigned char *tweak_bytes = tweaks.buf;
+	unsigned char *out_bytes = (unsigned char *) PyBytes_AS_STRING(ret);
+	Py_ssize_t i;
+	int err = 0; /* 1: tweak out of range, 2: addition failed, 3: serialization failed */
+
+	Py_BEGIN_ALLOW_THREADS
+	secp256k1_pubkey pubkey;
+	size_t len;
+	for (i = 0; i < ntweaks; i++) {
+		if (secp256k1_ec_seckey_verify(ctx, tweak_bytes + i * 32) != 1) {
+			err = 1;
+			break;
+		}
+		pubkey = parent_pubkey;
+		/* checks for point-at-infinity (via secp256k1_pubkey_save) */
+		if (secp256k1_ec_pubkey_tweak_add(ctx, &pubkey, tweak_bytes + i * 32) != 1) {
+			err = 2;
+			break;
+		}
+		len = pubkey_bytes_len;
+		if (secp256k1_ec_pubkey_serialize(ctx, out_bytes + i * pubkey_bytes_len, &len, &pubkey,
+				pubkey_bytes_len == 33 ? SECP256K1_EC_COMPRESSED : SECP256K1_EC_UNCOMPRESSED) != 1) {
+			err = 3;
+			break;
+		}
+	}
+	Py_END_ALLOW_THREADS
+
+	secp256k1_context_destroy(ctx);
+	PyBuffer_Release(&tweaks);
+
+	if (err) {
+		Py_DECREF(ret);
+		switch (err) {
+			case 1:
+				PyErr_Format(PyExc_ValueError, "Tweak #%zd not in allowable range", i);
+				break;
+			case 2:
+				PyErr_Format(
+					PyExc_RuntimeError,
+					"Adding public key points failed or result was point-at-infinity (tweak #%zd)", i);
+				break;
+			default:
+				PyErr_Format(PyExc_RuntimeError, "Public key serialization failed (tweak #%zd)", i);
+		}
+		return NULL;
+	}
+	return ret;
+}
+
 static PyObject * pubkey_check(PyObject *self, PyObject *args) {
 	const unsigned char * pubkey_bytes;
 	Py_ssize_t pubkey_bytes_len;
@@ -366,12 +526,24 @@ static PyMethodDef secp256k1_methods[] = {
 		METH_VARARGS,
 		"Generate a serialized pubkey from privkey bytes"
 	},
+	{
+		"pubkey_gen_batch",
+		pubkey_gen_batch,
+		METH_VARARGS,
+		"Generate concatenated serialized pubkeys from a buffer of concatenated 32-byte privkeys"
+	},
 	{
 		"pubkey_tweak_add",
 		pubkey_tweak_add,
 		METH_VARARGS,
 		"Add scalar bytes to a serialized pubkey, returning a serialized pubkey"
 	},
+	{
+		"pubkey_tweak_add_batch",
+		pubkey_tweak_add_batch,
+		METH_VARARGS,
+		"Add each scalar in a buffer of concatenated 32-byte scalars to a serialized pubkey, returning concatenated serialized pubkeys"
+	},
 	{
 		"pubkey_check",
 		pubkey_check,
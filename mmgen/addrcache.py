@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+#
+# MMGen Wallet, a terminal-based cryptocurrency wallet
+# Copyright (C)2013-2025 The MMGen Project <mmgen@tuta.io>
+# Licensed under the GNU General Public License, Version 3:
+#   https://www.gnu.org/licenses
+# Public project repositories:
+#   https://github.com/mmgen/mmgen-wallet
+#   https://gitlab.com/mmgen/mmgen-wallet
+
+"""
+addrcache: Persistent public address cache for the MMGen suite
+"""
+
+import os, json, hmac
+
+from .util import make_chksum_N
+
+class AddrCache:
+	"""
+	On-disk cache of generated addresses for a single address list ID and coin
+
+	Only public data is stored: the address for each index, in its preferred view.  For
+	coins with multi-view addresses, the view format is part of the cache key, so that
+	addresses are reconstructed in the view they were generated in.  The cache is protected
+	by a MAC over its checksum, computed like AddrListChksum over all cached entries,
+	with a key derived from the scrambled seed.  A cache that fails the check is
+	discarded, so cached addresses can’t be modified undetectably without the seed.
+	"""
+	subdir  = 'addr_cache'
+	ext     = 'json'
+	version = 1
+
+	def __init__(self, cfg, proto, al_id, seed):
+		self.cfg = cfg
+		self.al_id = al_id
+		self.key = hmac.digest(seed, b'address cache key', 'sha256')
+		self.view = '-legacy' if getattr(proto, 'cashaddr', False) and not proto.cfg.cashaddr else ''
+		self.path = os.path.join(
+			cfg.data_dir,
+			self.subdir,
+			f'{al_id.sid}-{al_id.mmtype}-{proto.coin.lower()}-{proto.network}{self.view}.{self.ext}')
+		self.addrs = {}
+		self.changed = False
+		self.load()
+
+	@property
+	def chksum(self):
+		"""
+		the checksum of all cached entries, computed like AddrListChksum
+		"""
+		return make_chksum_N(
+			' '.join(f'{idx} {self.addrs[idx]}' for idx in sorted(self.addrs)),
+			nchars = 16,
+			sep    = True)
+
+	def get_mac(self, chksum):
+		return hmac.digest(self.key, f'{self.al_id}{self.view} {chksum}'.encode(), 'sha256').hex()
+
+	def load(self):
+		try:
+			with open(self.path) as fp:
+				d = json.load(fp)
+		except FileNotFoundError:
+			return
+		except ValueError:
+			d = {}
+		if d.get('version') == self.version and d.get('al_id') == self.al_id:
+			self.addrs = {int(k): v for k, v in d['addrs'].items()}
+			chksum = self.chksum
+			if chksum == d['chksum'] and hmac.compare_digest(self.get_mac(chksum), d['mac']):
+				self.cfg._util.dmsg(f'Loaded {len(self.addrs)} cached addresses from ‘{self.path}’')
+				return
+		from .util import ymsg
+		ymsg(f'Warning: address cache file ‘{self.path}’ is invalid or corrupted, discarding')
+		self.invalidate()
+
+	def save(self):
+		if not self.changed:
+			return
+		chksum = self.chksum
+		data = json.dumps({
+			'version': self.version,
+			'al_id':   self.al_id,
+			'chksum':  chksum,
+			'mac':     self.get_mac(chksum),
+			'addrs':   {str(k): self.addrs[k] for k in sorted(self.addrs)}})
+		from .fileutil import write_file_atomic
+		write_file_atomic(self.path, data + '\n')
+		self.changed = False
+
+	def add(self, idx, addr):
+		if idx not in self.addrs:
+			self.addrs[idx] = addr.views[addr.view_pref]
+			self.changed = True
+
+	def invalidate(self):
+		"""
+		empty the cache and remove its file from disk
+		"""
+		self.addrs = {}
+		self.changed = False
+		if os.path.exists(self.path):
+			os.unlink(self.path)
+
+	@classmethod
+	def clear(cls, cfg, *, sid=None):
+		"""
+		remove the cache files for all Seed IDs or for Seed ID ‘sid’, returning their paths
+		"""
+		dirname = os.path.join(cfg.data_dir, cls.subdir)
+		if not os.path.isdir(dirname):
+			return []
+		ret = []
+		for fn in sorted(os.listdir(dirname)):
+			if fn.endswith('.' + cls.ext) and (sid is None or fn.startswith(f'{sid}-')):
+				os.unlink(path := os.path.join(dirname, fn))
+				ret.append(path)
+		return ret
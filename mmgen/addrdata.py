@@ -43,15 +43,32 @@ class AddrData(MMGenObject):
 			return self.al_ids[al_id]
 
 	def mmaddr2coinaddr(self, mmaddr):
-		al_id, idx = MMGenID(self.proto, mmaddr).rsplit(':', 1)
-		coinaddr = ''
-		if al_id in self.al_ids:
-			coinaddr = self.addrlist(al_id).coinaddr(int(idx))
-		return coinaddr or None
+		return self.mmaddrs2coinaddrs([mmaddr])[0]
+
+	def mmaddrs2coinaddrs(self, mmaddrs):
+		"""
+		return a list of the coin addresses of MMGen addresses ‘mmaddrs’, with None for
+		addresses not found
+		"""
+		def gen():
+			for mmaddr in mmaddrs:
+				al_id, idx = MMGenID(self.proto, mmaddr).rsplit(':', 1)
+				if al_id in self.al_ids:
+					yield self.al_ids[al_id].coinaddr(int(idx)) or None
+				else:
+					yield None
+		return list(gen())
 
 	def coinaddr2mmaddr(self, coinaddr):
-		d = self.make_reverse_dict([coinaddr])
-		return (list(d.values())[0][0]) if d else None
+		return self.coinaddrs2mmaddrs([coinaddr])[0]
+
+	def coinaddrs2mmaddrs(self, coinaddrs):
+		"""
+		return a list of the MMGen IDs of coin addresses ‘coinaddrs’, with None for
+		addresses not found
+		"""
+		d = self.make_reverse_dict(coinaddrs)
+		return [d[addr][0] if addr in d else None for addr in coinaddrs]
 
 	def add(self, addrlist):
 		if isinstance(addrlist, AddrList):
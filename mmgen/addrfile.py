@@ -20,6 +20,9 @@
 addrfile: Address and password file classes for the MMGen suite
 """
 
+import math
+from functools import partial
+
 from .cfg import gc
 from .util import msg, die, capfirst
 from .protocol import init_proto
@@ -29,6 +32,26 @@ from .key import PrivKey
 from .addr import ViewKey, AddrListID, MMGenAddrType, MMGenPasswordType, is_addr_idx
 from .addrlist import AddrListData
 
+def get_key_sample_size(total, confidence, *, error_rate=0.01):
+	"""
+	return the number of keys from a list of ‘total’ keys that must be checked to
+	detect a bad key with probability ‘confidence’, given a rate of bad keys of at
+	least ‘error_rate’
+	"""
+	# probability of a random sample of n keys missing all d bad ones: ≤ (1 - n/total)^d
+	d = max(1, math.ceil(total * error_rate))
+	return min(total, math.ceil(total * (1 - (1 - confidence) ** (1 / d))))
+
+def _check_keys(kg, ag, batch):
+	addrs = ag.to_addrs(kg.gen_data_batch([sec for _, sec, _ in batch]))
+	return [pos for (pos, _, addr), a in zip(batch, addrs) if a != addr]
+
+def _verify_keys_batch(state, batch):
+	"worker process function for AddrFile.verify_keys()"
+	from .mproc import unpack
+	proto, check_keys = state
+	return (len(batch), check_keys([(pos, unpack(sec, proto), addr) for pos, sec, addr in batch]))
+
 class AddrFile(MMGenObject):
 	desc        = 'addresses'
 	ext         = 'addrs'
@@ -49,8 +72,14 @@ class AddrFile(MMGenObject):
 		self.infile = None
 		self.fmt_data = None
 
+	@property
+	def has_secrets(self):
+		return self.parent.has_keys or self.parent.gen_passwds
+
 	def encrypt(self):
 		from .crypto import Crypto
+		if self.parent.stream and not self.fmt_data: # encryption requires the whole file in memory
+			self.format_stream()
 		self.fmt_data = Crypto(self.cfg).mmgen_encrypt(
 			data = self.fmt_data.encode(),
 			desc = f'new {self.parent.desc} list')
@@ -72,10 +101,18 @@ class AddrFile(MMGenObject):
 			ask_overwrite = True,
 			outdir        = None):
 		from .fileutil import write_data_to_file
+		if self.fmt_data or not self.parent.stream:
+			data = self.fmt_data or self.format()
+		elif self.has_secrets: # never spool keys or passwords to disk
+			data = self.format_stream()
+		else:
+			import os
+			outfile = os.path.join(str(outdir or self.cfg.outdir or ''), fn or self.filename)
+			data = self.gen_stream_data(tmpdir=os.path.dirname(os.path.abspath(outfile)))
 		write_data_to_file(
 			cfg           = self.cfg,
 			outfile       = fn or self.filename,
-			data          = self.fmt_data or self.format(),
+			data          = data,
 			desc          = desc or self.desc,
 			ask_tty       = self.parent.has_keys and not self.cfg.quiet,
 			binary        = binary,
@@ -92,7 +129,7 @@ class AddrFile(MMGenObject):
 			+ ([proto.network.upper()] if proto.testnet else []))
 		return self.parent.al_id.sid + (' ' if lbl_p2 else '') + lbl_p2
 
-	def format(self, *, add_comments=False):
+	def gen_header_lines(self):
 		p = self.parent
 		if p.gen_passwds and p.pw_fmt in ('bip39', 'xmrseed'):
 			desc_pfx = f'{p.pw_fmt.upper()} '
@@ -100,63 +137,118 @@ class AddrFile(MMGenObject):
 		else:
 			desc_pfx = ''
 			hdr2 = self.text_label_header
-		out = [
+
+		yield (
 			f'# {gc.proj_name} {desc_pfx}{p.desc} file\n#\n'
 			+ self.header.strip().format(pnm=gc.proj_name)
 			+ '\n'
 			+ hdr2.lstrip().format(n=TwComment.max_screen_width)
-			+ '#\n'
-		]
+			+ '#\n')
 
 		if p.chksum:
-			out.append(f'# {capfirst(p.desc)} data checksum for {p.id_str}: {p.chksum}')
-			out.append('# Record this value to a secure location.\n')
+			yield f'# {capfirst(p.desc)} data checksum for {p.id_str}: {p.chksum}'
+			yield '# Record this value to a secure location.\n'
 
 		lbl = self.make_label()
 		self.parent.dmsg_sc('lbl', lbl[9:])
-		out.append(f'{lbl} {{')
+		yield f'{lbl} {{'
 
-		fs = '  {:<%s}  {:<34}{}' % len(str(p.data[-1].idx))
-		for e in p.data:
+	def gen_body_lines(self, entries, idx_width, *, add_comments=False):
+		p = self.parent
+		fs = '  {:<%s}  {:<34}{}' % idx_width
+		for e in entries:
 			c = ' ' + e.comment if add_comments and e.comment else ''
 			match type(p).__name__:
 				case 'KeyList':
-					out.append(fs.format(e.idx, f'{p.al_id.mmtype.wif_label}: {e.sec.wif}', c))
+					yield fs.format(e.idx, f'{p.al_id.mmtype.wif_label}: {e.sec.wif}', c)
 				case 'PasswordList':
-					out.append(fs.format(e.idx, e.passwd, c))
+					yield fs.format(e.idx, e.passwd, c)
 				case _: # First line with idx
-					out.append(fs.format(e.idx, e.addr.views[e.addr.view_pref], c))
+					yield fs.format(e.idx, e.addr.views[e.addr.view_pref], c)
 					if p.has_keys:
 						if self.cfg.b16:
-							out.append(fs.format('', f'orig_hex: {e.sec.orig_bytes.hex()}', c))
+							yield fs.format('', f'orig_hex: {e.sec.orig_bytes.hex()}', c)
 						if type(self) is not ViewKeyAddrFile:
-							out.append(fs.format('', f'{p.al_id.mmtype.wif_label}: {e.sec.wif}', c))
+							yield fs.format('', f'{p.al_id.mmtype.wif_label}: {e.sec.wif}', c)
 						for k in ('viewkey', 'wallet_passwd'):
 							v = getattr(e, k)
 							if v:
-								out.append(fs.format('', f'{k}: {v}', c))
+								yield fs.format('', f'{k}: {v}', c)
 
-		out.append('}')
-		self.fmt_data = '\n'.join([l.rstrip() for l in out]) + '\n'
+	def format(self, *, add_comments=False):
+		p = self.parent
+		assert not p.stream, 'format() is unavailable in streaming mode: use write()'
+		lines = (
+			*self.gen_header_lines(),
+			*self.gen_body_lines(p.data.iter_rows(), len(str(p.data[-1].idx)), add_comments=add_comments),
+			'}')
+		self.fmt_data = '\n'.join([l.rstrip() for l in lines]) + '\n'
 		return self.fmt_data
 
-	def get_line(self, lines):
-		ret = lines.pop(0).split(None, 2)
+	def format_stream(self):
+		"""
+		generate the parent’s entries on the fly, building the formatted file in memory
+		"""
+		p = self.parent
+		body = [l.rstrip() for l in self.gen_body_lines(p.iter_entries(), len(str(p.addr_idxs[-1])))]
+		self.fmt_data = '\n'.join([l.rstrip() for l in self.gen_header_lines()] + body + ['}']) + '\n'
+		return self.fmt_data
+
+	def gen_stream_data(self, *, tmpdir):
+		"""
+		generate the parent’s entries on the fly, yielding the formatted file in chunks
+
+		The header contains the checksum of all entries, so the body is first written
+		to an anonymous temporary file in ‘tmpdir’, which should be the output file’s
+		directory.  Lists containing keys or passwords must use format_stream() instead.
+		"""
+		assert not self.has_secrets, 'secret data may not be written to a temporary file'
+		import tempfile
+		p = self.parent
+		with tempfile.TemporaryFile(mode='w+', dir=tmpdir) as fp:
+			for line in self.gen_body_lines(p.iter_entries(), len(str(p.addr_idxs[-1]))):
+				fp.write(line.rstrip() + '\n')
+			yield '\n'.join([l.rstrip() for l in self.gen_header_lines()]) + '\n'
+			fp.seek(0)
+			while data := fp.read(1 << 16):
+				yield data
+		yield '}\n'
+
+	def split_line(self, line):
 		self.line_ctr += 1
-		if ret[0] == 'orig_hex:': # hacky
-			ret = lines.pop(0).split(None, 2)
-			self.line_ctr += 1
+		ret = line.split(None, 2)
 		return ret if len(ret) == 3 else ret + ['']
 
-	def parse_file_body(self, lines):
+	def get_line(self, lines):
+		for line in lines:
+			ret = self.split_line(line)
+			if ret[0] != 'orig_hex:': # hacky
+				return ret
+		raise ValueError('unexpected end of data')
 
+	def want_key_verification(self):
+		p = self.parent
+		if type(self) is not ViewKeyAddrFile and p.has_keys and p.ka_validity_chk is not False:
+			if self.cfg.yes or p.ka_validity_chk:
+				return True
+			from .ui import keypress_confirm
+			return keypress_confirm(p.cfg, 'Check key-to-address validity?')
+		return False
+
+	def gen_file_body(self, lines):
+		"""
+		parse the lines following the file’s first line, yielding list entries
+		"""
 		p = self.parent
-		ret = AddrListData()
 		le = p.entry_type
 		iifs = "{!r}: invalid identifier [expected '{}:']"
+		self.line_ctr = 0
 
-		while lines:
-			idx, addr, comment = self.get_line(lines)
+		for line in lines:
+			if line == '}':
+				break
+
+			idx, addr, comment = self.split_line(line)
 
 			assert is_addr_idx(idx), f'invalid address index {idx!r}'
 			p.check_format(addr)
@@ -176,32 +268,119 @@ class AddrFile(MMGenObject):
 						assert d[0] == k+':', iifs.format(d[0], k)
 						setattr(a, k, dtype(*((p.proto, d[1]) if add_proto else (d[1],))))
 
-			ret.append(a)
+			yield a
+		else:
+			raise ValueError('missing closing brace')
 
-		if type(self) is not ViewKeyAddrFile and p.has_keys and p.ka_validity_chk is not False:
+		assert self.line_ctr, 'Too few lines in address file'
 
-			def verify_keys():
-				from .addrgen import KeyGenerator, AddrGenerator
-				kg = KeyGenerator(self.cfg, p.proto, p.al_id.mmtype.pubkey_type)
-				ag = AddrGenerator(self.cfg, p.proto, p.al_id.mmtype)
-				llen = len(ret)
-				qmsg_r = p.cfg._util.qmsg_r
-				for n, e in enumerate(ret):
-					qmsg_r(f'\rVerifying keys {n+1}/{llen}')
-					assert e.addr == ag.to_addr(kg.gen_data(e.sec)), (
-						f'Key doesn’t match address!\n  {e.sec.wif}\n  {e.addr}')
-				p.cfg._util.qmsg(' - done')
+		for line in lines:
+			raise ValueError(f'{line!r}: invalid data after closing brace')
 
-			if self.cfg.yes or p.ka_validity_chk:
-				verify_keys()
-			else:
-				from .ui import keypress_confirm
-				if keypress_confirm(p.cfg, 'Check key-to-address validity?'):
-					verify_keys()
+	def get_key_checker(self):
+		"""
+		return a function that checks a batch of (pos, private key, address) triples,
+		returning the positions of keys that don’t match their addresses
+		"""
+		p = self.parent
+		from .addrgen import KeyGenerator, AddrGenerator
+		return partial(
+			_check_keys,
+			KeyGenerator(self.cfg, p.proto, p.al_id.mmtype.pubkey_type),
+			AddrGenerator(self.cfg, p.proto, p.al_id.mmtype))
+
+	def verify_keys(self, data):
+		"""
+		check the keys in list data ‘data’ against their addresses, using multiple worker
+		processes if so configured
+
+		If the ‘key_verify_confidence’ option is set, only a random sample of the keys
+		is checked.
+		"""
+		p = self.parent
+		cfg = self.cfg
+		total = len(data)
+
+		if cfg.key_verify_confidence:
+			import random
+			size = get_key_sample_size(total, cfg.key_verify_confidence / 100)
+			positions = sorted(random.SystemRandom().sample(range(total), size))
+		else:
+			positions = range(total)
+
+		check_keys = self.get_key_checker()
+
+		from .mproc import get_jobs, split_into_batches
+		jobs = get_jobs(cfg)
+		use_mproc = jobs > 1 and len(positions) >= p.mproc_min_addrs
+		batches = split_into_batches(
+			((pos, data.get_value(pos, 'sec'), str(data.get_value(pos, 'addr'))) for pos in positions),
+			max(1, min(p.batch_size, len(positions) // (jobs * 4))) if use_mproc else p.batch_size)
+
+		if use_mproc:
+			from .mproc import pool_imap, pack
+			results = pool_imap(
+				_verify_keys_batch,
+				([(pos, pack(sec), addr) for pos, sec, addr in batch] for batch in batches),
+				jobs  = jobs,
+				state = (p.proto, check_keys))
+		else:
+			results = ((len(batch), check_keys(batch)) for batch in batches)
+
+		n = 0
+		for batch_len, bad in results:
+			if bad:
+				e = data[bad[0]]
+				raise ValueError(f'Key doesn’t match address!\n  {e.sec.wif}\n  {e.addr}')
+			n += batch_len
+			cfg._util.qmsg_r(f'\rVerifying keys {n}/{len(positions)}')
+
+		cfg._util.qmsg(' - done' + (
+			f' (random sample of {len(positions)} keys, {cfg.key_verify_confidence}% confidence level)'
+				if cfg.key_verify_confidence else ''))
+
+	def parse_file_body(self, lines):
+
+		p = self.parent
+		ret = AddrListData(self.gen_file_body(lines), entry_type=p.entry_type, proto=p.proto)
+
+		if self.want_key_verification():
+			self.verify_keys(ret)
 
 		return ret
 
-	def parse_file(self, fn, *, buf=[], exit_on_error=True):
+	def gen_file_entries(self, fn):
+		"""
+		read the entries of address file ‘fn’ one at a time, yielding list entries
+
+		For use in streaming mode, after the file’s first line has been parsed by
+		parse_file().  Keys are verified in batches in the main process.
+		"""
+		from .fileutil import gen_lines_from_file
+		from .mproc import split_into_batches
+		p = self.parent
+		lines = gen_lines_from_file(p.cfg, fn, desc=f'{p.desc} data', trim_comments=True, quiet=True)
+		check_keys = self.get_key_checker() if self.want_key_verification() else None
+		try:
+			next(lines)
+			for batch in split_into_batches(self.gen_file_body(lines), p.batch_size):
+				if check_keys:
+					for i in check_keys([(i, e.sec, e.addr) for i, e in enumerate(batch)]):
+						raise ValueError(
+							f'Key doesn’t match address!\n  {batch[i].sec.wif}\n  {batch[i].addr}')
+				yield from batch
+		except Exception as e:
+			self.die_parse_error(fn, e)
+
+	def die_parse_error(self, fn, e, *, exit_on_error=True):
+		m_add = f', content line {self.line_ctr}' if self.line_ctr else ''
+		m = f'Invalid data in {self.parent.desc} list file ‘{fn}’{m_add} ({e!s})'
+		if exit_on_error:
+			die(3, m)
+		else:
+			msg(m)
+
+	def parse_file(self, fn, *, buf=[], exit_on_error=True, header_only=False):
 
 		def parse_addrfile_label(lbl):
 			"""
@@ -249,16 +428,19 @@ class AddrFile(MMGenObject):
 
 		p = self.parent
 
-		from .fileutil import get_lines_from_file
-		lines = get_lines_from_file(p.cfg, fn, desc=f'{p.desc} data', trim_comments=True)
+		from .fileutil import gen_lines_from_file, get_lines_from_file
+		if header_only:
+			lines = gen_lines_from_file(p.cfg, fn, desc=f'{p.desc} data', trim_comments=True)
+		else: # apply the input size limit
+			lines = iter(get_lines_from_file(p.cfg, fn, desc=f'{p.desc} data', trim_comments=True))
 
 		try:
-			assert len(lines) >= 3, f'Too few lines in address file ({len(lines)})'
-			ls = lines[0].split()
-			assert 1 < len(ls) < 5, f'Invalid first line for {p.gen_desc} file: {lines[0]!r}'
+			line = next(lines, None)
+			assert line is not None, 'Too few lines in address file'
+			ls = line.split()
+			assert 1 < len(ls) < 5, f'Invalid first line for {p.gen_desc} file: {line!r}'
 			assert ls[-1] == '{', f'{ls!r}: invalid first line'
 			ls.pop()
-			assert lines[-1] == '}', f'{lines[-1]!r}: invalid last line'
 			sid = ls.pop(0)
 			assert is_seed_id(sid), f'{sid!r}: invalid Seed ID'
 
@@ -282,7 +464,7 @@ class AddrFile(MMGenObject):
 					proto = init_proto(p.cfg, 'btc')
 					mmtype = proto.addr_type('L')
 				case _:
-					raise ValueError(f'{lines[0]}: Invalid first line for {p.gen_desc} file {fn!r}')
+					raise ValueError(f'{line}: Invalid first line for {p.gen_desc} file {fn!r}')
 
 			if type(p).__name__ != 'PasswordList':
 				if proto.base_coin != p.proto.base_coin or proto.network != p.proto.network:
@@ -299,16 +481,15 @@ class AddrFile(MMGenObject):
 			p.network = proto.network
 			p.al_id = AddrListID(sid=SeedID(sid=sid), mmtype=mmtype)
 
-			data = self.parse_file_body(lines[1:-1])
-			assert isinstance(data, list), 'Invalid file body data'
+			if header_only: # streaming mode: entries are read by gen_file_entries()
+				lines.close()
+				return None
+
+			data = self.parse_file_body(lines)
+			assert isinstance(data, AddrListData), 'Invalid file body data'
 		except Exception as e:
-			m_add = f', content line {self.line_ctr}' if self.line_ctr else ''
-			m = f'Invalid data in {p.desc} list file ‘{fn}’{m_add} ({e!s})'
-			if exit_on_error:
-				die(3, m)
-			else:
-				msg(m)
-				return False
+			self.die_parse_error(fn, e, exit_on_error=exit_on_error)
+			return False
 
 		return data
 
@@ -340,13 +521,13 @@ class PasswordFile(AddrFile):
 # password.  The label may contain any printable ASCII symbol.
 """
 
-	def get_line(self, lines):
+	def split_line(self, line):
 
 		self.line_ctr += 1
 		p = self.parent
 
 		if p.pw_fmt in ('bip39', 'xmrseed'):
-			ret = lines.pop(0).split(None, p.pw_len + 1)
+			ret = line.split(None, p.pw_len + 1)
 			match len(ret) - 1:
 				case p.pw_len:
 					return (ret[0], ' '.join(ret[1: p.pw_len + 1]), '')
@@ -357,7 +538,7 @@ class PasswordFile(AddrFile):
 				case x if x < p.pw_len:
 					raise ValueError(f'invalid password length {x}')
 		else:
-			ret = lines.pop(0).split(None, 2)
+			ret = line.split(None, 2)
 			return ret if len(ret) == 3 else ret + ['']
 
 	def make_label(self):
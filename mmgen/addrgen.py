@@ -32,6 +32,17 @@ def check_data(orig_func):
 		return orig_func(self, data)
 	return f
 
+# decorator for to_addrs()
+def check_data_batch(orig_func):
+	def f(self, data):
+		for d in data:
+			assert d.pubkey_type == self.pubkey_type, 'addrgen.py:check_data_batch() pubkey_type mismatch'
+			assert d.compressed == self.compressed, (
+				f'addrgen.py:check_data_batch() expected compressed={self.compressed} '
+				f'but got compressed={d.compressed}')
+		return orig_func(self, data)
+	return f
+
 class addr_generator:
 
 	class base:
@@ -42,6 +53,13 @@ class addr_generator:
 			self.compressed = addr_type.compressed
 			self.desc = f'AddrGenerator {type(self).__name__!r}'
 
+		def to_addrs(self, data):
+			"""
+			generate addresses for a sequence of public data.  Generators supporting
+			batch operation override this method.
+			"""
+			return [self.to_addr(d) for d in data]
+
 	class keccak(base):
 
 		def __init__(self, cfg, proto, addr_type):
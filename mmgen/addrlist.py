@@ -20,10 +20,13 @@
 addrlist: Address list classes for the MMGen suite
 """
 
+import sys
+from collections import namedtuple
+
 from .util import suf, make_chksum_N, Msg, die
 from .objmethods import MMGenObject, HiliteStr, InitErrors
 from .obj import MMGenListItem, ListItemAttr, MMGenDict, TwComment, WalletPassword
-from .key import PrivKey
+from .key import PrivKey, WifKey
 from .addr import MMGenID, MMGenAddrType, CoinAddr, AddrIdx, AddrListID, ViewKey
 
 class AddrIdxList(tuple, InitErrors, MMGenObject):
@@ -78,7 +81,16 @@ class AddrListEntryBase(MMGenListItem):
 		self.__dict__['proto'] = proto
 		MMGenListItem.__init__(self, **kwargs)
 
+	def __setattr__(self, name, value):
+		MMGenListItem.__setattr__(self, name, value)
+		if '_row' in self.__dict__: # entry was created by AddrListData, so write the change back
+			data, pos = self._row
+			data.set_value(pos, name, self.__dict__[name])
+
 class AddrListEntry(AddrListEntryBase):
+	# setting valid_attrs explicitly is also more efficient
+	valid_attrs = {'addr', 'addr_p2pkh', 'idx', 'comment', 'sec', 'viewkey', 'wallet_passwd'}
+
 	addr          = ListItemAttr(CoinAddr, include_proto=True)
 	addr_p2pkh    = ListItemAttr(CoinAddr, include_proto=True)
 	idx           = ListItemAttr(AddrIdx) # not present in flat addrlists
@@ -91,32 +103,54 @@ class AddrListChksum(HiliteStr):
 	color = 'pink'
 	trunc_ok = False
 
-	def __new__(cls, addrlist):
-		ea = addrlist.al_id.mmtype.extra_attrs or () # add viewkey and passwd to the mix, if present
-		lines = [' '.join(
-					addrlist.chksum_rec_f(e) +
-					tuple(getattr(e, a) for a in ea if getattr(e, a))
-				) for e in addrlist.data]
-		return str.__new__(cls, make_chksum_N(' '.join(lines), nchars=16, sep=True))
+	def __new__(cls, addrlist, *, hasher=None):
+		if hasher is None:
+			hasher = AddrListChksumHasher(addrlist)
+			for e in addrlist.data.iter_rows():
+				hasher.update(e)
+		return str.__new__(cls, make_chksum_N(hasher.digest(), nchars=16, sep=True, rounds=1))
+
+class AddrListChksumHasher(MMGenObject):
+	"""
+	compute an address list checksum incrementally, one entry at a time
+
+	Entries may be list entry objects or any other objects with the same attributes.
+	"""
+
+	def __init__(self, addrlist):
+		from hashlib import sha256
+		self.rec_f = addrlist.chksum_rec_f
+		self.extra_attrs = addrlist.al_id.mmtype.extra_attrs or () # add viewkey and passwd to the mix, if present
+		self.hash = sha256()
+		self.sep = b''
+
+	def update(self, e):
+		self.hash.update(self.sep + ' '.join(
+			self.rec_f(e) + tuple(getattr(e, a) for a in self.extra_attrs if getattr(e, a))).encode())
+		self.sep = b' '
+
+	def digest(self): # first round of make_chksum_N()
+		return self.hash.digest()
 
 class AddrListIDStr(HiliteStr):
 	color = 'green'
 	trunc_ok = False
 
-	def __new__(cls, addrlist, *, fmt_str=None):
-		idxs = [e.idx for e in addrlist.data]
-		prev = idxs[0]
-		ret = [prev]
-		for i in idxs[1:]:
-			if i == prev + 1:
-				if i == idxs[-1]:
-					ret.extend(['-', i])
-			else:
-				if prev != ret[-1]:
-					ret.extend(['-', prev])
-				ret.extend([',', i])
-			prev = i
-		s = ''.join(map(str, ret))
+	def __new__(cls, addrlist, *, fmt_str=None, idxs=None):
+
+		def gen_ranges():
+			start = prev = None
+			for i in (addrlist.data.get_column('idx') if idxs is None else idxs):
+				if start is not None and i == prev + 1:
+					prev = i
+					continue
+				if start is not None:
+					yield f'{start}' if prev == start else f'{start}-{prev}'
+				start = prev = i
+			if start is not None:
+				yield f'{start}' if prev == start else f'{start}-{prev}'
+
+		s = ','.join(gen_ranges())
 
 		if fmt_str:
 			ret = fmt_str.format(s)
@@ -134,8 +168,351 @@ class AddrListIDStr(HiliteStr):
 
 		return str.__new__(cls, ret)
 
-class AddrListData(list, MMGenObject):
-	pass
+class _ObjColumn:
+	"AddrListData column for values with no compact representation: values are stored as-is"
+
+	def __init__(self, vals=()):
+		self.vals = list(vals)
+
+	def __len__(self):
+		return len(self.vals)
+
+	def can_store(self, val):
+		return True
+
+	def get(self, pos):
+		return self.vals[pos] if pos < len(self.vals) else None
+
+	def key(self, pos):
+		"return a hashable value comparing equal to the value at ‘pos’, or None"
+		return self.vals[pos] if pos < len(self.vals) else None
+
+	def set(self, pos, val):
+		if pos >= len(self.vals):
+			self.vals.extend([None] * (pos + 1 - len(self.vals)))
+		self.vals[pos] = val
+
+class _StrColumn(_ObjColumn):
+	"""
+	AddrListData column for str or int subclass instances with no attributes of their
+	own: values are stored as instances of the base class
+	"""
+
+	def __init__(self, val):
+		self.vals = []
+		self.cls = type(val)
+		self.base = str if isinstance(val, str) else int
+
+	def can_store(self, val):
+		return type(val) is self.cls and not getattr(val, '__dict__', None)
+
+	def get(self, pos):
+		val = self.vals[pos] if pos < len(self.vals) else None
+		return None if val is None else self.base.__new__(self.cls, val)
+
+	def set(self, pos, val):
+		_ObjColumn.set(self, pos, self.base(val))
+
+class _IdxColumn:
+	"AddrListData column for address indexes: values are stored in an integer array, zero meaning none"
+
+	def __init__(self, val):
+		from array import array
+		self.vals = array('L')
+
+	def __len__(self):
+		return len(self.vals)
+
+	def can_store(self, val):
+		return type(val) is AddrIdx
+
+	def get(self, pos):
+		val = self.vals[pos] if pos < len(self.vals) else 0
+		return int.__new__(AddrIdx, val) if val else None
+
+	def key(self, pos):
+		return (self.vals[pos] if pos < len(self.vals) else 0) or None
+
+	def set(self, pos, val):
+		if pos >= len(self.vals):
+			self.vals.extend([0] * (pos + 1 - len(self.vals)))
+		self.vals[pos] = val
+
+class _PackedColumn:
+	"""
+	base class for AddrListData columns holding validated data objects with attributes
+	common to all rows
+
+	Each row’s string value and fixed-width byte data are stored in a list and a byte
+	array respectively, along with a flags byte (zero meaning no value).  Values are
+	reconstructed without revalidation.
+	"""
+	width = None
+
+	def __init__(self):
+		self.strs = []
+		self.data = bytearray()
+		self.flags = bytearray()
+
+	def __len__(self):
+		return len(self.flags)
+
+	def get_packed(self, pos):
+		if pos < len(self.flags) and (flags := self.flags[pos]):
+			return (flags, self.strs[pos], bytes(self.data[pos*self.width:(pos+1)*self.width]))
+		return (0, None, None)
+
+	def key(self, pos):
+		return self.strs[pos] if pos < len(self.strs) else None
+
+	def set_packed(self, pos, flags, s, data):
+		w = self.width
+		if pos >= len(self.flags):
+			n = pos + 1 - len(self.flags)
+			self.strs.extend([None] * n)
+			self.data.extend(bytes(n * w))
+			self.flags.extend(bytes(n))
+		self.strs[pos] = s
+		self.data[pos*w:(pos+1)*w] = data
+		self.flags[pos] = flags
+
+class _AddrColumn(_PackedColumn):
+	"AddrListData column for single-view coin addresses: address strings are interned"
+	attrs = {'views', 'view_pref', 'addr_fmt', 'bytes', 'ver_bytes', 'proto', '_parsed'}
+
+	def __init__(self, addr):
+		super().__init__()
+		self.width = len(addr.bytes)
+		self.addr_fmt = addr.addr_fmt
+		self.ver_bytes = addr.ver_bytes
+		self.proto = addr.proto
+
+	def can_store(self, addr):
+		d = getattr(addr, '__dict__', {})
+		return (
+			type(addr) is CoinAddr
+			and d.keys() <= self.attrs
+			and d['view_pref'] == 0
+			and len(d['views']) == 1
+			and d['views'][0] == addr
+			and d['addr_fmt'] == self.addr_fmt
+			and d['ver_bytes'] == self.ver_bytes
+			and d['proto'] is self.proto
+			and len(d['bytes']) == self.width)
+
+	def get(self, pos):
+		flags, s, data = self.get_packed(pos)
+		if flags:
+			me = str.__new__(CoinAddr, s)
+			me.__dict__.update({
+				'views':     [s],
+				'view_pref': 0,
+				'addr_fmt':  self.addr_fmt,
+				'bytes':     data,
+				'ver_bytes': self.ver_bytes,
+				'proto':     self.proto})
+			return me
+
+	def set(self, pos, addr):
+		self.set_packed(pos, 1, sys.intern(str(addr)), addr.bytes)
+
+class _KeyColumn(_PackedColumn):
+	"""
+	AddrListData column for private keys: the preprocessed and original key bytes are
+	packed together, and WIF keys are stored as plain strings
+	"""
+	attrs = {'wif', 'compressed', 'pubkey_type', 'orig_bytes', 'proto'}
+	width = PrivKey.width * 2
+	have_orig_bytes = 2 # flags bit
+
+	def __init__(self, key):
+		super().__init__()
+		d = key.__dict__
+		self.has_wif = 'wif' in d
+		self.compressed = d.get('compressed')
+		self.pubkey_type = d.get('pubkey_type')
+		self.proto = d.get('proto')
+
+	def can_store(self, key):
+		d = key.__dict__
+		return (
+			type(key) is PrivKey
+			and d.keys() <= self.attrs
+			and len(key) == PrivKey.width
+			and ('wif' in d) == self.has_wif
+			and (not self.has_wif or type(d['wif']) is WifKey)
+			and d.get('compressed') == self.compressed
+			and d.get('pubkey_type') == self.pubkey_type
+			and d.get('proto') is self.proto
+			and (d.get('orig_bytes') is None or len(d['orig_bytes']) == PrivKey.width))
+
+	def get(self, pos):
+		flags, s, data = self.get_packed(pos)
+		if flags:
+			me = bytes.__new__(PrivKey, data[:PrivKey.width])
+			d = me.__dict__
+			if self.has_wif:
+				d['wif'] = str.__new__(WifKey, s)
+				d['compressed'] = self.compressed
+			d['pubkey_type'] = self.pubkey_type
+			d['orig_bytes'] = data[PrivKey.width:] if flags & self.have_orig_bytes else None
+			d['proto'] = self.proto
+			return me
+
+	def key(self, pos):
+		flags, _, data = self.get_packed(pos)
+		return data[:PrivKey.width] if flags else None
+
+	def set(self, pos, key):
+		orig_bytes = key.__dict__.get('orig_bytes')
+		self.set_packed(
+			pos,
+			1 | (self.have_orig_bytes if orig_bytes else 0),
+			str(key.wif) if self.has_wif else None,
+			bytes(key) + (orig_bytes or bytes(PrivKey.width)))
+
+def _make_column(val):
+	match val:
+		case AddrIdx():
+			col = _IdxColumn(val)
+		case PrivKey():
+			col = _KeyColumn(val)
+		case CoinAddr():
+			col = _AddrColumn(val)
+		case bool():
+			col = _ObjColumn()
+		case str() | int() if not getattr(val, '__dict__', None):
+			col = _StrColumn(val)
+		case _:
+			col = _ObjColumn()
+	return col if col.can_store(val) else _ObjColumn()
+
+class AddrListData(MMGenObject):
+	"""
+	Compact columnar storage for address list entries
+
+	Entry attributes are stored column by column: address indexes in an integer array,
+	private keys and address data packed into byte arrays, and address and WIF key
+	strings as plain interned strings.  Values are reconstructed without revalidation.
+
+	Entry objects are created on access, and changes made to their attributes are
+	written back to the list.  For bulk operations, iter_rows() avoids creating entry
+	objects altogether.
+
+	Rows may be looked up by attribute value with find().  Lookup indexes are built
+	on first use and kept in sync as rows are added or changed.
+
+	If ‘entry_type’ is not given, it’s taken from the first entry, defaulting to
+	AddrListEntry for an empty list.
+	"""
+
+	def __init__(self, entries=(), *, entry_type=None, proto=None):
+		self.entry_type = entry_type
+		self.proto = proto
+		self.columns = {}
+		self.indexes = {}
+		self.num_rows = 0
+		for e in entries:
+			self.append(e)
+		if self.entry_type is None:
+			self.entry_type = AddrListEntry
+
+	def __len__(self):
+		return self.num_rows
+
+	def __iter__(self):
+		for pos in range(self.num_rows):
+			yield self.make_entry(pos)
+
+	def __getitem__(self, key):
+		if isinstance(key, slice):
+			return [self.make_entry(pos) for pos in range(self.num_rows)[key]]
+		return self.make_entry(range(self.num_rows)[key])
+
+	def append(self, entry):
+		if self.entry_type is None: # first entry passed to __init__()
+			self.entry_type = type(entry)
+			self.proto = self.proto or entry.proto
+		else:
+			assert type(entry) is self.entry_type, f'{type(entry).__name__}: incorrect entry type'
+		self.add(**entry._asdict())
+
+	def add(self, **kwargs):
+		"""
+		append a row to the list, bypassing creation of an entry object
+
+		Values must be of the types produced by the entry type’s attribute descriptors.
+		"""
+		pos = self.num_rows
+		for k, v in kwargs.items():
+			if v is not None:
+				assert k in self.entry_type.valid_attrs, f'{k!r}: invalid attribute'
+				self.set_value(pos, k, v)
+		self.num_rows += 1
+
+	def set_value(self, pos, name, val):
+		col = self.columns.get(name)
+		if col is None:
+			col = self.columns[name] = _make_column(val)
+		elif not col.can_store(val):
+			col = self.columns[name] = _ObjColumn(col.get(i) for i in range(len(col)))
+		if (index := self.indexes.get(name)) is not None and col.key(pos) is not None:
+			del self.indexes[name] # value replaced: rebuild index on next lookup
+			index = None
+		col.set(pos, val)
+		if index is not None:
+			index.setdefault(col.key(pos), pos)
+
+	def find(self, name, val):
+		"return the position of the first row whose attribute ‘name’ equals ‘val’, or None"
+		if (index := self.indexes.get(name)) is None:
+			index = self.indexes[name] = {}
+			if col := self.columns.get(name):
+				for pos in range(len(col)):
+					if (key := col.key(pos)) is not None:
+						index.setdefault(key, pos)
+		return index.get(val)
+
+	def get_value(self, pos, name):
+		return self.columns[name].get(pos) if name in self.columns else None
+
+	def get_column(self, name):
+		"return the values of attribute ‘name’ for all rows"
+		col = self.columns.get(name)
+		return [col.get(pos) for pos in range(self.num_rows)] if col else [None] * self.num_rows
+
+	def make_entry(self, pos):
+		e = object.__new__(self.entry_type)
+		d = e.__dict__
+		d['proto'] = self.proto
+		d['valid_attrs'] = self.entry_type.valid_attrs
+		for name, col in self.columns.items():
+			if (val := col.get(pos)) is not None:
+				d[name] = val
+		d['_row'] = (self, pos)
+		return e
+
+	def iter_rows(self):
+		"""
+		yield the attributes of each row as a namedtuple, with None for unset attributes
+		"""
+		row = get_row_type(self.entry_type)
+		cols = [self.columns.get(name) for name in row._fields]
+		for pos in range(self.num_rows):
+			yield row(*(col.get(pos) if col else None for col in cols))
+
+_row_types = {}
+
+def get_row_type(entry_type):
+	"return a namedtuple type with the attributes of list entry type ‘entry_type’"
+	if entry_type not in _row_types:
+		_row_types[entry_type] = namedtuple(entry_type.__name__ + 'Row', sorted(entry_type.valid_attrs))
+	return _row_types[entry_type]
+
+def _gen_entry_data_batch(gen_entry_data, batch):
+	"worker process function for AddrList.generate()"
+	from .mproc import pack
+	return [(idx, [(k, pack(v)) for k, v in data.items()]) for idx, data in gen_entry_data(batch)]
 
 class AddrList(MMGenObject): # Address info for a single seed ID
 	entry_type   = AddrListEntry
@@ -148,6 +525,9 @@ class AddrList(MMGenObject): # Address info for a single seed ID
 	gen_keys     = False
 	has_keys     = False
 	chksum_rec_f = lambda foo, e: (str(e.idx), e.addr.views[e.addr.view_pref])
+	batch_size   = 256
+	mproc_min_addrs = 100 # don’t start worker processes for fewer addresses than this
+	stream_min_addrs = 10000 # generator commands use streaming mode for this many addresses or more
 
 	def dmsg_sc(self, desc, data):
 		Msg(f'sc_debug_{desc}: {data}')
@@ -172,12 +552,15 @@ class AddrList(MMGenObject): # Address info for a single seed ID
 			key_address_validity_check = None, # None=prompt user, True=check without prompt, False=skip check
 			skip_chksum = False,
 			skip_chksum_msg = False,
-			add_p2pkh = False):
+			add_p2pkh = False,
+			stream    = False): # generate or read entries on the fly instead of storing them
 
 		self.cfg = cfg
 		self.ka_validity_chk = key_address_validity_check
 		self.add_p2pkh = add_p2pkh
 		self.proto = proto
+		self.stream = stream
+		self.skip_chksum_msg = skip_chksum_msg
 		do_chksum = False
 
 		if not cfg.debug_addrlist:
@@ -186,26 +569,36 @@ class AddrList(MMGenObject): # Address info for a single seed ID
 		if seed and addr_idxs:   # data from seed + idxs
 			self.al_id = AddrListID(sid=seed.sid, mmtype=MMGenAddrType(proto, mmtype or proto.dfl_mmtype))
 			src = 'gen'
-			adata = self.generate(
-				seed,
-				addr_idxs if isinstance(addr_idxs, AddrIdxList) else AddrIdxList(fmt_str=addr_idxs))
-			do_chksum = True
+			if not isinstance(addr_idxs, AddrIdxList):
+				addr_idxs = AddrIdxList(fmt_str=addr_idxs)
+			if stream:
+				self.seed, self.addr_idxs = (seed, addr_idxs)
+				adata = AddrListData(entry_type=self.entry_type, proto=proto)
+			else:
+				adata = self.generate(seed, addr_idxs)
+				do_chksum = True
 		elif infile:             # data from MMGen address file
 			self.infile = infile
-			adata = self.file.parse_file(infile) # sets self.al_id
-			do_chksum = True
+			if stream:
+				self.file.parse_file(infile, header_only=True) # sets self.al_id
+				adata = AddrListData(entry_type=self.entry_type, proto=proto)
+			else:
+				adata = self.file.parse_file(infile) # sets self.al_id
+				do_chksum = True
 		elif al_id and adata:    # data from tracking wallet
 			self.al_id = al_id
 		elif addrlist:           # data from flat address list
 			self.al_id = None
 			from .util import remove_dups
 			addrlist = remove_dups(addrlist, edesc='address', desc='address list')
-			adata = AddrListData([AddrListEntry(proto=proto, addr=a) for a in addrlist])
+			adata = AddrListData([AddrListEntry(proto=proto, addr=a) for a in addrlist], proto=proto)
 		elif keylist:            # data from flat key list
 			self.al_id = None
 			from .util import remove_dups
 			keylist = remove_dups(keylist, edesc='key', desc='key list', hide=True)
-			adata = AddrListData([AddrListEntry(proto=proto, sec=PrivKey(proto=proto, wif=k)) for k in keylist])
+			adata = AddrListData(
+				[AddrListEntry(proto=proto, sec=PrivKey(proto=proto, wif=k)) for k in keylist],
+				proto = proto)
 		elif seed or addr_idxs:
 			die(3, 'Must specify both seed and addr indexes')
 		elif al_id or adata:
@@ -226,7 +619,12 @@ class AddrList(MMGenObject): # Address info for a single seed ID
 			if not 'viewkey' in self.al_id.mmtype.extra_attrs:
 				die(1, f'viewkeys not supported for address type {self.al_id.mmtype.desc!r}')
 
-		self.id_str = AddrListIDStr(self)
+		if stream:
+			self.num_addrs = len(self.addr_idxs) if src == 'gen' else None
+			self.id_str = self.make_id_str(idxs=self.addr_idxs) if src == 'gen' else None
+			return
+
+		self.id_str = self.make_id_str()
 
 		if type(self) is KeyList:
 			return
@@ -236,6 +634,9 @@ class AddrList(MMGenObject): # Address info for a single seed ID
 			if not skip_chksum_msg:
 				self.do_chksum_msg(record=src=='gen')
 
+	def make_id_str(self, *, idxs=None):
+		return AddrListIDStr(self, idxs=idxs)
+
 	def do_chksum_msg(self, record):
 		chk = 'Check this value against your records'
 		rec = f'Record this checksum: it will be used to verify the {self.desc} file in the future'
@@ -244,58 +645,89 @@ class AddrList(MMGenObject): # Address info for a single seed ID
 			(chk, rec)[record])
 
 	def generate(self, seed, addr_idxs):
+		out = AddrListData(entry_type=self.entry_type, proto=self.proto)
+		if self.cfg.addr_cache and type(self) is AddrList and not self.add_p2pkh:
+			return self.generate_cached(seed, addr_idxs, out)
+		for idx, data in self.gen_data(seed, addr_idxs):
+			out.add(idx=idx, **data)
+		return out
+
+	def generate_cached(self, seed, addr_idxs, out):
+		"""
+		generate an address-only list, using and updating the persistent address cache
+
+		Only indexes missing from the cache are generated.  List entries contain no keys.
+		"""
+		from .addrcache import AddrCache
+		cache = AddrCache(self.cfg, self.proto, self.al_id, self.scramble_seed(seed.data))
+		missing = [idx for idx in addr_idxs if idx not in cache.addrs]
+		new = {}
+		if missing:
+			for idx, data in self.gen_data(seed, AddrIdxList(idx_list=missing)):
+				new[idx] = data['addr']
+				cache.add(idx, data['addr'])
+			cache.save()
+		if len(missing) < len(addr_idxs):
+			self.cfg._util.qmsg('{}: {} address{} loaded from cache'.format(
+				self.al_id.hl(),
+				len(addr_idxs) - len(missing),
+				suf(len(addr_idxs) - len(missing), 'es')))
+		for idx in addr_idxs:
+			out.add(idx=AddrIdx(idx), addr=new.get(idx) or CoinAddr(self.proto, cache.addrs[idx]))
+		return out
 
+	def gen_data(self, seed, addr_idxs):
+		"""
+		generate list entry data from ‘seed’ for indexes ‘addr_idxs’, yielding (idx,
+		attribute dict) pairs
+		"""
 		seed = self.scramble_seed(seed.data)
 		self.dmsg_sc('seed', seed[:8].hex())
 
 		mmtype = self.al_id.mmtype
 
-		gen_wallet_passwd = type(self) in (KeyAddrList, ViewKeyAddrList) and 'wallet_passwd' in mmtype.extra_attrs
-		gen_viewkey       = type(self) in (KeyAddrList, ViewKeyAddrList) and 'viewkey' in mmtype.extra_attrs
-
-		if self.gen_addrs:
-			from .keygen import KeyGenerator
-			from .addrgen import AddrGenerator
-			kg = KeyGenerator(self.cfg, self.proto, mmtype.pubkey_type)
-			ag = AddrGenerator(self.cfg, self.proto, mmtype)
-			if self.add_p2pkh:
-				ag2 = AddrGenerator(self.cfg, self.proto, 'compressed')
-
 		from .derive import derive_coin_privkey_bytes
 
 		t_addrs = len(addr_idxs)
-		le = self.entry_type
-		out = AddrListData()
+		n = 0
 		CR = '\n' if self.cfg.debug_addrlist else '\r'
 
-		for pk_bytes in derive_coin_privkey_bytes(seed, addr_idxs):
+		if self.cfg.derive_checkpoint_interval:
+			from .derive import DeriveCheckpoints
+			checkpoints = DeriveCheckpoints(self.cfg, seed, mmtype)
+		else:
+			checkpoints = None
+
+		gen_entry_data = self.get_entry_data_generator(mmtype)
 
-			if not self.cfg.debug:
-				self.cfg._util.qmsg_r(
-					f'{CR}Generating {self.gen_desc} #{pk_bytes.idx} ({pk_bytes.pos} of {t_addrs})')
+		from .mproc import get_jobs, split_into_batches
+		jobs = get_jobs(self.cfg)
+		use_mproc = jobs > 1 and self.gen_addrs and t_addrs >= self.mproc_min_addrs
 
-			e = le(proto=self.proto, idx=pk_bytes.idx)
+		# the hash chain is inherently serial, so it’s always computed in the main process
+		batches = split_into_batches(
+			((e.idx, e.data) for e in derive_coin_privkey_bytes(seed, addr_idxs, checkpoints=checkpoints)),
+			max(1, min(self.batch_size, t_addrs // (jobs * 4))) if use_mproc else self.batch_size)
 
-			e.sec = PrivKey(
-				self.proto,
-				pk_bytes.data,
-				compressed  = mmtype.compressed,
-				pubkey_type = mmtype.pubkey_type)
+		if use_mproc:
+			from .mproc import pool_imap, unpack
+			def gen_results():
+				for res in pool_imap(_gen_entry_data_batch, batches, jobs=jobs, state=gen_entry_data):
+					yield [(idx, {k: unpack(v, self.proto) for k, v in data}) for idx, data in res]
+		else:
+			def gen_results():
+				for batch in batches:
+					yield gen_entry_data(batch)
+
+		for res in gen_results():
+			for idx, data in res:
+				yield (AddrIdx(idx), data)
+				n += 1
+			if not self.cfg.debug:
+				self.cfg._util.qmsg_r(f'{CR}Generating {self.gen_desc} #{idx} ({n} of {t_addrs})')
 
-			if self.gen_addrs:
-				data = kg.gen_data(e.sec)
-				e.addr = ag.to_addr(data)
-				if self.add_p2pkh:
-					e.addr_p2pkh = ag2.to_addr(data)
-				if gen_viewkey:
-					e.viewkey = ag.to_viewkey(data)
-				if gen_wallet_passwd:
-					e.wallet_passwd = self.gen_wallet_passwd(
-						e.viewkey.encode() if type(self) is ViewKeyAddrList else e.sec)
-			elif self.gen_passwds:
-				e.passwd = self.gen_passwd(e.sec) # TODO - own type
-
-			out.append(e)
+		if checkpoints:
+			checkpoints.save()
 
 		self.cfg._util.qmsg('{}{}: {} {}{} generated{}'.format(
 			CR,
@@ -305,7 +737,54 @@ class AddrList(MMGenObject): # Address info for a single seed ID
 			suf(t_addrs, self.gen_desc_pl),
 			' ' * 15))
 
-		return out
+	def get_entry_data_generator(self, mmtype):
+		"""
+		return a function that generates the data attributes of list entries from a batch
+		of (idx, raw secret key bytes) pairs, yielding (idx, attribute dict) pairs
+		"""
+		gen_wallet_passwd = type(self) in (KeyAddrList, ViewKeyAddrList) and 'wallet_passwd' in mmtype.extra_attrs
+		gen_viewkey       = type(self) in (KeyAddrList, ViewKeyAddrList) and 'viewkey' in mmtype.extra_attrs
+
+		if self.gen_addrs:
+			from .keygen import KeyGenerator
+			from .addrgen import AddrGenerator
+			kg = KeyGenerator(self.cfg, self.proto, mmtype.pubkey_type)
+			ag = AddrGenerator(self.cfg, self.proto, mmtype)
+			if self.add_p2pkh:
+				ag2 = AddrGenerator(self.cfg, self.proto, 'compressed')
+
+		def gen_entry_data(batch):
+			idxs = [idx for idx, _ in batch]
+			secs = [PrivKey(
+					self.proto,
+					pk_data,
+					compressed  = mmtype.compressed,
+					pubkey_type = mmtype.pubkey_type,
+					check_wif   = False)
+				for _, pk_data in batch]
+
+			if self.gen_addrs:
+				datas = kg.gen_data_batch(secs)
+				addrs = ag.to_addrs(datas)
+				addrs_p2pkh = ag2.to_addrs(datas) if self.add_p2pkh else ()
+				for n, (idx, sec, data) in enumerate(zip(idxs, secs, datas)):
+					ret = {'sec': sec, 'addr': addrs[n]}
+					if self.add_p2pkh:
+						ret['addr_p2pkh'] = addrs_p2pkh[n]
+					if gen_viewkey:
+						ret['viewkey'] = ag.to_viewkey(data)
+					if gen_wallet_passwd:
+						ret['wallet_passwd'] = self.gen_wallet_passwd(
+							ret['viewkey'].encode() if type(self) is ViewKeyAddrList else sec)
+					yield (idx, ret)
+			else:
+				for idx, sec in zip(idxs, secs):
+					if self.gen_passwds:
+						yield (idx, {'sec': sec, 'passwd': self.gen_passwd(sec)}) # TODO - own type
+					else:
+						yield (idx, {'sec': sec})
+
+		return gen_entry_data
 
 	def gen_wallet_passwd(self, privbytes):
 		from .proto.btc.common import hash256
@@ -330,48 +809,43 @@ class AddrList(MMGenObject): # Address info for a single seed ID
 		return Crypto(self.cfg).scramble_seed(seed, scramble_key.encode())
 
 	def idxs(self):
-		return [e.idx for e in self.data]
+		return self.data.get_column('idx')
 
 	def addrs(self):
-		return [f'{self.al_id.sid}:{e.idx}' for e in self.data]
+		return [f'{self.al_id.sid}:{idx}' for idx in self.data.get_column('idx')]
 
 	def addrpairs(self):
-		return [(e.idx, e.addr) for e in self.data]
+		return list(zip(self.data.get_column('idx'), self.data.get_column('addr')))
 
 	def coinaddrs(self):
-		return [e.addr for e in self.data]
+		return self.data.get_column('addr')
 
 	def comments(self):
-		return [e.comment for e in self.data]
+		return self.data.get_column('comment')
 
 	def entry(self, idx):
-		for e in self.data:
-			if idx == e.idx:
-				return e
+		if (pos := self.data.find('idx', idx)) is not None:
+			return self.data[pos]
 
 	def coinaddr(self, idx):
-		for e in self.data:
-			if idx == e.idx:
-				return e.addr
+		if (pos := self.data.find('idx', idx)) is not None:
+			return self.data.get_value(pos, 'addr')
 
 	def comment(self, idx):
-		for e in self.data:
-			if idx == e.idx:
-				return e.comment
+		if (pos := self.data.find('idx', idx)) is not None:
+			return self.data.get_value(pos, 'comment')
 
 	def set_comment(self, idx, comment):
-		for e in self.data:
-			if idx == e.idx:
-				e.comment = comment
+		if (pos := self.data.find('idx', idx)) is not None:
+			self.data[pos].comment = comment
 
 	def make_reverse_dict_addrlist(self, coinaddrs):
 		d = MMGenDict()
-		b = coinaddrs
-		for e in self.data:
-			try:
-				d[b[b.index(e.addr)]] = (MMGenID(self.proto, f'{self.al_id}:{e.idx}'), e.comment)
-			except ValueError:
-				pass
+		for addr in coinaddrs:
+			if (pos := self.data.find('addr', addr)) is not None:
+				d[addr] = (
+					MMGenID(self.proto, f'{self.al_id}:{self.data.get_value(pos, "idx")}'),
+					self.data.get_value(pos, 'comment'))
 		return d
 
 	def add_wifs(self, key_list):
@@ -396,14 +870,45 @@ class AddrList(MMGenObject): # Address info for a single seed ID
 				for t in (compressed_types if pk.compressed else uncompressed_types):
 					yield (gen_addr(pk, t), pk)
 
-		addrs4keys = dict(gen())
-
-		for d in self.data:
-			if d.addr in addrs4keys:
-				d.sec = addrs4keys[d.addr]
+		for addr, pk in dict(gen()).items():
+			if (pos := self.data.find('addr', addr)) is not None:
+				self.data[pos].sec = pk
 
 	def list_missing(self, attr):
-		return [d.addr for d in self.data if not getattr(d, attr)]
+		return [addr for addr, v in zip(self.data.get_column('addr'), self.data.get_column(attr)) if not v]
+
+	def iter_entries(self):
+		"""
+		in streaming mode, generate or read the list’s entries one at a time, yielding
+		objects with the attributes of list entries
+
+		The checksum is computed incrementally and set after the last entry has been
+		produced, as are the ID string and entry count for lists read from file.
+		"""
+		assert self.stream, 'iter_entries() is available only in streaming mode'
+		hasher = AddrListChksumHasher(self)
+		infile = getattr(self, 'infile', None)
+		if infile:
+			ranges = []
+			for e in self.file.gen_file_entries(infile):
+				hasher.update(e)
+				if ranges and e.idx == ranges[-1][1] + 1:
+					ranges[-1][1] = e.idx
+				else:
+					ranges.append([e.idx, e.idx])
+				yield e
+			self.num_addrs = sum(b - a + 1 for a, b in ranges)
+			self.id_str = self.make_id_str(idxs=(i for a, b in ranges for i in range(a, b + 1)))
+		else:
+			row = get_row_type(self.entry_type)
+			for idx, data in self.gen_data(self.seed, self.addr_idxs):
+				data['idx'] = idx
+				e = row._make(map(data.get, row._fields))
+				hasher.update(e)
+				yield e
+		self.chksum = AddrListChksum(self, hasher=hasher)
+		if not self.skip_chksum_msg:
+			self.do_chksum_msg(record=not infile)
 
 	@property
 	def file(self):
@@ -202,7 +202,8 @@ class Signable:
 				TxKeys(
 					self.cfg,
 					tx1,
-					seedfiles = self.parent.wallet_files[:],
+					seedfiles = None if self.parent.seeds else self.parent.wallet_files[:],
+					seeds = self.parent.seeds,
 					keylist = self.parent.keylist,
 					passwdfile = str(self.parent.keyfile),
 					autosign = True).keys)
@@ -442,6 +443,19 @@ class Signable:
 				sigfile = f.parent / (f.name[:-len(self.rawext)] + self.sigext)
 				yield orange(sigfile.name) if sigfile.exists() else red(f.name)
 
+def _unlock_wallet(state, wf):
+	"""
+	decrypt wallet file ‘wf’, returning its seed data, the time taken and the exit code
+	"""
+	import time
+	cfg, passwd_file = state
+	start = time.time()
+	try:
+		seed_bin = Wallet(cfg, fn=wf, ignore_in_fmt=True, passwd_file=passwd_file).seed.data
+	except SystemExit as e:
+		return (None, time.time() - start, e.code)
+	return (seed_bin, time.time() - start, 0)
+
 class Autosign:
 
 	dev_label = 'MMGEN_TX'
@@ -514,6 +528,7 @@ class Autosign:
 				self.dfl_shm_dir    = f'/Volumes/{self.macOS_ramdisk_name}'
 
 		self.cfg = cfg
+		self.seeds = {}
 
 		self.dfl_wallet_dir = f'{self.dfl_shm_dir}/{self.wallet_subdir}'
 		self.mountpoint = Path(cfg.mountpoint or self.dfl_mountpoint)
@@ -657,14 +672,36 @@ class Autosign:
 			bmsg('It is now safe to extract the removable device')
 
 	def decrypt_wallets(self):
+		"""
+		unlock the wallets concurrently, saving their seeds to ‘self.seeds’ for use in
+		signing
+
+		Seeds are returned from the worker processes as raw seed data over a pipe
+		and are never written to disk.
+		"""
 		msg(f'Unlocking wallet{suf(self.wallet_files)} with key from ‘{self.keyfile}’')
+		from .mproc import get_jobs, pool_imap
+		from .seed import Seed
+		from .crypto import Crypto
+		state = (self.cfg, str(self.keyfile))
+		jobs = min(
+			len(self.wallet_files),
+			get_jobs( # hash preset of wallets is unknown, so assume the most memory-intensive one
+				self.cfg,
+				jobs    = self.cfg.scrypt_jobs,
+				job_mem = max(map(Crypto.get_scrypt_mem, Crypto.hash_presets.values()))))
 		fails = 0
-		for wf in self.wallet_files:
-			try:
-				Wallet(self.cfg, fn=wf, ignore_in_fmt=True, passwd_file=str(self.keyfile))
-			except SystemExit as e:
-				if e.code != 0:
-					fails += 1
+		self.seeds = {}
+		for wf, (seed_bin, secs, exit_code) in zip(
+				self.wallet_files,
+				pool_imap(_unlock_wallet, self.wallet_files, jobs=jobs, state=state) if jobs > 1 else
+				(_unlock_wallet(state, wf) for wf in self.wallet_files)):
+			if exit_code != 0:
+				fails += 1
+			if seed_bin:
+				seed = Seed(self.cfg, seed_bin=seed_bin)
+				self.seeds[seed.sid] = seed
+				self.cfg._util.qmsg(f'Unlocked ‘{wf.name}’ (Seed ID {seed.sid}) in {secs:.2f} seconds')
 
 		return not fails
 
@@ -704,12 +741,16 @@ class Autosign:
 		if not self.cfg.stealth_led:
 			self.led.set('busy')
 		self.do_mount()
-		key_ok = self.decrypt_wallets()
-		self.init_non_mmgen_keys()
+		try:
+			key_ok = self.decrypt_wallets()
+			self.init_non_mmgen_keys()
+			if key_ok:
+				if self.cfg.stealth_led:
+					self.led.set('busy')
+				ret = [await self.sign_all(signable) for signable in self.signables]
+		finally:
+			self.seeds = {}
 		if key_ok:
-			if self.cfg.stealth_led:
-				self.led.set('busy')
-			ret = [await self.sign_all(signable) for signable in self.signables]
 			for val in ret:
 				if isinstance(val, str):
 					msg(val)
@@ -16,6 +16,8 @@ bip_hd: BIP-44/49/84, SLIP-44 hierarchical-deterministic key derivation library
 #   https://blog.unit410.com/bitcoin/bip32/bip39/kdf/2021/05/17/inconsistent-bip32-derivations.html
 
 import hmac
+from hashlib import sha256
+from collections import OrderedDict
 
 from ..cfg import Config
 from ..util import is_int, fmt
@@ -26,13 +28,60 @@ from ..addr import MMGenAddrType
 from ..key import PrivKey
 from ..protocol import CoinProtocol
 from ..proto.btc.common import hash160, b58chk_encode, b58chk_decode
-from ..proto.secp256k1.secp256k1 import pubkey_tweak_add, pubkey_check
+from ..proto.secp256k1.secp256k1 import pubkey_tweak_add, pubkey_tweak_add_batch, pubkey_check
 
 from . import chainparams
-chainparams_data = chainparams.parse_data()
+
+class ChainParamsTable:
+	"""
+	Lazily parsed BIP-HD chain parameter table
+
+	Each section of the table is parsed on first access only, and lookups by chain
+	name and version bytes are done via dicts built once per section.
+	"""
+	vb_search_order = (49, 84, 86, 44) # search bip-44 last, since it has the most entries
+
+	def __init__(self):
+		self.sections = None
+		self.parsed = {}
+		self.vb_idx = None
+
+	@property
+	def defaults(self):
+		if 'defaults' not in self.parsed:
+			self.sections = chainparams.split_sections()
+			self.parsed['defaults'] = chainparams.parse_line(self.sections.pop('defaults')[0], None)
+		return self.parsed['defaults']
+
+	def __getitem__(self, key):
+		if key == 'defaults':
+			return self.defaults
+		if key not in self.parsed:
+			defaults = self.defaults
+			self.parsed[key] = chainparams.parse_section(self.sections[key], defaults)
+		return self.parsed[key]
+
+	def get_vb_idx(self):
+		"""
+		return a dict mapping extended key version bytes to (bipnum, chainparams entry)
+		"""
+		if self.vb_idx is None:
+			e = self.defaults
+			idx = {e.vb_pub: (None, e), e.vb_prv: (None, e)}
+			for bipnum in self.vb_search_order:
+				for e in self[f'bip-{bipnum}'].values():
+					idx.setdefault(e.vb_pub, (bipnum, e))
+					idx.setdefault(e.vb_prv, (bipnum, e))
+			self.vb_idx = idx
+		return self.vb_idx
+
+chainparams_data = ChainParamsTable()
 
 secp256k1_order = CoinProtocol.Secp256k1.secp256k1_group_order
 hardened_idx0 = 0x80000000
+# pubkey_tweak_add_batch() returns each key in the serialization format of its input key,
+# which for BIP-32 nodes is always compressed:
+batch_pubkey_len = 33
 
 def get_chain_params(bipnum, chain):
 	return chainparams_data[f'bip-{bipnum}'][chain.upper()]
@@ -43,14 +92,10 @@ def get_version_bytes(bip_proto, coin, public):
 		'vb_pub' if public else 'vb_prv')
 
 def parse_version_bytes(vb_hex):
-	e = chainparams_data['defaults']
-	if vb_hex in (e.vb_pub, e.vb_prv):
-		return (None, e)
-	for bipnum in (49, 84, 86, 44): # search bip-44 last, since it has the most entries
-		for e in chainparams_data[f'bip-{bipnum}'].values():
-			if vb_hex in (e.vb_pub, e.vb_prv):
-				return (bipnum, e)
-	raise ValueError(f'0x{vb_hex}: unrecognized extended key version bytes')
+	try:
+		return chainparams_data.get_vb_idx()[vb_hex]
+	except KeyError:
+		raise ValueError(f'0x{vb_hex}: unrecognized extended key version bytes') from None
 
 def compress_pubkey(pubkey_bytes):
 	# see: proto.secp256k1.keygen.pubkey_format()
@@ -220,10 +265,46 @@ class MasterNode(Lockable):
 			hardened = hardened,
 			public   = public)
 
+class BipHDNodeCache(OrderedDict):
+	"""
+	LRU cache of the keys and chain codes of private nodes derived by
+	BipHDNode.from_path(), keyed by seed fingerprint, configuration and path
+
+	Nodes at intermediate depths are cached too, so paths sharing a parent, such as
+	consecutive address indexes on the same chain, reuse the parent’s derivation.
+	A cache is used only if the caller passes it to from_path(), and its contents
+	should be discarded with clear() once the keys are no longer needed.
+	"""
+	max_size = 256
+
+	def get_node(self, key, cfg):
+		"""
+		return a new node with configuration ‘cfg’ built from the cached data for
+		‘key’, or None
+		"""
+		if key in self:
+			self.move_to_end(key)
+			depth, *data = self[key]
+			new = bip_hd_nodes[depth]()
+			new.cfg = cfg
+			new.depth = depth
+			new.par_print, new.key, new.chaincode, new.idx, new.hardened = data
+			new.public = False
+			new._lock()
+			return new
+		return None
+
+	def add(self, key, node):
+		self[key] = (node.depth, node.par_print, node.key, node.chaincode, node.idx, node.hardened)
+		if len(self) > self.max_size:
+			self.popitem(last=False)
+
 class BipHDNode(Lockable):
 	_autolock = False
 	_generated_pubkey = None
-	_set_ok = ('_generated_pubkey',)
+	_id = None
+	_address = None
+	_set_ok = ('_generated_pubkey', '_id', '_address')
 
 	def check_param(self, name, val):
 		cls = type(self)
@@ -268,16 +349,21 @@ class BipHDNode(Lockable):
 		return self._generated_pubkey
 
 	@property
-	def address(self):
-		return self.cfg.ag.to_addr(
+	def pubkey_data(self):
+		return (
 			keygen_public_data(
-					pubkey        = self.key if self.cfg.addr_type.compressed else decompress_pubkey(self.key),
-					viewkey_bytes = None,
-					pubkey_type   = self.cfg.addr_type.pubkey_type,
-					compressed    = self.cfg.addr_type.compressed)
-				if self.public else
-			self.priv2pub()
-		)
+				pubkey        = self.key if self.cfg.addr_type.compressed else decompress_pubkey(self.key),
+				viewkey_bytes = None,
+				pubkey_type   = self.cfg.addr_type.pubkey_type,
+				compressed    = self.cfg.addr_type.compressed)
+			if self.public else
+			self.priv2pub())
+
+	@property
+	def address(self):
+		if not self._address:
+			self._address = self.cfg.ag.to_addr(self.pubkey_data)
+		return self._address
 
 	# Extended keys can be identified by the Hash160 (RIPEMD160 after SHA256) of the serialized ECDSA
 	# public key K, ignoring the chain code. This corresponds exactly to the data used in traditional
@@ -286,7 +372,9 @@ class BipHDNode(Lockable):
 	# chain key itself).
 	@property
 	def id(self):
-		return hash160(self.pubkey_bytes)
+		if not self._id:
+			self._id = hash160(self.pubkey_bytes)
+		return self._id
 
 	# The first 32 bits of the identifier are called the key fingerprint.
 	@property
@@ -324,6 +412,44 @@ class BipHDNode(Lockable):
 		return self.derive(idx=idx, hardened=hardened, public=False)
 
 	def derive(self, idx, *, hardened, public):
+		new = self.init_child(idx, hardened=hardened, public=public, par_print=self.fingerprint)
+		self.set_child_key(new, b'\x00' + self.key if new.hardened else self.pubkey_bytes)
+		new._lock()
+		return new
+
+	def derive_range(self, start, count, *, hardened=False, public=False):
+		"""
+		derive ‘count’ child nodes with consecutive indexes beginning at ‘start’,
+		returning a list
+
+		The parent’s public key and fingerprint are computed only once, and the
+		children’s public keys and addresses are generated in a single batch.  For
+		public derivation, the children’s public keys are computed with a single
+		call to the extension module.
+		"""
+		par_print = self.fingerprint
+		pubkey_bytes = None if hardened else self.pubkey_bytes
+		ret = [self.init_child(idx, hardened=hardened, public=public, par_print=par_print)
+			for idx in range(start, start + count)]
+		if public and not hardened:
+			I_data = [self.get_child_hmac(new, pubkey_bytes) for new in ret]
+			assert len(pubkey_bytes) == batch_pubkey_len
+			keys = pubkey_tweak_add_batch(pubkey_bytes, b''.join(I[:32] for I in I_data))
+			for n, (new, I) in enumerate(zip(ret, I_data)):
+				new.key = keys[n*batch_pubkey_len:(n+1)*batch_pubkey_len]
+				new.chaincode = I[32:]
+		else:
+			for new in ret:
+				self.set_child_key(new, b'\x00' + self.key if new.hardened else pubkey_bytes)
+		if not public:
+			for new, data in zip(ret, self.cfg.kg.gen_data_batch([new.privkey for new in ret])):
+				new._generated_pubkey = data
+		for new, addr in zip(ret, self.cfg.ag.to_addrs([new.pubkey_data for new in ret])):
+			new._address = addr
+			new._lock()
+		return ret
+
+	def init_child(self, idx, *, hardened, public, par_print):
 
 		if self.public and not public:
 			raise ValueError('cannot derive private node from public node!')
@@ -332,7 +458,7 @@ class BipHDNode(Lockable):
 
 		new.depth     = self.depth + 1
 		new.cfg       = self.cfg
-		new.par_print = self.fingerprint
+		new.par_print = par_print
 		new.public    = public
 
 		if new.cfg.no_path_checks:
@@ -343,13 +469,18 @@ class BipHDNode(Lockable):
 					f'‘public’ requested, but node of depth {new.depth} ({new.desc}) must be hardened!')
 			new.idx, new.hardened = new.set_params(new.cfg, idx, hardened=hardened)
 
-		key_in = b'\x00' + self.key if new.hardened else self.pubkey_bytes
+		return new
 
-		I = hmac.digest(
+	def get_child_hmac(self, new, key_in):
+		return hmac.digest(
 			self.chaincode,
 			key_in + ((hardened_idx0 if new.hardened else 0) + new.idx).to_bytes(length=4, byteorder='big'),
 			'sha512')
 
+	def set_child_key(self, new, key_in):
+
+		I = self.get_child_hmac(new, key_in)
+
 		pk_addend_bytes = I[:32]
 		new.chaincode   = I[32:]
 
@@ -362,9 +493,6 @@ class BipHDNode(Lockable):
 			check_privkey(key_int)
 			new.key = int.to_bytes(key_int, length=32, byteorder='big')
 
-		new._lock()
-		return new
-
 	@staticmethod
 	def from_path(
 			base_cfg,
@@ -373,19 +501,14 @@ class BipHDNode(Lockable):
 			*,
 			coin           = None,
 			addr_type      = None,
-			no_path_checks = False):
+			no_path_checks = False,
+			node_cache     = None):
 
 		path = path_str.lower().split('/')
 		if path.pop(0) != 'm':
 			raise ValueError(f'{path_str}: invalid path string (first component is not "m")')
 
-		res = MasterNode(base_cfg, seed).init_cfg(
-			coin           = coin or 'btc',
-			addr_type      = addr_type or 'compressed',
-			no_path_checks = no_path_checks,
-			from_path      = True)
-
-		for s in path:
+		def parse_component(s):
 			for suf in ("'", 'h'):
 				if s.endswith(suf):
 					idx = s.removesuffix(suf)
@@ -398,7 +521,34 @@ class BipHDNode(Lockable):
 			if not is_int(idx):
 				raise ValueError(f'invalid path component {s!r}')
 
-			res = res.derive(int(idx), hardened=hardened, public=False)
+			return (int(idx), hardened)
+
+		components = tuple(parse_component(s) for s in path)
+
+		res = MasterNode(base_cfg, seed).init_cfg(
+			coin           = coin or 'btc',
+			addr_type      = addr_type or 'compressed',
+			no_path_checks = no_path_checks,
+			from_path      = True)
+		depth = 0
+
+		if node_cache is not None:
+			key_pfx = (
+				sha256(seed).digest(),
+				base_cfg.network,
+				coin or 'btc',
+				addr_type or 'compressed',
+				no_path_checks)
+			# resume derivation from the deepest cached node on the path:
+			for n in range(len(components), 0, -1):
+				if node := node_cache.get_node(key_pfx + components[:n], res.cfg):
+					res, depth = (node, n)
+					break
+
+		for n, (idx, hardened) in enumerate(components[depth:], depth + 1):
+			res = res.derive(idx, hardened=hardened, public=False)
+			if node_cache is not None:
+				node_cache.add(key_pfx + components[:n], res)
 
 		return res
 
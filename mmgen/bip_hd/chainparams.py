@@ -7,55 +7,58 @@
 
 from collections import namedtuple
 
-def parse_data():
+_d = namedtuple(
+	'bip_hd_data',
+	'idx chain curve network addr_cls vb_prv vb_pub vb_wif vb_addr def_path name')
+_u = namedtuple(
+	'bip_hd_data_partial',
+	'idx chain name')
 
-	_d = namedtuple(
-		'bip_hd_data',
-		'idx chain curve network addr_cls vb_prv vb_pub vb_wif vb_addr def_path name')
-	_u = namedtuple(
-		'bip_hd_data_partial',
-		'idx chain name')
-
-	def parse_line(line):
-		match line.split():
-			case [idx, chain, col3, *name] if col3 == '-':
-				return _u(
-					idx   = int(idx),
-					chain = chain,
-					name  = ' '.join(name))
-			case [idx, chain, curve, net, acls, vprv, vpub, vwif, vaddr, dpath, *name]:
-				return _d(
-					idx      = int(idx),
-					chain    = chain,
-					curve    = defaults.curve if curve == 'x' else curve,
-					network  = 'mainnet' if net == 'm' else 'testnet' if net == 'T' else None,
-					addr_cls = acls,
-					vb_prv   = defaults.vb_prv if vprv == 'x' else vprv,
-					vb_pub   = defaults.vb_pub if vpub == 'x' else vpub,
-					vb_wif   = vwif,
-					vb_addr  = vaddr,
-					def_path = defaults.def_path if dpath == 'x' else dpath,
-					name     = ' '.join(name))
-			case _:
-				raise ValueError(f'{line!r}: invalid line')
+def parse_line(line, defaults):
+	match line.split():
+		case [idx, chain, col3, *name] if col3 == '-':
+			return _u(
+				idx   = int(idx),
+				chain = chain,
+				name  = ' '.join(name))
+		case [idx, chain, curve, net, acls, vprv, vpub, vwif, vaddr, dpath, *name]:
+			return _d(
+				idx      = int(idx),
+				chain    = chain,
+				curve    = defaults.curve if curve == 'x' else curve,
+				network  = 'mainnet' if net == 'm' else 'testnet' if net == 'T' else None,
+				addr_cls = acls,
+				vb_prv   = defaults.vb_prv if vprv == 'x' else vprv,
+				vb_pub   = defaults.vb_pub if vpub == 'x' else vpub,
+				vb_wif   = vwif,
+				vb_addr  = vaddr,
+				def_path = defaults.def_path if dpath == 'x' else dpath,
+				name     = ' '.join(name))
+		case _:
+			raise ValueError(f'{line!r}: invalid line')
 
+def split_sections():
+	"""
+	return the unparsed lines of each section of the table, keyed by section name
+	"""
 	out = {}
 	for line in _data_in.strip().splitlines():
 		if not line or line.startswith('IDX'):
 			continue
 		if line.startswith('['):
-			key = line[1:-1]
-			continue
-		p = parse_line(line)
-		match key:
-			case k if k in out:
-				out[key][p[1]] = p
-			case 'defaults':
-				out['defaults'] = p
-				defaults = p
-			case _:
-				out[key] = {p[1]: p}
+			out[line[1:-1]] = lines = []
+		else:
+			lines.append(line)
+	return out
 
+def parse_section(lines, defaults):
+	"""
+	parse the lines of a single section into a dict keyed by chain name
+	"""
+	out = {}
+	for line in lines:
+		p = parse_line(line, defaults)
+		out[p.chain] = p
 	return out
 
 # RUNE derivation is SLIP-10, not BIP-44, but we treat them as equivalent
@@ -226,6 +226,13 @@ class Config(Lockable):
 	enable_erigon                  = False
 	autochg_ignore_labels          = False
 	autosign                       = False
+	derive_checkpoint_interval     = 0
+	jobs                           = 1
+	scrypt_jobs                    = 0
+	addr_cache                     = False
+	subseed_index                  = False
+	txhist_cache                   = False
+	block_cache                    = False
 
 	# regtest:
 	bob          = False
@@ -293,20 +300,25 @@ class Config(Lockable):
 		('autosign', 'outdir'),
 	)
 
-	# proto-specific only: eth_mainnet_chain_names eth_testnet_chain_names
+	# proto-specific only: eth_mainnet_chain_names eth_testnet_chain_names eth_mainnet_multicall_addr
+	#                      eth_testnet_multicall_addr
 	# coin-specific only:  bch_cashaddr (alias of cashaddr)
 	_cfg_file_opts = (
+		'addr_cache',
 		'autochg_ignore_labels',
 		'autosign',
+		'block_cache',
 		'color',
 		'daemon_data_dir',
 		'daemon_id', # also coin-specific
 		'debug',
+		'derive_checkpoint_interval',
 		'fee_adjust',
 		'force_256_color',
 		'hash_preset',
 		'http_timeout',
 		'ignore_daemon_version', # also coin-specific
+		'jobs',
 		'macos_autosign_ramdisk_size',
 		'max_input_size',
 		'max_tx_file_size',
@@ -322,9 +334,12 @@ class Config(Lockable):
 		'rpc_port',     # also coin-specific
 		'rpc_user',     # also coin-specific
 		'scroll',
+		'scrypt_jobs',
+		'subseed_index',
 		'subseeds',
 		'testnet',
 		'tw_name',      # also coin-specific
+		'txhist_cache',
 		'usr_randchars')
 
 	# Supported environmental vars
@@ -401,6 +416,7 @@ class Config(Lockable):
 	_auto_typeset_opts = {
 		'seed_len': int,
 		'subseeds': int,
+		'key_verify_confidence': float,
 		'vsize_adj': float}
 
 	# test suite:
@@ -416,7 +432,7 @@ class Config(Lockable):
 			stdin_tty = True
 		if gc.prog_name == 'modtest.py':
 			_set_ok += ('debug_subseed',)
-			_reset_ok += ('force_standalone_scrypt_module',)
+			_reset_ok += ('force_standalone_scrypt_module', 'scrypt_jobs')
 
 	if os.getenv('MMGEN_DEBUG_ALL'):
 		for name in _env_opts:
@@ -923,6 +939,21 @@ def check_opts(cfg): # Raises exception if any check fails
 					display_opt(name, val)
 					die('UserOptError', 'Option requires two comma-separated arguments')
 
+		def derive_checkpoint_interval():
+			if val != 0:
+				from .derive import DeriveCheckpoints
+				opt_compares(val, '>=', DeriveCheckpoints.min_interval)
+
+		def jobs():
+			opt_compares(val, '>=', 0)
+
+		def scrypt_jobs():
+			opt_compares(val, '>=', 0)
+
+		def key_verify_confidence():
+			opt_compares(val, '>', 0)
+			opt_compares(val, '<', 100)
+
 		def usr_randchars():
 			if val != 0:
 				opt_compares(val, '>=', cfg.min_urandchars)
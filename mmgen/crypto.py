@@ -26,6 +26,10 @@ from collections import namedtuple
 from .cfg import gc
 from .util import msg, msg_r, ymsg, fmt, die, make_chksum_8, oneshot_warning
 
+def _scrypt_romix_lane(state, lane):
+	from .romix import romix
+	return romix(lane, *state)
+
 class Crypto:
 
 	mmenc_ext = 'mmenc'
@@ -39,6 +43,11 @@ class Crypto:
 	mmenc_salt_len = 32
 	mmenc_nonce_len = 32
 
+	mmenc_stream_magic = b'MMGenEncStream'
+	mmenc_stream_version = 1
+	mmenc_stream_dfl_chunk_exp = 20 # 1 MiB
+	mmenc_stream_tag_len = 32
+
 	# Scrypt params: 'id_num': [N, r, p] (N is an exponent of two)
 	# NB: scrypt() in Python hashlib supports max N value of 14.  This means that
 	# for hash presets > 3 the standalone scrypt library must be used!
@@ -52,6 +61,9 @@ class Crypto:
 		'6': _hp(17, 8, 20),
 		'7': _hp(18, 8, 24)}
 
+	# lanes of cheaper hashes are computed serially, as forking costs more than it saves
+	scrypt_parallel_min_N = 14
+
 	class pwfile_reuse_warning(oneshot_warning):
 		message = 'Reusing passphrase from file {!r} at user request'
 		def __init__(self, fn):
@@ -162,6 +174,34 @@ class Crypto:
 		encryptor = c.encryptor()
 		return encryptor.update(enc_data) + encryptor.finalize()
 
+	@staticmethod
+	def get_scrypt_mem(ps):
+		"""
+		return the memory in bytes used by ROMix for a single lane of a scrypt hash
+		with parameters ‘ps’
+		"""
+		return 128 * ps.r * 2**ps.N
+
+	def get_scrypt_jobs(self, ps):
+		"""
+		return the number of worker processes to use for the lanes of a scrypt hash
+		with parameters ‘ps’, or 1 if the lanes must be computed serially
+
+		Forking a multi-threaded process is unsafe, so lanes are computed serially
+		if other threads are running.
+		"""
+		if ps.p == 1 or ps.N < self.scrypt_parallel_min_N or self.cfg.force_standalone_scrypt_module:
+			return 1
+		import threading
+		if threading.active_count() > 1:
+			return 1
+		try:
+			from .romix import romix # noqa: F401
+		except ImportError:
+			return 1
+		from .mproc import get_jobs
+		return min(ps.p, get_jobs(self.cfg, jobs=self.cfg.scrypt_jobs, job_mem=self.get_scrypt_mem(ps)))
+
 	def scrypt_hash_passphrase(
 			self,
 			passwd,
@@ -198,11 +238,29 @@ class Crypto:
 				p        = ps.p,
 				buflen   = buflen)
 
+		def do_parallel_scrypt(jobs):
+			# PBKDF2, then ROMix on each lane in parallel, then PBKDF2 (RFC 7914, section 6)
+			from hashlib import pbkdf2_hmac
+			from .mproc import pool_imap
+			lane_len = 128 * ps.r
+			B = pbkdf2_hmac('sha256', passwd, salt, 1, ps.p * lane_len)
+			return pbkdf2_hmac(
+				'sha256',
+				passwd,
+				b''.join(pool_imap(
+					_scrypt_romix_lane,
+					(B[i:i+lane_len] for i in range(0, len(B), lane_len)),
+					jobs  = jobs,
+					state = (2**ps.N, ps.r))),
+				1,
+				buflen)
+
 		if int(hash_preset) > 3:
 			msg_r('Hashing passphrase, please wait...')
 
 		# hashlib.scrypt doesn't support N > 14 (hash preset > 3)
 		ret = (
+			do_parallel_scrypt(jobs) if (jobs := self.get_scrypt_jobs(ps)) > 1 else
 			do_standalone_scrypt() if ps.N > 14 or self.cfg.force_standalone_scrypt_module else
 			do_hashlib_scrypt())
 
@@ -398,14 +456,18 @@ class Crypto:
 			from .ui import get_words_from_user
 			return ' '.join(get_words_from_user(self.cfg, f'Enter {pw_desc} for {data_desc}: '))
 
+	def _get_mmenc_hash_preset(self, desc, hash_preset):
+		hp = hash_preset or self.cfg.hash_preset or self.get_hash_preset_from_user(data_desc=desc)
+		m  = ('user-requested', 'default')[hp=='3']
+		self.util.qmsg(f'Using {m} hash preset of {hp!r}')
+		return hp
+
 	def mmgen_encrypt(self, data, *, passwd=None, desc='data', hash_preset=None):
 		salt  = self.get_random(self.mmenc_salt_len)
 		iv    = self.get_random(self.aesctr_iv_len)
 		nonce = self.get_random(self.mmenc_nonce_len)
-		hp    = hash_preset or self.cfg.hash_preset or self.get_hash_preset_from_user(data_desc=desc)
-		m     = ('user-requested', 'default')[hp=='3']
 		self.util.vmsg(f'Encrypting {desc}')
-		self.util.qmsg(f'Using {m} hash preset of {hp!r}')
+		hp    = self._get_mmenc_hash_preset(desc, hash_preset)
 		passwd = passwd or self.get_new_passphrase(
 			data_desc = desc,
 			hash_preset = hp,
@@ -416,19 +478,110 @@ class Crypto:
 		return salt+iv+enc_d
 
 	def mmgen_decrypt(self, data, *, passwd=None, desc='data', hash_preset=None):
+		from io import BytesIO
+		ret = self.mmgen_decrypt_file(BytesIO(data), passwd=passwd, desc=desc, hash_preset=hash_preset)
+		return ret if ret is False or isinstance(ret, bytes) else b''.join(ret)
+
+	def _get_mmenc_stream_mac(self, key):
+		import hmac
+		from hashlib import sha256
+		return hmac.new(
+			hmac.digest(key, self.mmenc_stream_magic + b' authentication key', 'sha256'),
+			digestmod = sha256)
+
+	def _get_mmenc_stream_tag(self, mac, final):
+		m = mac.copy()
+		m.update(b'\x01' if final else b'\x00')
+		return m.digest()
+
+	def mmgen_encrypt_stream(self, fp, *, passwd=None, desc='data', hash_preset=None, chunk_exp=None):
+		"""
+		encrypt the contents of open binary file ‘fp’ in chunks, returning an
+		iterator over the encrypted data
+
+		The key is generated, and the user prompted if necessary, before this
+		method returns.  Each chunk of ciphertext is followed by an HMAC-SHA256 tag
+		over all preceding data, so that truncation or alteration of the file is
+		detected before any unauthenticated data is output by the decrypter.
+		"""
+		from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+		from cryptography.hazmat.backends import default_backend
+		salt = self.get_random(self.mmenc_salt_len)
+		iv   = self.get_random(self.aesctr_iv_len)
+		chunk_exp = chunk_exp or self.mmenc_stream_dfl_chunk_exp
+		self.util.vmsg(f'Encrypting {desc}')
+		hp   = self._get_mmenc_hash_preset(desc, hash_preset)
+		passwd = passwd or self.get_new_passphrase(
+			data_desc = desc,
+			hash_preset = hp,
+			passwd_file = self.cfg.passwd_file)
+		key  = self.make_key(passwd, salt, hp)
+
+		def gen_chunks():
+			enc = Cipher(algorithms.AES(key), modes.CTR(iv), backend=default_backend()).encryptor()
+			mac = self._get_mmenc_stream_mac(key)
+			chunk_len = 1 << chunk_exp
+			hdr = salt + iv + enc.update(
+				self.mmenc_stream_magic + bytes([self.mmenc_stream_version, chunk_exp]))
+			mac.update(hdr)
+			yield hdr
+			while True:
+				ct = enc.update(fp.read(chunk_len))
+				mac.update(ct)
+				final = len(ct) < chunk_len
+				yield ct + self._get_mmenc_stream_tag(mac, final)
+				if final:
+					return
+
+		return gen_chunks()
+
+	def mmgen_decrypt_file(self, fp, *, passwd=None, desc='data', hash_preset=None, max_legacy_len=None):
+		"""
+		decrypt the contents of open binary file ‘fp’, which may be in either the
+		streaming or original MMGen encryption format
+
+		Return an iterator over the decrypted chunks of a streaming-format file,
+		the decrypted data of an original-format file, or False if the passphrase
+		or hash preset is incorrect.  Original-format data longer than
+		‘max_legacy_len’ can’t be told apart from a streaming-format file decrypted
+		with the wrong passphrase.  Since it couldn’t be decrypted in memory anyway,
+		it’s treated as the latter, allowing the caller to retry.
+		"""
+		from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+		from cryptography.hazmat.backends import default_backend
 		self.util.vmsg(f'Preparing to decrypt {desc}')
-		dstart = self.mmenc_salt_len + self.aesctr_iv_len
-		salt   = data[:self.mmenc_salt_len]
-		iv     = data[self.mmenc_salt_len:dstart]
-		enc_d  = data[dstart:]
-		hp     = hash_preset or self.cfg.hash_preset or self.get_hash_preset_from_user(data_desc=desc)
-		m  = ('user-requested', 'default')[hp=='3']
-		self.util.qmsg(f'Using {m} hash preset of {hp!r}')
+		salt   = fp.read(self.mmenc_salt_len)
+		iv     = fp.read(self.aesctr_iv_len)
+		hp     = self._get_mmenc_hash_preset(desc, hash_preset)
 		passwd = passwd or self.get_passphrase(
 			data_desc = desc,
 			passwd_file = self.cfg.passwd_file)
 		key    = self.make_key(passwd, salt, hp)
-		dec_d  = self.decrypt_data(enc_d, key, iv=iv, desc=desc)
+		dec    = Cipher(algorithms.AES(key), modes.CTR(iv), backend=default_backend()).decryptor()
+		magic_len = len(self.mmenc_stream_magic)
+		enc_hdr = fp.read(magic_len + 2)
+		hdr     = dec.update(enc_hdr)
+
+		if hdr[:magic_len] == self.mmenc_stream_magic:
+			version, chunk_exp = hdr[magic_len:]
+			if version != self.mmenc_stream_version:
+				die('EncryptedDataAuthError', f'{version}: unsupported encrypted {desc} format version')
+			if not 10 <= chunk_exp <= 30:
+				die('EncryptedDataAuthError', f'{chunk_exp}: invalid chunk size exponent in encrypted {desc}')
+			self.util.vmsg('OK')
+			mac = self._get_mmenc_stream_mac(key)
+			mac.update(salt + iv + enc_hdr)
+			return self._gen_mmenc_stream_chunks(fp, dec, mac, 1 << chunk_exp, desc)
+
+		# original format: sha256 hash + nonce + data, encrypted as a single block
+		enc_d = fp.read() if max_legacy_len is None else fp.read(max_legacy_len + 1)
+		if max_legacy_len is not None and len(enc_hdr + enc_d) > max_legacy_len:
+			msg('Incorrect passphrase or hash preset')
+			self.util.vmsg(
+				f'(or the {desc} is in the original MMGen encryption format, which can’t be decrypted\n'
+				f'at sizes greater than {max_legacy_len} bytes)')
+			return False
+		dec_d = hdr + dec.update(enc_d) + dec.finalize()
 		sha256_len = 32
 		from hashlib import sha256
 		if dec_d[:sha256_len] == sha256(dec_d[sha256_len:]).digest():
@@ -438,6 +591,24 @@ class Crypto:
 			msg('Incorrect passphrase or hash preset')
 			return False
 
+	def _gen_mmenc_stream_chunks(self, fp, dec, mac, chunk_len, desc):
+		import hmac
+		tag_len = self.mmenc_stream_tag_len
+		while True:
+			rec = fp.read(chunk_len + tag_len)
+			if len(rec) < tag_len:
+				die('EncryptedDataAuthError', f'Encrypted {desc} is truncated')
+			ct, tag = rec[:-tag_len], rec[-tag_len:]
+			final = len(ct) < chunk_len
+			mac.update(ct)
+			if not hmac.compare_digest(tag, self._get_mmenc_stream_tag(mac, final)):
+				die('EncryptedDataAuthError', f'Encrypted {desc} is corrupted or has been altered')
+			yield dec.update(ct)
+			if final:
+				if fp.read(1):
+					die('EncryptedDataAuthError', f'Unexpected data following end of encrypted {desc}')
+				return
+
 	def mmgen_decrypt_retry(self, d, *, desc='data'):
 		while True:
 			d_dec = self.mmgen_decrypt(d, desc=desc)
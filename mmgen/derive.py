@@ -20,16 +20,109 @@
 derive: coin private key secret derivation for the MMGen suite
 """
 
+import os
 from collections import namedtuple
 from hashlib import sha512, sha256
 from .addrlist import AddrIdxList
 
 pk_bytes = namedtuple('coin_privkey_bytes', ['idx', 'pos', 'data'])
 
-def derive_coin_privkey_bytes(seed, idxs):
+class DeriveCheckpoints:
+	"""
+	Encrypted on-disk store of sha512 chain states for derive_coin_privkey_bytes()
+
+	A chain state is saved every ‘interval’ indexes, allowing derivation of high or
+	sparse indexes to resume from the nearest saved state instead of index one.
+
+	Store files are keyed by a fingerprint of the scrambled seed and the address type.
+	Both the fingerprint and the encryption key are derived from the scrambled seed,
+	so the store is useless without the seed itself.
+	"""
+	subdir   = 'derive_checkpoints'
+	ext      = 'mmckpt'
+	magic    = b'MMGCKPT1'
+	rec_len  = 4 + 64 # idx (big-endian uint32) + sha512 chain state
+	hdr_len  = 16 + 32 # IV + sha256 of plaintext
+	min_interval = 100
+
+	def __init__(self, cfg, seed, mmtype, *, interval=None):
+		import hmac
+		from .util import make_chksum_8
+		self.cfg = cfg
+		self.interval = interval or cfg.derive_checkpoint_interval
+		self.key = hmac.digest(seed, b'derive checkpoint key', 'sha256')
+		self.fingerprint = make_chksum_8(hmac.digest(seed, b'derive checkpoint id', 'sha256'))
+		self.path = os.path.join(cfg.data_dir, self.subdir, f'{self.fingerprint}-{mmtype}.{self.ext}')
+		self.states = {}
+		self.changed = False
+		self.load()
+
+	def load(self):
+		try:
+			with open(self.path, 'rb') as fp:
+				data = fp.read()
+		except FileNotFoundError:
+			return
+		iv, chk, enc_data = data[:16], data[16:self.hdr_len], data[self.hdr_len:]
+		from .crypto import Crypto
+		dec_data = Crypto(self.cfg).decrypt_data(enc_data, self.key, iv=iv, desc='derivation checkpoints')
+		if sha256(dec_data).digest() != chk or not dec_data.startswith(self.magic):
+			from .util import ymsg
+			ymsg(f'Warning: derivation checkpoint file ‘{self.path}’ is corrupted, ignoring')
+			return
+		body = dec_data[len(self.magic):]
+		for i in range(0, len(body), self.rec_len):
+			self.states[int.from_bytes(body[i:i+4], 'big')] = body[i+4:i+self.rec_len]
+		self.cfg._util.dmsg(f'Loaded {len(self.states)} derivation checkpoints from ‘{self.path}’')
+
+	def save(self):
+		if not self.changed:
+			return
+		body = self.magic + b''.join(
+			idx.to_bytes(4, 'big') + state for idx, state in sorted(self.states.items()))
+		from .crypto import Crypto
+		iv = os.urandom(16) # new IV on each write, as the key is fixed
+		enc_data = Crypto(self.cfg).encrypt_data(
+			body,
+			key    = self.key,
+			iv     = iv,
+			desc   = 'derivation checkpoints',
+			verify = False,
+			silent = True)
+		from .fileutil import write_file_atomic
+		write_file_atomic(self.path, iv + sha256(body).digest() + enc_data)
+		self.changed = False
+
+	def nearest(self, idx):
+		"""
+		return the highest saved (idx, state) pair at or below ‘idx’, or None
+		"""
+		if self.states:
+			from bisect import bisect_right
+			keys = self.sorted_idxs
+			if (pos := bisect_right(keys, idx)):
+				return (keys[pos-1], self.states[keys[pos-1]])
+		return None
+
+	@property
+	def sorted_idxs(self):
+		if not hasattr(self, '_sorted_idxs') or len(self._sorted_idxs) != len(self.states):
+			self._sorted_idxs = sorted(self.states)
+		return self._sorted_idxs
+
+	def add(self, idx, state):
+		if idx not in self.states:
+			self.states[idx] = state
+			self.changed = True
+
+def derive_coin_privkey_bytes(seed, idxs, *, checkpoints=None):
 
 	assert isinstance(idxs, AddrIdxList), f'{type(idxs)}: idx list not of type AddrIdxList'
 
+	if checkpoints:
+		yield from _derive_with_checkpoints(seed, idxs, checkpoints)
+		return
+
 	t_keys = len(idxs)
 	pos = 0
 
@@ -46,3 +139,23 @@ def derive_coin_privkey_bytes(seed, idxs):
 
 			if pos == t_keys:
 				break
+
+def _derive_with_checkpoints(seed, idxs, checkpoints):
+
+	interval = checkpoints.interval
+	cur_idx = 0 # ‘seed’ holds the chain state after ‘cur_idx’ rounds
+
+	for pos, idx in enumerate(idxs, 1):
+
+		if (ck := checkpoints.nearest(idx)) and ck[0] > cur_idx:
+			cur_idx, seed = ck
+
+		while cur_idx < idx:
+			stop = min(idx, (cur_idx // interval + 1) * interval)
+			for _ in range(stop - cur_idx):
+				seed = sha512(seed).digest()
+			cur_idx = stop
+			if not cur_idx % interval:
+				checkpoints.add(cur_idx, seed)
+
+		yield pk_bytes(idx, pos, sha256(sha256(seed).digest()).digest())
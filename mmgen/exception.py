@@ -83,6 +83,7 @@ class MaxInputSizeExceeded(Exception):    mmcode = 3
 class MaxFileSizeExceeded(Exception):     mmcode = 3
 class MaxFeeExceeded(Exception):          mmcode = 3
 class WalletFileError(Exception):         mmcode = 3
+class EncryptedDataAuthError(Exception):  mmcode = 3
 class HexadecimalStringError(Exception):  mmcode = 3
 class SeedLengthError(Exception):         mmcode = 3
 class PrivateKeyError(Exception):         mmcode = 3
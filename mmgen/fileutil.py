@@ -32,6 +32,7 @@ from .util import (
 	is_utf8,
 	capfirst,
 	make_full_path,
+	strip_comment,
 	strip_comments,
 )
 
@@ -49,6 +50,20 @@ def check_or_create_dir(path):
 		except:
 			die(2, f'ERROR: unable to read or create path ‘{path}’')
 
+def write_file_atomic(path, data):
+	"""
+	replace ‘path’ with ‘data’ (str or bytes) via a temporary file, creating the parent
+	directory if necessary.  New files are readable by their owner only.
+	"""
+	check_or_create_dir(os.path.dirname(path))
+	tmp_path = path + '.tmp'
+	fd = os.open(tmp_path, os.O_WRONLY|os.O_CREAT|os.O_TRUNC, 0o600)
+	with open(fd, 'wb' if isinstance(data, bytes) else 'w') as fp:
+		fp.write(data)
+		fp.flush()
+		os.fsync(fp.fileno())
+	os.replace(tmp_path, path)
+
 def check_binary(args):
 	from subprocess import run, DEVNULL
 	try:
@@ -171,7 +186,8 @@ def write_data_to_file(
 		ignore_opt_outdir     = False,
 		outdir                = None,
 		check_data            = False,
-		cmp_data              = None):
+		cmp_data              = None,
+		atomic                = False):
 
 	outfile = str(outfile) # could be a Path instance
 
@@ -222,10 +238,11 @@ def write_data_to_file(
 			msvcrt.setmode(sys.stdout.fileno(), os.O_BINARY)
 
 		# MSWin workaround. See msg_r()
-		try:
-			sys.stdout.write(data.decode() if isinstance(data, bytes) else data)
-		except:
-			os.write(1, data if isinstance(data, bytes) else data.encode())
+		for chunk in ((data,) if isinstance(data, (str, bytes)) else data):
+			try:
+				sys.stdout.write(chunk.decode() if isinstance(chunk, bytes) else chunk)
+			except:
+				os.write(1, chunk if isinstance(chunk, bytes) else chunk.encode())
 
 	def do_file(outfile, ask_write_prompt):
 		if (outdir or (cfg.outdir and not ignore_opt_outdir)) and not os.path.isabs(outfile):
@@ -265,12 +282,36 @@ def write_data_to_file(
 
 		# To maintain portability, always open files in binary mode
 		# If 'binary' option not set, encode/decode data before writing and after reading
+		data_err = None
+
+		def gen_chunks():
+			nonlocal data_err
+			try:
+				yield from ((data,) if isinstance(data, (str, bytes)) else data) # data may be an iterable
+			except Exception as e:
+				data_err = e
+
+		# with ‘atomic’, write to a temporary file and rename it over the target once complete
+		wfile = outfile + '.tmp' if atomic else outfile
+
 		try:
-			with _open_or_die(outfile, 'wb') as fp:
-				fp.write(data if binary else data.encode())
+			with _open_or_die(wfile, 'wb') as fp:
+				for chunk in gen_chunks():
+					fp.write(chunk if binary else chunk.encode())
+				if atomic and not data_err:
+					fp.flush()
+					os.fsync(fp.fileno())
 		except:
 			die(2, f'Failed to write {desc} to file {outfile!r}')
 
+		# an exception raised by the data iterable leaves a partial file, so remove it
+		if data_err:
+			os.unlink(wfile)
+			raise data_err
+
+		if atomic:
+			os.replace(wfile, outfile)
+
 		if not (hush or quiet):
 			msg(f'{capfirst(desc)} written to file {outfile!r}')
 
@@ -354,3 +395,48 @@ def get_lines_from_file(
 		lines = strip_comments(lines)
 	cfg._util.dmsg(f'Got {len(lines)} lines from file ‘{fn}’')
 	return lines
+
+def gen_lines_from_file(
+		cfg,
+		fn,
+		*,
+		desc          = 'data',
+		trim_comments = False,
+		quiet         = False,
+		silent        = False):
+	"""
+	like get_lines_from_file(), but yield the lines of unencrypted files one at a time
+	as they’re read, so that memory use is independent of file size
+
+	Encrypted files are decrypted in memory as usual.  No input size limit is applied.
+	"""
+	from .crypto import Crypto
+	import codecs
+	with _open_or_die(fn, 'rb', silent=silent) as fp:
+		head = fp.read(4096)
+	try:
+		codecs.getincrementaldecoder('utf8')().decode(head) # allow for truncated final symbol
+	except UnicodeDecodeError:
+		is_text = False
+	else:
+		is_text = True
+
+	if get_extension(fn) == Crypto.mmenc_ext or not is_text:
+		yield from get_lines_from_file(
+			cfg, fn, desc=desc, trim_comments=trim_comments, quiet=quiet, silent=silent)
+		return
+
+	if not (cfg.quiet or silent or quiet):
+		cfg._util.qmsg(f'Getting {desc} from file ‘{fn}’')
+
+	n = 0
+	with _open_or_die(fn, 'rb', silent=silent) as fp:
+		for data in fp:
+			for line in data.decode().splitlines():
+				if trim_comments:
+					line = strip_comment(line)
+					if line == '':
+						continue
+				n += 1
+				yield line
+	cfg._util.dmsg(f'Got {n} lines from file ‘{fn}’')
@@ -22,6 +22,18 @@ MMGen wallet format, with one limitation: only one share in a given split may
 be in hidden incognito format, and it must be the master share in the case of
 a master-share split.
 
+With the --all-shares option, all shares of the split are generated in one
+pass and written to files in the output format, followed by a manifest of the
+split.  The share index is omitted from the seed split specifier.  The input
+wallet is decrypted only once, and the user is prompted for the passphrase,
+hash preset and label of each share, with those of the first share offered as
+defaults.  With --keep-passphrase, --keep-hash-preset and --keep-label, the
+first share's values are instead reused for the remaining shares.  Note that
+shares with a common passphrase may all be opened by anyone who learns it.
+Shares that require no user input are generated in parallel if --jobs is
+greater than one.  Output to hidden incognito format is unsupported in this
+mode.
+
 If the command's optional first argument is omitted, the default wallet is
 used for the split.
 
@@ -77,6 +89,11 @@ EXAMPLES:
     $ mmgen-seedsplit -o words alice:2:2 # Step E
     $ mmgen-seedjoin <output_of_step_D> <output_of_step_E>
 
+  Create a 5-way split of your default wallet with ID string 'carol' in one
+  pass, outputting all shares to BIP39 format using 4 worker processes:
+
+    $ mmgen-seedsplit --all-shares --jobs=4 -o bip39 carol:5
+
   Create a 2-way split of your default wallet with ID string 'bob' using
   master share #7, outputting share #1 (the master share) to default wallet
   format and share #2 to BIP39 format.  Rejoin the split:
@@ -69,7 +69,9 @@ class PrivKey(bytes, InitErrors, MMGenObject):
 	wif        = ImmutableAttr(WifKey, typeconv=False)
 
 	# initialize with (priv_bin, compressed), WIF or self
-	def __new__(cls, proto, s=None, *, compressed=None, wif=None, pubkey_type=None):
+	# check_wif=False skips validation of the WIF key encoded from ‘s’.  It’s used only by bulk
+	# key generation, where decoding each freshly encoded WIF key again would dominate run time
+	def __new__(cls, proto, s=None, *, compressed=None, wif=None, pubkey_type=None, check_wif=True):
 		if isinstance(s, cls):
 			return s
 		if wif:
@@ -103,7 +105,8 @@ class PrivKey(bytes, InitErrors, MMGenObject):
 					assert type(compressed) is bool, (
 						f"'compressed' must be of type bool, not {type(compressed).__name__}")
 					me = bytes.__new__(cls, proto.preprocess_key(s, pubkey_type))
-					me.wif = WifKey(proto, proto.encode_wif(me, pubkey_type, compressed=compressed))
+					wif = proto.encode_wif(me, pubkey_type, compressed=compressed)
+					me.wif = WifKey(proto, wif) if check_wif else str.__new__(WifKey, wif)
 					me.compressed = compressed
 				me.pubkey_type = pubkey_type
 				me.orig_bytes = s # save the non-preprocessed key
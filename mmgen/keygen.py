@@ -47,6 +47,13 @@ class keygen_base:
 			privkey.pubkey_type,
 			privkey.compressed)
 
+	def gen_data_batch(self, privkeys):
+		"""
+		generate public data for a sequence of private keys.  Backends supporting
+		batch operation override this method.
+		"""
+		return [self.gen_data(privkey) for privkey in privkeys]
+
 	def to_viewkey(self, privkey):
 		return None
 
@@ -155,16 +155,21 @@ if cfg.no_addresses:
 elif cfg.viewkeys:
 	gen_clsname = 'ViewKeyAddrList'
 
-al = getattr(addrlist, gen_clsname)(
+al_cls = getattr(addrlist, gen_clsname)
+
+# lists containing secret data are never streamed, as that would spool them to disk
+al = al_cls(
 	cfg       = cfg,
 	proto     = proto,
 	seed      = ss_seed,
 	addr_idxs = idxs,
-	mmtype    = addr_type)
+	mmtype    = addr_type,
+	stream    = len(idxs) >= al_cls.stream_min_addrs and not (al_cls.has_keys or cfg.print_checksum))
 
 af = al.file
 
-af.format()
+if not al.stream:
+	af.format()
 
 if al.gen_addrs and cfg.print_checksum:
 	from .util import Die
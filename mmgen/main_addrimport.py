@@ -152,7 +152,7 @@ async def main():
 		+ (f' from Seed ID {al.al_id.sid.hl()}' if hasattr(al.al_id, 'sid') else ''))
 
 	msg(
-		f'Importing {len(al.data)} address{suf(al.data, "es")} from {infile}'
+		f'Importing {len(al.data)} address{suf(len(al.data), "es")} from {infile}'
 		+ (' (batch mode)' if cfg.batch else ''))
 
 	batch, rescan = check_opts(twctl)
@@ -128,6 +128,7 @@ mods = {
 		'wif2hex',
 		'wif2redeem_script',
 		'wif2segwit_pair',
+		'xkey2addrs',
 	),
 	'mnemonic': (
 		'hex2mn',
@@ -157,6 +158,7 @@ mods = {
 		'rand2file',
 	),
 	'wallet': (
+		'clear_addr_cache',
 		'gen_addr',
 		'gen_key',
 		'get_subseed',
@@ -167,6 +169,7 @@ mods = {
 	'rpc': (
 		'add_label',
 		'daemon_version',
+		'discover_addrs',
 		'getbalance',
 		'listaddress',
 		'listaddresses',
@@ -68,27 +68,31 @@ match invoked_as:
 		do_sw_note = True
 	case 'seedsplit':
 		desc = f'Generate a seed share from {dsw}'
-		usage = '[opts] [infile] [<Split ID String>:]<index>:<share count>'
+		usage = (
+			'[opts] [infile] [<Split ID String>:]<index>:<share count>',
+			'[opts] --all-shares [infile] [<Split ID String>:]<share count>')
 		iaction = 'input'
 		oaction = 'output'
 		do_ss_note = True
 
 opts_data = {
 	'filter_codes': {
-		# Write  In-fmt  Out-fmt  Keep-pass  Force-update  Master-share  passwd-file-New-only
-		'chk':       ['-',      'i'                         ],
-		'conv':      ['-', 'w', 'i', 'o', 'k',           'n'],
-		'gen':       ['-', 'w',      'o'                    ],
-		'passchg':   ['-', 'w', 'i',      'k', 'f',      'n'],
-		'seedsplit': ['-', 'w', 'i', 'o',           'm', 'n'],
-		'subgen':    ['-', 'w', 'i', 'o', 'k',           'n'],
+		# Write  In-fmt  Out-fmt  Keep-pass  Force-update  Master-share  passwd-file-New-only  All-shares
+		'chk':       ['-',      'i'                              ],
+		'conv':      ['-', 'w', 'i', 'o', 'k',           'n'     ],
+		'gen':       ['-', 'w',      'o'                         ],
+		'passchg':   ['-', 'w', 'i',      'k', 'f',      'n'     ],
+		'seedsplit': ['-', 'w', 'i', 'o', 'k',      'm', 'n', 'a'],
+		'subgen':    ['-', 'w', 'i', 'o', 'k',           'n'     ],
 	}[invoked_as],
 	'text': {
 		'desc': desc,
-		'usage': usage,
+		'usage' if isinstance(usage, str) else 'usage2': usage,
 		'options': """
 			-- -h, --help            Print this help message
 			-- --, --longhelp        Print help message for long (global) options
+			-a -A, --all-shares      Generate all shares of the split in one pass (see
+			+                        COMMAND NOTES below)
 			-w -d, --outdir=      d  Output files to directory 'd' instead of working dir
 			-- -e, --echo-passphrase Echo passphrases and other user input to screen
 			-f -f, --force-update    Force update of wallet even if nothing has changed
@@ -158,7 +162,18 @@ match invoked_as:
 		from .obj import get_obj
 		from .seedsplit import SeedSplitSpecifier, MasterShareIdx
 		master_share = MasterShareIdx(cfg.master_share) if cfg.master_share else None
-		if cmd_args:
+		if cfg.all_shares:
+			if not cmd_args:
+				cfg._usage()
+			if cfg.stdout or cfg.hidden_incog_output_params:
+				die(1, 'Output to standard output or hidden incognito format unsupported with --all-shares')
+			id_str, _, count = cmd_args.pop().rpartition(':') # add share index to specifier
+			sss = get_obj(SeedSplitSpecifier, s=f'{id_str}:1:{count}' if id_str else f'1:{count}', silent=True)
+			if not sss:
+				cfg._usage()
+		elif cfg.keep_passphrase or cfg.keep_hash_preset or cfg.keep_label:
+			die(1, 'Options --keep-passphrase, --keep-hash-preset and --keep-label require --all-shares')
+		elif cmd_args:
 			sss = get_obj(SeedSplitSpecifier, s=cmd_args.pop(), silent=True)
 			if master_share:
 				if not sss:
@@ -212,6 +227,12 @@ match invoked_as:
 		ss_out = Wallet(
 			cfg      = cfg,
 			seed_bin = ss_in.seed.subseed(ss_idx, print_msg=True).data)
+	case 'seedsplit' if cfg.all_shares:
+		from .seedsplit import export_all_shares
+		export_all_shares(
+			cfg,
+			ss_in.seed.split(sss.count, id_str=sss.id, master_idx=master_share))
+		sys.exit(0)
 	case 'seedsplit':
 		shares = ss_in.seed.split(sss.count, id_str=sss.id, master_idx=master_share)
 		seed_out = shares.get_share_by_idx(sss.idx, base_seed=True)
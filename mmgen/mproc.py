@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+#
+# MMGen Wallet, a terminal-based cryptocurrency wallet
+# Copyright (C)2013-2025 The MMGen Project <mmgen@tuta.io>
+# Licensed under the GNU General Public License, Version 3:
+#   https://www.gnu.org/licenses
+# Public project repositories:
+#   https://github.com/mmgen/mmgen-wallet
+#   https://gitlab.com/mmgen/mmgen-wallet
+
+"""
+mproc: Multi-process work distribution for the MMGen suite
+"""
+
+import sys, os
+from collections import namedtuple
+
+# Worker state is inherited by the forked worker processes instead of being pickled,
+# so it may contain arbitrary objects (key generators, protocol instances, etc.).
+# Only the work items and their results cross the process boundary.
+_worker_state = None
+_in_worker = False
+
+def get_avail_mem():
+	"""
+	return the available memory in bytes, or None if it can’t be determined (Linux only)
+	"""
+	try:
+		with open('/proc/meminfo') as fp:
+			for line in fp:
+				if line.startswith('MemAvailable:'):
+					return int(line.split()[1]) * 1024
+	except (OSError, ValueError):
+		pass
+	return None
+
+def get_jobs(cfg, *, jobs=None, job_mem=None):
+	"""
+	return the number of worker processes to use, or 1 if work must be done serially
+
+	A value of 0 means use all available CPU cores.  In that case, if ‘job_mem’ (the
+	memory used by each job, in bytes) is given, the number of jobs is also limited so
+	that all jobs together use at most half the available memory.  Multi-processing
+	requires the fork() start method and is therefore unavailable on MSWin and macOS.
+	Worker processes can’t have children, so work is always done serially within them.
+	"""
+	n = cfg.jobs if jobs is None else jobs
+	if n is None or n == 1 or sys.platform != 'linux' or _in_worker:
+		return 1
+	if int(n):
+		return int(n)
+	n = os.cpu_count() or 1
+	if job_mem and (mem := get_avail_mem()):
+		n = min(n, max(1, mem // 2 // job_mem))
+	return n
+
+def _run_worker(args):
+	global _in_worker
+	_in_worker = True
+	func, item = args
+	try:
+		return (True, func(_worker_state, item))
+	except BaseException as e:
+		# MMGen exceptions can’t be pickled, so transfer the exception’s class and attributes
+		return (False, (type(e), e.args, e.__dict__))
+
+def pool_imap(func, items, *, jobs, state=None):
+	"""
+	apply ‘func(state, item)’ to each element of ‘items’ in ‘jobs’ forked worker
+	processes, yielding the results in order
+
+	An exception raised by ‘func’ in a worker is re-raised in the parent process.
+	"""
+	global _worker_state
+	_worker_state = state
+	import multiprocessing
+	try:
+		with multiprocessing.get_context('fork').Pool(jobs) as pool:
+			for ok, res in pool.imap(_run_worker, ((func, item) for item in items)):
+				if not ok:
+					cls, e_args, attrs = res
+					try:
+						e = cls(*e_args) # initializes built-in attributes such as SystemExit.code
+					except TypeError: # MMGenError and subclasses take different arguments
+						e = cls.__new__(cls, *e_args)
+						e.args = e_args
+					e.__dict__.update(attrs)
+					raise e
+				yield res
+	finally:
+		_worker_state = None
+
+def split_into_batches(iterable, batch_size):
+	"""
+	yield lists of up to ‘batch_size’ consecutive elements of ‘iterable’
+	"""
+	batch = []
+	for e in iterable:
+		batch.append(e)
+		if len(batch) == batch_size:
+			yield batch
+			batch = []
+	if batch:
+		yield batch
+
+_packed = namedtuple('_packed', ['cls', 'base', 'value', 'attrs', 'has_proto'])
+
+def pack(obj):
+	"""
+	convert a str or bytes subclass instance into a picklable object, omitting its
+	protocol instance, which is restored by unpack()
+
+	Many MMGen data objects can’t be pickled, as their constructors require a
+	protocol instance and perform validity checks.  Since the data has already
+	been checked in the worker process, it’s transferred as-is.
+	"""
+	for base in (str, bytes):
+		if isinstance(obj, base) and type(obj) is not base:
+			attrs = getattr(obj, '__dict__', {})
+			return _packed(
+				type(obj),
+				base,
+				base(obj),
+				{k: pack(v) for k, v in attrs.items() if k != 'proto'},
+				'proto' in attrs)
+	return obj
+
+def unpack(obj, proto):
+	"""
+	restore an object converted by pack(), attaching protocol instance ‘proto’
+	"""
+	if type(obj) is _packed:
+		me = obj.base.__new__(obj.cls, obj.value)
+		me.__dict__.update({k: unpack(v, proto) for k, v in obj.attrs.items()})
+		if obj.has_proto:
+			me.__dict__['proto'] = proto
+		return me
+	return obj
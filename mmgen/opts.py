@@ -287,6 +287,8 @@ class UserOpts(Opts):
 		'text': {
 			'options': """
 			-- --accept-defaults      Accept defaults at all prompts
+			-- --addr-cache           Cache generated addresses on disk and reuse them for
+			+                         address-only lists (see 'mmgen-tool clear_addr_cache')
 			hp --cashaddr=0|1         Display addresses in cashaddr format (default: 1)
 			-c --coin=c               Choose coin unit. Default: BTC. Current choice: {cu_dfl}
 			er --token=t              Specify an ERC20 token by address or symbol
@@ -297,6 +299,21 @@ class UserOpts(Opts):
 			-- --force-256-color      Force 256-color output when color is enabled
 			-- --pager                Pipe output of certain commands to pager (WIP)
 			-- --data-dir=path        Specify {pnm} data directory location
+			-- --derive-checkpoint-interval=N Save an encrypted key derivation checkpoint
+			+                         every N indexes, speeding up generation of high
+			+                         and sparse address indexes (0: disable, the default)
+			-- --jobs=N               Use N worker processes for address, key and subseed
+			+                         generation and key verification (0: use all CPU
+			+                         cores; default: 1)
+			-- --key-verify-confidence=P Verify only a random sample of the keys in key-
+			+                         address files, large enough to detect a 1% rate of
+			+                         bad keys with confidence level P percent
+			-- --scrypt-jobs=N        Use N worker processes to compute the lanes of scrypt
+			+                         hashes in parallel (0: use all CPU cores, limited by
+			+                         available memory; the default)
+			-- --subseed-index        Save an encrypted index of generated subseeds to the
+			+                         data directory, so that subseeds of high index can be
+			+                         found by Seed ID without regenerating them
 			rr --daemon-data-dir=path Specify coin daemon data directory location
 			Rr --daemon-id=ID         Specify the coin daemon ID
 			rr --ignore-daemon-version Ignore coin daemon version check
@@ -318,6 +335,10 @@ class UserOpts(Opts):
 			-- --test-suite           Use test suite configuration
 			br --tw-name=NAME         Specify alternate name for the BTC/LTC/BCH tracking
 			+                         wallet (default: ‘{tw_name}’)
+			br --txhist-cache         Cache confirmed transactions on disk for the
+			+                         transaction history view, fetching only new ones
+			br --block-cache          Cache the times of deep blocks on disk for the age
+			+                         and date columns of tracking wallet views
 			-- --skip-cfg-file        Skip reading the configuration file
 			-- --version              Print version information and exit
 			-- --usage                Print usage information and exit
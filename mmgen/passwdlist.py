@@ -30,10 +30,13 @@ from .addrlist import (
 	AddrListChksum,
 	AddrListIDStr,
 	AddrListEntryBase,
+	AddrListData,
 	AddrList,
 )
 
 class PasswordListEntry(AddrListEntryBase):
+	valid_attrs = {'passwd', 'idx', 'comment', 'sec'}
+
 	passwd  = ListItemAttr(str, typeconv=False) # TODO: create Password type
 	idx     = ImmutableAttr(AddrIdx)
 	comment = ListItemAttr(TwComment, reassign_ok=True)
@@ -76,10 +79,13 @@ class PasswordList(AddrList):
 			pw_len          = None,
 			pw_fmt          = None,
 			chk_params_only = False,
-			skip_chksum_msg = False):
+			skip_chksum_msg = False,
+			stream          = False): # generate or read entries on the fly instead of storing them
 
 		self.cfg = cfg
 		self.proto = proto # proto is ignored
+		self.stream = stream
+		self.skip_chksum_msg = skip_chksum_msg
 
 		if not cfg.debug_addrlist:
 			self.dmsg_sc = self.noop
@@ -87,7 +93,7 @@ class PasswordList(AddrList):
 		if infile:
 			self.infile = infile
 			# sets self.pw_id_str, self.pw_fmt, self.pw_len, self.chk_func:
-			self.data = self.file.parse_file(infile)
+			self.data = self.file.parse_file(infile, header_only=stream)
 		else:
 			if not chk_params_only:
 				for k in (seed, pw_idxs):
@@ -101,18 +107,31 @@ class PasswordList(AddrList):
 				ymsg(self.feature_warn_fs.format(pw_fmt))
 			self.set_pw_len_vs_seed_len(seed) # sets self.bip39, self.xmrseed, self.xmrproto self.baseconv
 			self.al_id = AddrListID(sid=seed.sid, mmtype=MMGenPasswordType(self.proto, 'P'))
-			self.data = self.generate(seed, pw_idxs)
+			if stream:
+				self.seed, self.addr_idxs = (seed, pw_idxs)
+			else:
+				self.data = self.generate(seed, pw_idxs)
 
-		self.num_addrs = len(self.data)
 		self.fmt_data = ''
-		self.chksum = AddrListChksum(self)
 
-		fs = f'{self.al_id.sid}-{self.pw_id_str}-{self.pw_fmt_disp}-{self.pw_len}[{{}}]'
-		self.id_str = AddrListIDStr(self, fmt_str=fs)
+		if stream:
+			self.data = AddrListData(entry_type=self.entry_type, proto=self.proto)
+			self.num_addrs = None if infile else len(pw_idxs)
+			self.id_str = None if infile else self.make_id_str(idxs=pw_idxs)
+			self.chksum = None
+			return
+
+		self.num_addrs = len(self.data)
+		self.chksum = AddrListChksum(self)
+		self.id_str = self.make_id_str()
 
 		if not skip_chksum_msg:
 			self.do_chksum_msg(record=not infile)
 
+	def make_id_str(self, *, idxs=None):
+		fs = f'{self.al_id.sid}-{self.pw_id_str}-{self.pw_fmt_disp}-{self.pw_len}[{{}}]'
+		return AddrListIDStr(self, fmt_str=fs, idxs=idxs)
+
 	def set_pw_fmt(self, pw_fmt):
 		if pw_fmt == 'hex2bip39':
 			self.hex2bip39 = True
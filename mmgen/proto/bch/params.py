@@ -75,6 +75,9 @@ class mainnet(mainnet):
 				if self.cfg.cashaddr else
 			b58chk_encode(self.addr_fmt_to_ver_bytes[addr_type] + pubhash))
 
+	def pubhashes2addrs(self, pubhashes, addr_type):
+		return [self.pubhash2addr(h, addr_type) for h in pubhashes]
+
 	def pubhash2redeem_script(self, pubhash):
 		raise NotImplementedError
 
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+#
+# MMGen Wallet, a terminal-based cryptocurrency wallet
+# Copyright (C)2013-2025 The MMGen Project <mmgen@tuta.io>
+# Licensed under the GNU General Public License, Version 3:
+#   https://www.gnu.org/licenses
+# Public project repositories:
+#   https://github.com/mmgen/mmgen-wallet
+#   https://gitlab.com/mmgen/mmgen-wallet
+
+"""
+proto.btc.addrdiscovery: Gap-limit address discovery for BIP-HD extended keys
+"""
+
+import os, json
+from collections import namedtuple
+from hashlib import sha256
+
+from ...util import msg
+
+class BipHDAddrDiscovery:
+	"""
+	Discover the funded addresses of a BIP-HD account via ‘scantxoutset’
+
+	The receive and change chains of the account are derived in batches, and the
+	addresses of both chains are checked in a single scan per round, since the
+	daemon can run only one UTXO set scan at a time.  Derivation of a chain stops
+	once ‘gap_limit’ consecutive addresses with no unspent outputs are found.
+
+	Since the UTXO set contains no transaction history, addresses whose outputs
+	have all been spent are indistinguishable from unused ones and count toward
+	the gap limit.
+
+	Progress is saved after each round, so an interrupted discovery resumes from
+	the last completed round.  The state file contains only public data and is
+	removed when discovery completes.
+	"""
+	subdir  = 'addr_discovery'
+	version = 1
+	chains  = (0, 1) # receive, change
+
+	used_addr = namedtuple('used_addr', ['chain', 'idx', 'addr', 'amt'])
+
+	def __init__(self, cfg, proto, rpc, xkey, *, gap_limit=20, batch_size=None, addr_type=None):
+		from ...bip_hd import BipHDNode
+		self.cfg = cfg
+		self.proto = proto
+		self.rpc = rpc
+		self.gap_limit = gap_limit
+		self.batch_size = batch_size or gap_limit
+		acct = BipHDNode.from_extended_key(cfg, proto.coin.lower(), xkey, addr_type=addr_type)
+		if acct.depth != 3:
+			raise ValueError(f'extended key has depth {acct.depth}, but account-level key (depth 3) required')
+		self.chain_nodes = {n: acct.derive(n, hardened=False, public=True) for n in self.chains}
+		self.key_id = sha256(acct.xpub.encode()).hexdigest()[:16]
+		self.path = os.path.join(cfg.data_dir, self.subdir, f'{self.key_id}.json')
+		self.state = self.load()
+
+	def init_state(self):
+		return {
+			'version':   self.version,
+			'key_id':    self.key_id,
+			'gap_limit': self.gap_limit,
+			'next_idx':  {str(n): 0 for n in self.chains},
+			'last_used': {str(n): -1 for n in self.chains},
+			'used':      []}
+
+	def load(self):
+		try:
+			with open(self.path) as fp:
+				d = json.load(fp)
+		except FileNotFoundError:
+			return self.init_state()
+		if d.get('version') == self.version and d.get('key_id') == self.key_id:
+			msg('Resuming discovery at index {} (receive) and {} (change)'.format(
+				*(d['next_idx'][str(n)] for n in self.chains)))
+			return d
+		from ...util import ymsg
+		ymsg(f'Warning: discarding invalid state file ‘{self.path}’')
+		return self.init_state()
+
+	def save(self):
+		from ...fileutil import write_file_atomic
+		write_file_atomic(self.path, json.dumps(self.state) + '\n')
+
+	def is_done(self, chain):
+		return self.state['next_idx'][chain] - self.state['last_used'][chain] - 1 >= self.gap_limit
+
+	async def scan_round(self):
+		from .misc import scantxoutset
+		from .tx.base import addr2scriptPubKey
+		addrs = {}
+		for n, node in self.chain_nodes.items():
+			chain = str(n)
+			if not self.is_done(chain):
+				for e in node.derive_range(self.state['next_idx'][chain], self.batch_size, public=True):
+					addrs[addr2scriptPubKey(self.proto, e.address)] = (chain, e.idx, e.address)
+
+		res = await scantxoutset(self.cfg, self.rpc, [f'addr({a[2]})' for a in addrs.values()])
+		if not res['success']:
+			from ...util import die
+			die(2, 'UTXO scanning failed or was interrupted')
+
+		amts = {}
+		for u in res['unspents']:
+			spk = u['scriptPubKey']
+			amts[spk] = amts.get(spk, self.proto.coin_amt('0')) + self.proto.coin_amt(str(u['amount']))
+
+		for spk, (chain, idx, addr) in addrs.items():
+			if spk in amts:
+				self.state['used'].append([int(chain), idx, addr, str(amts[spk])])
+				self.state['last_used'][chain] = max(self.state['last_used'][chain], idx)
+
+		for chain in {e[0] for e in addrs.values()}:
+			self.state['next_idx'][chain] += self.batch_size
+
+	async def run(self):
+		"""
+		perform discovery, returning the funded addresses as a sorted list of tuples
+		"""
+		while not all(self.is_done(str(n)) for n in self.chains):
+			await self.scan_round()
+			self.save()
+			self.cfg._util.vmsg('Checked {} receive and {} change addresses'.format(
+				*(self.state['next_idx'][str(n)] for n in self.chains)))
+		if os.path.exists(self.path):
+			os.unlink(self.path)
+		return sorted(
+			self.used_addr(chain, idx, addr, self.proto.coin_amt(amt))
+				for chain, idx, addr, amt in self.state['used'])
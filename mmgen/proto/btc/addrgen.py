@@ -12,8 +12,8 @@
 proto.btc.addrgen: Bitcoin address generation classes for the MMGen suite
 """
 
-from ...addrgen import addr_generator, check_data
-from .common import hash160
+from ...addrgen import addr_generator, check_data, check_data_batch
+from .common import hash160, hash160_batch
 
 class p2pkh(addr_generator.base):
 
@@ -21,6 +21,10 @@ class p2pkh(addr_generator.base):
 	def to_addr(self, data):
 		return self.proto.pubhash2addr(hash160(data.pubkey), 'p2pkh')
 
+	@check_data_batch
+	def to_addrs(self, data):
+		return self.proto.pubhashes2addrs(hash160_batch([d.pubkey for d in data]), 'p2pkh')
+
 class legacy(p2pkh):
 	pass
 
@@ -33,6 +37,10 @@ class segwit(addr_generator.base):
 	def to_addr(self, data):
 		return self.proto.pubhash2segwitaddr(hash160(data.pubkey))
 
+	@check_data_batch
+	def to_addrs(self, data):
+		return self.proto.pubhashes2segwitaddrs(hash160_batch([d.pubkey for d in data]))
+
 	def to_segwit_redeem_script(self, data): # NB: returns hex
 		return self.proto.pubhash2redeem_script(hash160(data.pubkey)).hex()
 
@@ -41,3 +49,7 @@ class bech32(addr_generator.base):
 	@check_data
 	def to_addr(self, data):
 		return self.proto.pubhash2bech32addr(hash160(data.pubkey))
+
+	@check_data_batch
+	def to_addrs(self, data):
+		return self.proto.pubhashes2bech32addrs(hash160_batch([d.pubkey for d in data]))
@@ -14,11 +14,30 @@ proto.btc.common: Shared Bitcoin functions and constants
 
 import hashlib
 
+try:
+	from .base58 import b58encode_batch as b58encode_batch_ext
+except ImportError: # extension module not built: use pure-Python encoders
+	b58encode_batch_ext = None
+
 b58a = '123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz'
 
 def hash160(in_bytes): # OP_HASH160
 	return hashlib.new('ripemd160', hashlib.sha256(in_bytes).digest()).digest()
 
+def hash160_batch(in_bytes_list):
+	"""
+	return the OP_HASH160 digests of a sequence of byte strings as a list, initializing
+	the RIPEMD-160 hash object only once
+	"""
+	rmd = hashlib.new('ripemd160')
+	sha256 = hashlib.sha256
+	def gen():
+		for in_bytes in in_bytes_list:
+			h = rmd.copy()
+			h.update(sha256(in_bytes).digest())
+			yield h.digest()
+	return list(gen())
+
 def hash256(in_bytes): # OP_HASH256
 	return hashlib.sha256(hashlib.sha256(in_bytes).digest()).digest()
 
@@ -30,6 +49,8 @@ def hash256(in_bytes): # OP_HASH256
 # 1111111111111111111114oLvT2 (pubkeyhash = '\0'*20)
 
 def b58chk_encode(in_bytes):
+	if b58encode_batch_ext:
+		return b58encode_batch_ext([in_bytes + hash256(in_bytes)[:4]])[0]
 	lzeroes = len(in_bytes) - len(in_bytes.lstrip(b'\x00'))
 	def do_enc(n):
 		while n:
@@ -37,9 +58,74 @@ def b58chk_encode(in_bytes):
 			n //= 58
 	return ('1' * lzeroes) + ''.join(do_enc(int.from_bytes(in_bytes+hash256(in_bytes)[:4], 'big')))[::-1]
 
+# pairs of Base58 digits, allowing two digits to be produced per bigint division:
+b58a_pairs = [a + b for a in b58a for b in b58a]
+
+def b58chk_encode_batch(in_bytes_list):
+	"""
+	Base58Check-encode a sequence of byte strings, producing the same output as
+	b58chk_encode()
+	"""
+	if b58encode_batch_ext:
+		return b58encode_batch_ext([in_bytes + hash256(in_bytes)[:4] for in_bytes in in_bytes_list])
+	pairs = b58a_pairs
+	def gen():
+		for in_bytes in in_bytes_list:
+			n = int.from_bytes(in_bytes + hash256(in_bytes)[:4], 'big')
+			digits = []
+			while n:
+				n, r = divmod(n, 3364)
+				digits.append(pairs[r])
+			yield (
+				'1' * (len(in_bytes) - len(in_bytes.lstrip(b'\x00'))) +
+				''.join(reversed(digits)).lstrip('1'))
+	return list(gen())
+
+# Bech32 checksum generator values, indexed by the five high bits of the checksum:
+bech32_gen_table = [
+	(0x3b6a57b2 if t & 1 else 0) ^
+	(0x26508e6d if t & 2 else 0) ^
+	(0x1ea119fa if t & 4 else 0) ^
+	(0x3d4233dd if t & 8 else 0) ^
+	(0x2a1462b3 if t & 16 else 0) for t in range(32)]
+
+def bech32_encode_batch(hrp, witver, progs):
+	"""
+	Bech32-encode a sequence of witness programs of the same version, producing the same
+	output as contrib.bech32.bech32_encode().  The checksum state for the HRP and witness
+	version is computed only once.
+	"""
+	from ...contrib.bech32 import CHARSET, bech32_hrp_expand
+	table = bech32_gen_table
+
+	def polymod(chk, values):
+		for v in values:
+			chk = (chk & 0x1ffffff) << 5 ^ v ^ table[chk >> 25]
+		return chk
+
+	chk_pfx = polymod(1, bech32_hrp_expand(hrp) + [witver])
+	pfx = hrp + '1' + CHARSET[witver]
+
+	def gen():
+		for prog in progs:
+			nbits = len(prog) * 8
+			pad = -nbits % 5
+			n = int.from_bytes(prog, 'big') << pad
+			values = [(n >> i) & 31 for i in range(nbits + pad - 5, -1, -5)]
+			chk = polymod(chk_pfx, values + [0] * 6) ^ 1
+			yield pfx + ''.join(CHARSET[v] for v in values) + ''.join(
+				CHARSET[(chk >> i) & 31] for i in (25, 20, 15, 10, 5, 0))
+	return list(gen())
+
+b58a_vals = {ch: n for n, ch in enumerate(b58a)}
+
 def b58chk_decode(s):
 	lzeroes = len(s) - len(s.lstrip('1'))
-	res = sum(b58a.index(ch) * 58**n for n, ch in enumerate(s[::-1]))
+	res = 0
+	for ch in s:
+		if (n := b58a_vals.get(ch)) is None:
+			raise ValueError(f'{ch!r}: invalid Base58 character')
+		res = res * 58 + n
 	bl = res.bit_length()
 	out = b'\x00' * lzeroes + res.to_bytes(bl//8 + bool(bl%8), 'big')
 	if out[-4:] != hash256(out[:-4])[:4]:
@@ -14,7 +14,14 @@ proto.btc.params: Bitcoin protocol
 
 from ...protocol import CoinProtocol, decoded_wif, decoded_addr, _finfo, _nw
 from ...addr import CoinAddr
-from .common import b58chk_decode, b58chk_encode, hash160
+from ...util import die
+from .common import (
+	b58chk_decode,
+	b58chk_encode,
+	b58chk_encode_batch,
+	bech32_encode_batch,
+	hash160,
+	hash160_batch)
 
 class mainnet(CoinProtocol.Secp256k1): # chainparams.cpp
 	"""
@@ -134,6 +141,49 @@ class mainnet(CoinProtocol.Secp256k1): # chainparams.cpp
 				hrp  = self.bech32_hrp,
 				data = [self.witness_vernum] + bech32.convertbits(list(pubhash), 8, 5)))
 
+	batch_chk_interval = 64 # decode every nth address produced by the batch encoders
+
+	def make_coinaddr(self, addr, addr_bytes, ver_bytes, addr_fmt):
+		"""
+		create a CoinAddr from an address encoded locally from known data, skipping the
+		decoding and checksum verification performed by the CoinAddr constructor.  A
+		sample of the output is checked by check_batch_addrs() instead.
+		"""
+		me = str.__new__(CoinAddr, addr)
+		me.views = [addr]
+		me.view_pref = 0
+		me.addr_fmt = addr_fmt
+		me.bytes = addr_bytes
+		me.ver_bytes = ver_bytes
+		me.proto = self
+		return me
+
+	def check_batch_addrs(self, addrs):
+		"""
+		check that a sample of the addresses created by make_coinaddr() decode to the data
+		they were created from, returning the addresses
+		"""
+		for addr in addrs[::self.batch_chk_interval]:
+			ap = self.decode_addr(addr)
+			if not ap or (ap.bytes, ap.ver_bytes, ap.fmt) != (addr.bytes, addr.ver_bytes, addr.addr_fmt):
+				die(3, f'{addr}: batch-encoded address failed round-trip check')
+		return addrs
+
+	# batch versions of pubhash2addr(), pubhash2segwitaddr() and pubhash2bech32addr():
+	def pubhashes2addrs(self, pubhashes, addr_type):
+		assert all(len(h) == self.addr_len for h in pubhashes), 'invalid length for pubkey hash'
+		ver_bytes = self.addr_fmt_to_ver_bytes[addr_type]
+		return self.check_batch_addrs([self.make_coinaddr(addr, pubhash, ver_bytes, addr_type)
+			for addr, pubhash in zip(b58chk_encode_batch([ver_bytes + h for h in pubhashes]), pubhashes)])
+
+	def pubhashes2segwitaddrs(self, pubhashes):
+		rs_pfx = self.pubhash2redeem_script(b'')
+		return self.pubhashes2addrs(hash160_batch([rs_pfx + h for h in pubhashes]), 'p2sh')
+
+	def pubhashes2bech32addrs(self, pubhashes):
+		return self.check_batch_addrs([self.make_coinaddr(addr, pubhash, None, 'bech32')
+			for addr, pubhash in zip(bech32_encode_batch(self.bech32_hrp, self.witness_vernum, pubhashes), pubhashes)])
+
 class testnet(mainnet):
 	addr_ver_info       = {'6f': 'p2pkh', 'c4': 'p2sh'}
 	wif_ver_num         = {'std': 'ef'}
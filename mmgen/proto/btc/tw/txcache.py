@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+#
+# MMGen Wallet, a terminal-based cryptocurrency wallet
+# Copyright (C)2013-2025 The MMGen Project <mmgen@tuta.io>
+# Licensed under the GNU General Public License, Version 3:
+#   https://www.gnu.org/licenses
+# Public project repositories:
+#   https://github.com/mmgen/mmgen-wallet
+#   https://gitlab.com/mmgen/mmgen-wallet
+
+"""
+proto.btc.tw.txcache: Persistent transaction cache for the Bitcoin tracking wallet history
+"""
+
+import os, json
+
+from ....util import ymsg
+
+class BitcoinTwTxCache:
+	"""
+	On-disk cache of confirmed wallet and prevout transactions for a single tracking wallet,
+	coin and network, keyed by txid
+
+	Each entry stores the height and hash of its block.  Confirmations are recomputed from
+	the height on retrieval.  The chain tip at save time is stored with the cache.  If its
+	block is no longer in the main chain on the next load, every entry is checked against
+	the block hash at its height and entries from orphaned blocks are discarded.
+	"""
+	subdir  = 'tx_cache'
+	ext     = 'json'
+	version = 1
+	kinds   = ('wallet', 'prevout')
+
+	def __init__(self, cfg, proto, twname):
+		self.cfg = cfg
+		self.path = os.path.join(
+			cfg.data_dir,
+			self.subdir,
+			f'{twname}-{proto.coin.lower()}-{proto.network}.{self.ext}')
+		self.txs = {k: {} for k in self.kinds}
+		self.tip = None
+		self.changed = False
+		self.load()
+
+	def load(self):
+		try:
+			with open(self.path) as fp:
+				d = json.load(fp)
+		except FileNotFoundError:
+			return
+		except ValueError:
+			d = {}
+		if d.get('version') == self.version:
+			self.txs = {k: d['txs'][k] for k in self.kinds}
+			self.tip = d['tip']
+			self.cfg._util.dmsg('Loaded {} cached transactions from ‘{}’'.format(
+				sum(len(v) for v in self.txs.values()),
+				self.path))
+		else:
+			ymsg(f'Warning: transaction cache file ‘{self.path}’ is invalid or corrupted, discarding')
+			self.changed = True
+
+	def save(self):
+		if not self.changed:
+			return
+		data = json.dumps({'version': self.version, 'tip': self.tip, 'txs': self.txs})
+		from ....fileutil import write_file_atomic
+		write_file_atomic(self.path, data + '\n')
+		self.changed = False
+
+	async def check_chain(self, rpc):
+		"""
+		discard entries from blocks no longer in the main chain and record the current tip
+		"""
+		blockcount = rpc.blockcount
+		tip = [blockcount, await rpc.call('getblockhash', blockcount)]
+		if self.tip and self.tip != tip:
+			height, blockhash = self.tip
+			if height > blockcount or await rpc.call('getblockhash', height) != blockhash:
+				heights = sorted({e['height'] for v in self.txs.values() for e in v.values()
+					if e['height'] <= blockcount})
+				hashes = dict(zip(heights, await rpc.gathered_call('getblockhash', [(h,) for h in heights])))
+				for v in self.txs.values():
+					for txid in [txid for txid, e in v.items() if hashes.get(e['height']) != e['blockhash']]:
+						del v[txid]
+				self.cfg._util.dmsg('Chain reorganization detected, cached transactions checked')
+		if self.tip != tip:
+			self.tip = tip
+			self.changed = True
+
+	def get(self, kind, txid, *, blockhash=None):
+		"""
+		return the cached transaction with updated confirmations, or None.  If ‘blockhash’
+		is given, the cached transaction must be from that block
+		"""
+		if (e := self.txs[kind].get(txid)) and (blockhash is None or blockhash == e['blockhash']):
+			return e['tx'] | {'confirmations': self.tip[0] + 1 - e['height']}
+
+	def add(self, kind, tx):
+		"""
+		add a transaction fetched at the current tip, if confirmed
+		"""
+		if tx.get('confirmations', 0) > 0 and tx.get('blockhash'):
+			self.txs[kind][tx['txid']] = {
+				'height':    tx.get('blockheight') or self.tip[0] + 1 - tx['confirmations'],
+				'blockhash': tx['blockhash'],
+				'tx':        tx}
+			self.changed = True
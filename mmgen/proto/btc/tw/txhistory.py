@@ -321,19 +321,35 @@ class BitcoinTwTxHistory(BitcoinTwView, TwTxHistory, BitcoinTwRPC):
 					for e in await self.get_label_addr_pairs()}
 			)
 
+		if self.cfg.txhist_cache:
+			from .txcache import BitcoinTwTxCache
+			txcache = BitcoinTwTxCache(self.cfg, self.proto, self.rpc.twname)
+			await txcache.check_chain(self.rpc)
+		else:
+			txcache = None
+
+		# confirmed wallet txs are taken from the cache if still in the block listed for them
+		_wallet_blockhashes = {d['txid']: d.get('blockhash') for d in data}
+		_wallet_txs_dict = {txid: tx for txid, blockhash in _wallet_blockhashes.items()
+			if blockhash and (tx := txcache.get('wallet', txid, blockhash=blockhash))} if txcache else {}
+
 		msg_r('Getting wallet transactions...')
-		_wallet_txs = await self.rpc.gathered_icall(
-			'gettransaction',
-			[(i, True, True) for i in {d['txid'] for d in data}])
+		if _fetch_txids := [i for i in _wallet_blockhashes if i not in _wallet_txs_dict]:
+			_new_txs = await self.rpc.gathered_icall('gettransaction', [(i, True, True) for i in _fetch_txids])
+			if not 'decoded' in _new_txs[0]:
+				_decoded_txs = iter(
+					await self.rpc.gathered_call(
+						'decoderawtransaction',
+						[(d['hex'],) for d in _new_txs]))
+				for tx in _new_txs:
+					tx['decoded'] = next(_decoded_txs)
+			for tx in _new_txs:
+				_wallet_txs_dict[tx['txid']] = tx
+				if txcache:
+					txcache.add('wallet', tx)
 		msg('done')
 
-		if not 'decoded' in _wallet_txs[0]:
-			_decoded_txs = iter(
-				await self.rpc.gathered_call(
-					'decoderawtransaction',
-					[(d['hex'],) for d in _wallet_txs]))
-			for tx in _wallet_txs:
-				tx['decoded'] = next(_decoded_txs)
+		_wallet_txs = list(_wallet_txs_dict.values())
 
 		if self.cfg.debug_tw:
 			do_json_dump((_wallet_txs, 'wallet-txs'),)
@@ -349,11 +365,23 @@ class BitcoinTwTxHistory(BitcoinTwView, TwTxHistory, BitcoinTwRPC):
 
 		_prevout_txids = {i.txid for d in txdata for i in d['prevouts']}
 
+		_prevout_txs_dict = {txid: tx for txid in _prevout_txids
+			if (tx := txcache.get('prevout', txid))} if txcache else {}
+
 		msg_r('Getting input transactions...')
-		_prevout_txs = await self.rpc.gathered_call('getrawtransaction', [(i, True) for i in _prevout_txids])
+		if _fetch_txids := [i for i in _prevout_txids if i not in _prevout_txs_dict]:
+			for txid, tx in zip(
+					_fetch_txids,
+					await self.rpc.gathered_call('getrawtransaction', [(i, True) for i in _fetch_txids])):
+				_prevout_txs_dict[txid] = tx
+				if txcache:
+					txcache.add('prevout', tx)
 		msg('done')
 
-		_prevout_txs_dict = dict(zip(_prevout_txids, _prevout_txs))
+		if txcache:
+			txcache.save()
+
+		_prevout_txs = list(_prevout_txs_dict.values())
 
 		for d in txdata:
 			d['prevout_txs'] = [_prevout_txs_dict[txid] for txid in {i.txid for i in d['prevouts']}]
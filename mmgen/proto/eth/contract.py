@@ -66,12 +66,7 @@ class Contract:
 
 		data = data or (self.create_method_id(method_sig) + method_args)
 
-		args = {
-			'to': '0x' + self.addr,
-			('data' if self.rpc.daemon.id == 'parity' else 'input'): '0x' + data}
-
-		if from_addr:
-			args['from'] = '0x' + from_addr
+		args = self.make_call_args(data, from_addr=from_addr)
 
 		if self.cfg.debug_evm:
 			msg('{a}:\n  {b} {c}'.format(
@@ -90,6 +85,14 @@ class Contract:
 
 		return int(ret, 16) * self.base_unit if toUnit else ret
 
+	def make_call_args(self, data, *, from_addr=None):
+		args = {
+			'to': '0x' + self.addr,
+			('data' if self.rpc.daemon.id == 'parity' else 'input'): '0x' + data}
+		if from_addr:
+			args['from'] = '0x' + from_addr
+		return args
+
 	def make_tx_in(self, *, gas, gasPrice, nonce, data):
 		assert isinstance(gas, int), f'{type(gas)}: incorrect type for ‘gas’ (must be an int)'
 		return {
@@ -127,8 +130,63 @@ class Contract:
 	async def txsend(self, txhex):
 		return (await self.rpc.call('eth_sendRawTransaction', '0x'+txhex)).replace('0x', '', 1)
 
+class Multicall(Contract):
+	"""
+	A deployed Multicall contract.  All versions (Multicall, Multicall2 and Multicall3)
+	provide the aggregate() method, which performs a list of calls in a single eth_call
+	and reverts if any of them fails
+	"""
+	aggregate_sig = 'aggregate((address,bytes)[])'
+	chunk_size = 500 # keep gas used per eth_call well below node limits
+
+	def __init__(self, cfg, proto, addr, *, rpc=None):
+		Contract.__init__(self, cfg, proto, addr.removeprefix('0x').lower(), rpc=rpc)
+
+	def create_aggregate_data(self, calls):
+		"""
+		ABI-encode a list of (target address, call data) pairs as arguments to aggregate()
+		"""
+		heads, tails, pos = [], [], 32 * len(calls)
+		for addr, data in calls:
+			tail = (
+				addr.rjust(64, '0')                            # target address
+				+ '{:064x}'.format(64)                         # offset of call data
+				+ '{:064x}'.format(len(data) // 2)             # call data length
+				+ data.ljust(-(-len(data) // 64) * 64, '0'))   # call data, padded
+			heads.append('{:064x}'.format(pos))
+			tails.append(tail)
+			pos += len(tail) // 2
+		return (
+			self.create_method_id(self.aggregate_sig)
+			+ '{:064x}'.format(32)                             # offset of array
+			+ '{:064x}'.format(len(calls))                     # array length
+			+ ''.join(heads)
+			+ ''.join(tails))
+
+	@staticmethod
+	def parse_aggregate_result(res):
+		"""
+		decode the (uint256 blockNumber, bytes[] returnData) tuple returned by aggregate(),
+		returning the list of return data as hex strings
+		"""
+		d = bytes.fromhex(res.removeprefix('0x'))
+		def word(pos):
+			return int.from_bytes(d[pos:pos+32], 'big')
+		start = word(32) + 32 # start of array data, following length word
+		def gen():
+			for i in range(word(start - 32)):
+				pos = start + word(start + 32 * i)
+				yield d[pos+32:pos+32+word(pos)].hex()
+		return list(gen())
+
+	async def aggregate(self, calls, block='latest'):
+		return self.parse_aggregate_result(
+			await self.do_call(data=self.create_aggregate_data(calls), block=block))
+
 class Token(Contract):
 
+	batch_size = 1000
+
 	def __init__(self, cfg, proto, addr, *, rpc=None, decimals=None):
 		Contract.__init__(self, cfg, proto, addr, rpc=rpc)
 		if decimals:
@@ -141,6 +199,32 @@ class Token(Contract):
 			await self.do_call('balanceOf(address)', acct_addr.rjust(64, '0'), toUnit=True, block=block),
 			from_decimal = True)
 
+	async def get_balances(self, acct_addrs, block='latest'):
+		"""
+		get the balances of multiple accounts, packing the balanceOf() calls into a single
+		aggregate() call per chunk if a Multicall contract is configured, or into JSON-RPC
+		batch requests otherwise
+		"""
+		method_id = self.create_method_id('balanceOf(address)')
+		calldata = [method_id + addr.rjust(64, '0') for addr in acct_addrs]
+		if self.proto.multicall_addr:
+			mc = Multicall(self.cfg, self.proto, self.proto.multicall_addr, rpc=self.rpc)
+			ret = []
+			for i in range(0, len(calldata), mc.chunk_size):
+				ret.extend(
+					await mc.aggregate([(self.addr, d) for d in calldata[i:i+mc.chunk_size]], block=block))
+		else:
+			ret = []
+			for i in range(0, len(calldata), self.batch_size):
+				ret.extend(await self.rpc.batch_call(
+					'eth_call',
+					[(self.make_call_args(d), block) for d in calldata[i:i+self.batch_size]]))
+				await erigon_sleep(self)
+		for addr, res in zip(acct_addrs, ret):
+			if res in (None, '', '0x'):
+				die('RPCFailure', f'balanceOf({addr}) call to token {self.addr} failed')
+		return [self.proto.coin_amt(int(res, 16) * self.base_unit, from_decimal=True) for res in ret]
+
 	async def get_name(self):
 		return self.strip(bytes.fromhex((await self.do_call('name()'))[2:]))
 
@@ -29,6 +29,7 @@ class mainnet(CoinProtocol.DummyWIF, CoinProtocol.Secp256k1):
 	coin_amt      = 'ETHAmt'
 	max_tx_fee    = 0.005
 	chain_names   = ['ethereum', 'foundation']
+	multicall_addr = '' # Multicall contract for batched token balance queries
 	sign_mode     = 'standalone'
 	caps          = ('token',)
 	mmcaps        = ('rpc', 'rpc_init', 'tw', 'msg')
@@ -64,7 +65,8 @@ class mainnet(CoinProtocol.DummyWIF, CoinProtocol.Secp256k1):
 		'max_tx_fee')
 
 	proto_cfg_opts = (
-		'chain_names')
+		'chain_names',
+		'multicall_addr')
 
 	@property
 	def dcoin(self):
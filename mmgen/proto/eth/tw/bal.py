@@ -36,6 +36,7 @@ class EthereumTwGetBalance(TwGetBalance):
 	async def create_data(self):
 		in_data = self.twctl.mmid_ordered_dict
 		block = self.twctl.rpc.get_block_from_minconf(self.minconf)
+		bals = await self.twctl.get_balances([v['addr'] for v in in_data.values()], block=block)
 		for d in in_data:
 			if d.type == 'mmgen':
 				label = d.obj.sid
@@ -44,7 +45,7 @@ class EthereumTwGetBalance(TwGetBalance):
 			else:
 				label = 'Non-MMGen'
 
-			amt = await self.twctl.get_balance(in_data[d]['addr'], block=block)
+			amt = bals[in_data[d]['addr']]
 
 			self.data['TOTAL']['ge_minconf'] += amt
 			self.data[label]['ge_minconf'] += amt
@@ -84,6 +84,10 @@ class EthereumTwCtl(TwCtlWithStore):
 			int(await self.rpc.call('eth_getBalance', '0x' + addr, block), 16),
 			from_unit = 'wei')
 
+	async def rpc_get_balances(self, addrs, block='latest'):
+		return [self.proto.coin_amt(int(res, 16), from_unit='wei')
+			for res in await self.rpc.gathered_call('eth_getBalance', [('0x' + a, block) for a in addrs])]
+
 	async def addr2sym(self, req_addr):
 		for addr in self.data['tokens']:
 			if addr == req_addr:
@@ -146,6 +150,10 @@ class EthereumTokenTwCtl(EthereumTwCtl):
 	def data_root(self):
 		return self.data['tokens'][self.token]
 
+	@property
+	def data_root_path(self):
+		return ('tokens', self.token)
+
 	@property
 	def data_root_desc(self):
 		return 'token ' + self.get_param('symbol')
@@ -158,15 +166,33 @@ class EthereumTokenTwCtl(EthereumTwCtl):
 			decimals = self.decimals,
 			rpc = self.rpc).get_balance(addr, block=block)
 
+	async def rpc_get_balances(self, addrs, block='latest'):
+		return await Token(
+			self.cfg,
+			self.proto,
+			self.token,
+			decimals = self.decimals,
+			rpc = self.rpc).get_balances(addrs, block=block)
+
 	async def get_eth_balance(self, addr, *, force_rpc=False, block='latest'):
 		cache = self.cur_eth_balances
 		r = self.data['accounts']
 		ret = None if force_rpc else self.get_cached_balance(addr, cache, r)
 		if ret is None:
 			ret = await super().rpc_get_balance(addr, block=block)
-			self.cache_balance(addr, ret, session_cache=cache, data_root=r)
+			self.cache_balance(addr, ret, session_cache=cache, data_root=r, data_path=('accounts',))
 		return ret
 
+	async def get_eth_balances(self, addrs, *, force_rpc=False, block='latest'):
+		return await self.prefetch_balances(
+			addrs,
+			super().rpc_get_balances,
+			session_cache = self.cur_eth_balances,
+			data_root     = self.data['accounts'],
+			data_path     = ('accounts',),
+			force_rpc     = force_rpc,
+			block         = block)
+
 	def get_param(self, param):
 		return self.data['tokens'][self.token]['params'][param]
 
@@ -36,5 +36,6 @@ class EthereumTokenTwUnspentOutputs(EthereumTwUnspentOutputs):
 
 	async def get_data(self):
 		await super().get_data()
+		bals = await self.twctl.get_eth_balances([e.addr for e in self.data])
 		for e in self.data:
-			e.amt2 = await self.twctl.get_eth_balance(e.addr)
+			e.amt2 = bals[e.addr]
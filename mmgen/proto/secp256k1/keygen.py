@@ -12,8 +12,8 @@
 proto.secp256k1.keygen: secp256k1 public key generation backends for the MMGen suite
 """
 
-from ...key import PubKey
-from ...keygen import keygen_base
+from ...key import PrivKey, PubKey
+from ...keygen import keygen_base, keygen_public_data
 
 def pubkey_format(vk_bytes, compressed):
 	# if compressed, discard Y coord, replace with appropriate version byte
@@ -28,14 +28,36 @@ class backend:
 
 		def __init__(self, cfg):
 			super().__init__(cfg)
-			from .secp256k1 import pubkey_gen
+			from .secp256k1 import pubkey_gen, pubkey_gen_batch
 			self.pubkey_gen = pubkey_gen
+			self.pubkey_gen_batch = pubkey_gen_batch
 
 		def to_pubkey(self, privkey):
 			return PubKey(
 				s = self.pubkey_gen(privkey, int(privkey.compressed)),
 				compressed = privkey.compressed)
 
+		def gen_data_batch(self, privkeys):
+			"""
+			generate public data for a sequence of private keys with a single call to the
+			extension module
+			"""
+			if not privkeys:
+				return []
+			k0 = privkeys[0]
+			assert all(
+				isinstance(k, PrivKey) and k.compressed == k0.compressed and k.pubkey_type == k0.pubkey_type
+					for k in privkeys), 'gen_data_batch(): private keys must be of the same type'
+			compressed = k0.compressed
+			pklen = 33 if compressed else 65
+			buf = self.pubkey_gen_batch(b''.join(privkeys), int(compressed))
+			return [keygen_public_data(
+					PubKey(s=buf[i:i+pklen], compressed=compressed),
+					None,
+					k0.pubkey_type,
+					compressed)
+				for i in range(0, len(buf), pklen)]
+
 		@classmethod
 		def get_clsname(cls, cfg, *, silent=False):
 			try:
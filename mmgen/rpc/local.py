@@ -154,8 +154,10 @@ class RPCClient:
 		if status == 200:
 			util.dmsg_rpc('    RPC RESPONSE data ==>\n{}\n', text, is_json=True)
 			m = None
-			if batch:
-				return [r['result'] for r in json.loads(text, parse_float=float_parser)]
+			if batch: # responses may arrive in any order
+				return [r.get('result') for r in sorted(
+					json.loads(text, parse_float=float_parser),
+					key = lambda r: r['id'])]
 			else:
 				try:
 					if json_rpc:
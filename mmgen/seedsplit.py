@@ -66,6 +66,7 @@ class SeedSplitIDString(MMGenPWIDString):
 
 class SeedShareList(SubSeedList):
 	have_short = False
+	use_index = False
 	split_type = 'N-of-N'
 
 	count  = ImmutableAttr(SeedShareCount)
@@ -167,6 +168,85 @@ class SeedShareList(SubSeedList):
 
 		return hdr + body1 + ''.join(body)
 
+def _make_share_wallet(state, idx):
+	"""
+	return the Seed ID, filename and formatted wallet data of share ‘idx’
+	(worker function for export_all_shares())
+	"""
+	import time
+	from .wallet import Wallet
+	cfg, shares, params_from = state
+	t_start = time.time()
+	w = Wallet(cfg, seed=shares.get_share_by_idx(idx, base_seed=True), params_from=params_from)
+	return (str(w.seed.sid), w._filename(), w.get_fmt_data(), time.time() - t_start)
+
+def _share_params_known(cfg, w):
+	"""
+	return True if shares can be created like wallet ‘w’ without prompting the user
+	"""
+	d = w.ssdata
+	return bool(
+		(cfg.keep_hash_preset or cfg.hash_preset or not hasattr(d, 'hash_preset'))
+		and (cfg.keep_passphrase or w.passwd_file or not hasattr(d, 'passwd'))
+		and (cfg.keep_label or cfg.label or not hasattr(d, 'label')))
+
+def export_all_shares(cfg, shares):
+	"""
+	write all shares of split ‘shares’ to wallet files in the configured output
+	format, then print a manifest of the split
+
+	The user is prompted for each share’s passphrase, hash preset and label as
+	required, with the first share’s values as defaults.  With --keep-passphrase,
+	--keep-hash-preset and --keep-label, the first share’s values are reused for
+	the remaining shares, which may then be generated in parallel.
+	"""
+	import time
+	from .util import Msg
+	from .wallet import Wallet
+	from .fileutil import write_data_to_file
+	from .mproc import get_jobs, pool_imap
+
+	t_start = time.time()
+	first = shares.get_share_by_idx(1, base_seed=True)
+	msg(first.get_desc(ui=True))
+	w = Wallet(cfg, seed=first)
+	w.write_to_file()
+	manifest = [(1, str(first.sid), time.time() - t_start, w._filename())]
+
+	state = (cfg, shares, w)
+	idxs = range(2, shares.count + 1)
+	jobs = min(len(idxs), get_jobs(cfg)) if _share_params_known(cfg, w) else 1
+
+	def gen_wallets():
+		for idx in idxs:
+			msg(shares.get_share_by_idx(idx, base_seed=True).get_desc(ui=True))
+			yield _make_share_wallet(state, idx)
+
+	for idx, (sid, fn, fmt_data, secs) in zip(
+			idxs,
+			pool_imap(_make_share_wallet, idxs, jobs=jobs, state=state) if jobs > 1 else gen_wallets()):
+		write_data_to_file(
+			cfg,
+			fn,
+			fmt_data,
+			desc    = w.desc,
+			ask_tty = w.ask_tty,
+			no_tty  = w.no_tty,
+			binary  = w.file_mode == 'binary')
+		manifest.append((idx, sid, secs, fn))
+
+	ms = shares.master_share
+	Msg('\n'.join([
+		'Seed: {} ({} bits)  Split: {c}-of-{c}{}  ID String: {}'.format(
+			shares.parent_seed.sid,
+			shares.parent_seed.bitlen,
+			f' with master share #{ms.idx}' if ms else '',
+			shares.id_str,
+			c = shares.count),
+		'{:>5}  {:8}  {:>7}  {}'.format('Share', 'Seed ID', 'Secs', 'File')]
+		+ ['{:>5}  {:8}  {:7.2f}  {}'.format(*e) for e in manifest]
+		+ [f'{shares.count} shares written in {time.time() - t_start:.2f} seconds']))
+
 class SeedShareBase(MMGenObject):
 
 	@property
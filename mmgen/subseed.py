@@ -20,6 +20,8 @@
 subseed: Subseed classes and methods for the MMGen suite
 """
 
+import os
+
 from .color import green
 from .util import msg_r, msg, die, make_chksum_8
 from .objmethods import MMGenObject, HiliteStr, InitErrors
@@ -80,11 +82,122 @@ class SubSeed(SeedBase):
 		return Crypto(parent_list.parent_seed.cfg).scramble_seed(
 			seed.data, scramble_key)[:16 if short else seed.byte_len]
 
+def _make_subseed_sids(parent_list, idxs):
+	"""
+	return the long and short Seed IDs of the subseeds at indexes ‘idxs’ for the
+	initial nonce (worker function for SubSeedList._generate())
+	"""
+	def make_sid(idx, length): # return a str, as HexStr can’t be unpickled
+		return str(make_chksum_8(parent_list.member_type.make_subseed_bin(
+			parent_list, idx, parent_list.nonce_start, length)))
+	return [(
+			idx,
+			make_sid(idx, 'long'),
+			make_sid(idx, 'short') if parent_list.have_short else None
+		) for idx in idxs]
+
+class SubSeedIndex:
+	"""
+	Encrypted on-disk index of the subseeds of a parent seed
+
+	The index holds the Seed ID and nonce of the long and short subseeds at each
+	index generated so far, allowing a subseed to be found by Seed ID without
+	regenerating the subseeds of lower index.
+
+	Index files are keyed by a fingerprint of the parent seed.  Both the
+	fingerprint and the encryption key are derived from the parent seed, so the
+	index is useless without the seed itself.
+	"""
+	subdir  = 'subseed_index'
+	ext     = 'mmssidx'
+	magic   = b'MMGSSIX1'
+	rec_len = 2 * (4 + 2) # Seed ID + nonce (big-endian uint16), long and short
+	hdr_len = 16 + 32 # IV + sha256 of plaintext
+
+	def __init__(self, parent_list):
+		import hmac
+		seed = parent_list.parent_seed
+		self.cfg = seed.cfg
+		self.parent_list = parent_list
+		self.key = hmac.digest(seed.data, b'subseed index key', 'sha256')
+		self.fingerprint = make_chksum_8(hmac.digest(seed.data, b'subseed index id', 'sha256'))
+		self.path = os.path.join(self.cfg.data_dir, self.subdir, f'{self.fingerprint}.{self.ext}')
+		self.body = b''
+		self.load()
+
+	@property
+	def saved_len(self):
+		return len(self.body) // self.rec_len
+
+	def load(self):
+		try:
+			with open(self.path, 'rb') as fp:
+				data = fp.read()
+		except FileNotFoundError:
+			return
+		from hashlib import sha256
+		from .crypto import Crypto
+		iv, chk, enc_data = data[:16], data[16:self.hdr_len], data[self.hdr_len:]
+		dec_data = Crypto(self.cfg).decrypt_data(enc_data, self.key, iv=iv, desc='subseed index')
+		if sha256(dec_data).digest() != chk or not dec_data.startswith(self.magic):
+			from .util import ymsg
+			ymsg(f'Warning: subseed index file ‘{self.path}’ is corrupted, ignoring')
+			return
+		self.body = dec_data[len(self.magic):]
+		self.cfg._util.dmsg(f'Loaded {self.saved_len} subseed index entries from ‘{self.path}’')
+
+	def fill(self, last_idx, last_sid):
+		"""
+		add indexed subseeds up to index ‘last_idx’ to the parent list, stopping
+		early if Seed ID ‘last_sid’ is found.  Return True if it was found.
+		"""
+		ss_list = self.parent_list
+		for idx in range(len(ss_list) + 1, min(last_idx, self.saved_len) + 1):
+			rec = self.body[(idx-1)*self.rec_len:idx*self.rec_len]
+			found = False
+			for length, offset in (('long', 0), ('short', 6)):
+				sid = rec[offset:offset+4].hex().upper()
+				ss_list.data[length][sid] = (idx, int.from_bytes(rec[offset+4:offset+6], 'big'))
+				found = found or sid == last_sid
+			if found:
+				return True
+		return False
+
+	def save(self):
+		"""
+		save the index if the parent list has grown since the index was last saved
+		"""
+		ss_list = self.parent_list
+		if len(ss_list) <= self.saved_len:
+			return
+		from hashlib import sha256
+		from .crypto import Crypto
+		data = ss_list.data
+		body = self.magic + b''.join(
+			bytes.fromhex(sid_long) + data['long'][sid_long][1].to_bytes(2, 'big') +
+			bytes.fromhex(sid_short) + data['short'][sid_short][1].to_bytes(2, 'big')
+				for sid_long, sid_short in zip(data['long'].keys, data['short'].keys))
+		iv = os.urandom(16) # new IV on each write, as the key is fixed
+		enc_data = Crypto(self.cfg).encrypt_data(
+			body,
+			key    = self.key,
+			iv     = iv,
+			desc   = 'subseed index',
+			verify = False,
+			silent = True)
+		from .fileutil import write_file_atomic
+		write_file_atomic(self.path, iv + sha256(body).digest() + enc_data)
+		self.body = body[len(self.magic):]
+
 class SubSeedList(MMGenObject):
 	have_short = True
+	use_index = True
+	index = None
 	nonce_start = 0
 	debug_last_share_sid_len = 3
 	dfl_len = 100
+	parallel_min = 1000 # minimum number of indexes for parallel generation
+	parallel_batch_size = 2000
 
 	def __init__(self, parent_seed, *, length=None):
 		self.member_type = SubSeed
@@ -95,6 +208,11 @@ class SubSeedList(MMGenObject):
 	def __len__(self):
 		return len(self.data['long'])
 
+	def _get_index(self):
+		if self.index is None and self.use_index and self.parent_seed.cfg.subseed_index:
+			self.index = SubSeedIndex(self)
+		return self.index
+
 	def get_subseed_by_ss_idx(self, ss_idx_in, *, print_msg=False):
 		ss_idx = SubSeedIdx(ss_idx_in)
 		if print_msg:
@@ -139,8 +257,9 @@ class SubSeedList(MMGenObject):
 					subseed.ss_idx.hl(),
 				))
 
-		if last_idx is None:
-			last_idx = self.len
+		if last_idx is None: # search indexed subseeds too, even if beyond default range
+			index = self._get_index()
+			last_idx = max(self.len, index.saved_len if index else 0)
 
 		subseed = get_existing_subseed_by_seed_id(sid)
 		if subseed:
@@ -177,17 +296,22 @@ class SubSeedList(MMGenObject):
 		if last_idx is None:
 			last_idx = self.len
 
+		if last_sid is not None:
+			last_sid = SeedID(sid=last_sid)
+
+		index = self._get_index()
+		if index and index.fill(last_idx, last_sid):
+			return None
+
 		first_idx = len(self) + 1
 
 		if first_idx > last_idx:
 			return None
 
-		if last_sid is not None:
-			last_sid = SeedID(sid=last_sid)
-
-		def add_subseed(idx, length):
+		def add_subseed(idx, length, sid_start):
 			for nonce in range(self.nonce_start, self.member_type.max_nonce+1): # handle SeedID collisions
-				sid = make_chksum_8(self.member_type.make_subseed_bin(self, idx, nonce, length))
+				sid = sid_start if nonce == self.nonce_start and sid_start else make_chksum_8(
+					self.member_type.make_subseed_bin(self, idx, nonce, length))
 				if sid in self.data['long'] or sid in self.data['short'] or sid == self.parent_seed.sid:
 					if self.parent_seed.cfg.debug_subseed: # should get ≈450 collisions for first 1,000,000 subseeds
 						self._collision_debug_msg(sid, idx, nonce)
@@ -197,11 +321,35 @@ class SubSeedList(MMGenObject):
 			# must exit here, as this could leave self.data in inconsistent state
 			die('SubSeedNonceRangeExceeded', 'add_subseed(): nonce range exceeded')
 
-		for idx in SubSeedIdxRange(first_idx, last_idx).iterate():
-			match1 = add_subseed(idx, 'long')
-			match2 = add_subseed(idx, 'short') if self.have_short else False
-			if match1 or match2:
-				break
+		from .mproc import get_jobs
+		jobs = get_jobs(self.parent_seed.cfg)
+		idxs = SubSeedIdxRange(first_idx, last_idx).iterate()
+
+		if jobs > 1 and last_idx - first_idx >= self.parallel_min:
+			# Seed IDs for the initial nonce are computed in parallel.  Collisions are
+			# then resolved serially in index order, so the result is identical to that
+			# of serial generation.
+			from .mproc import pool_imap, split_into_batches
+			batches = split_into_batches(idxs, self.parallel_batch_size)
+			res = pool_imap(_make_subseed_sids, batches, jobs=jobs, state=self)
+		else:
+			res = ([(idx, None, None)] for idx in idxs)
+
+		def add_subseeds():
+			for batch in res:
+				for idx, sid_long, sid_short in batch:
+					match1 = add_subseed(idx, 'long', sid_long)
+					match2 = add_subseed(idx, 'short', sid_short) if self.have_short else False
+					if match1 or match2:
+						return
+
+		try:
+			add_subseeds()
+		finally:
+			res.close() # terminate any worker processes
+
+		if index:
+			index.save()
 
 	def format(self, first_idx, last_idx):
 
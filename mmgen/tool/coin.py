@@ -194,6 +194,22 @@ class tool_cmd(tool_cmd_base):
 		from ..proto.btc.tx.base import decodeScriptPubKey
 		return decodeScriptPubKey(self.proto, hexstr).addr
 
+	def xkey2addrs(self, xkey: 'sstr', *, start=0, count=20):
+		"""
+		derive a range of addresses from a BIP-32 extended key
+
+		Non-hardened children of the key, with indexes beginning at ‘start’, are
+		derived publicly, so an extended public key (xpub) suffices.  For BIP-44
+		keys, the address type is taken from the ‘--type’ option if specified.
+		"""
+		from ..bip_hd import BipHDNode
+		node = BipHDNode.from_extended_key(
+			self.cfg,
+			self.proto.coin.lower(),
+			xkey,
+			addr_type = self.cfg.type)
+		return tuple(e.address for e in node.derive_range(start, count, public=True))
+
 	def eth_checksummed_addr(self, addr: 'sstr'):
 		"create a checksummed Ethereum address"
 		from ..protocol import init_proto
@@ -33,10 +33,12 @@ class tool_cmd(tool_cmd_base):
 		super().__init__(cfg=cfg, cmdname=cmdname, proto=proto, mmtype=mmtype)
 
 	def _file_chksum(self, mmgen_addrfile, obj):
-		kwargs = {'skip_chksum_msg': True}
+		kwargs = {'skip_chksum_msg': True, 'stream': True}
 		if not obj.__name__ == 'PasswordList':
 			kwargs.update({'key_address_validity_check': False})
 		ret = obj(self.cfg, self.proto, infile=mmgen_addrfile, **kwargs)
+		for _ in ret.iter_entries(): # stream the file to compute the checksum
+			pass
 		if self.cfg.verbose:
 			from ..util import msg, capfirst
 			if ret.al_id.mmtype.name == 'password':
@@ -47,7 +49,7 @@ class tool_cmd(tool_cmd_base):
 			else:
 				msg(f'Base coin:   {ret.base_coin} {capfirst(ret.network)}')
 				msg(f'MMType:      {capfirst(ret.al_id.mmtype.name)}')
-			msg(f'List length: {len(ret.data)}')
+			msg(f'List length: {ret.num_addrs}')
 		return ret.chksum
 
 	def addrfile_chksum(self, mmgen_addrfile: str):
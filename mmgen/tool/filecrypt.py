@@ -24,7 +24,7 @@ import os
 
 from .common import tool_cmd_base
 from ..crypto import Crypto
-from ..fileutil import get_data_from_file, write_data_to_file
+from ..fileutil import _open_or_die, write_data_to_file
 
 class tool_cmd(tool_cmd_base):
 	"""
@@ -32,32 +32,44 @@ class tool_cmd(tool_cmd_base):
 
 	MMGen encryption suite:
 	* Key: Scrypt (user-configurable hash parameters, 32-byte salt)
-	* Enc: AES256_CTR, 16-byte rand IV, sha256 hash + 32-byte nonce + data
+	* Enc: AES256_CTR, 16-byte rand IV, encrypted format header + data
+	* Auth: HMAC-SHA256 tag following each 1 MiB chunk of data
 	* The encrypted file is indistinguishable from random data
+
+	Files are encrypted and decrypted in chunks, so their size is not limited by
+	available memory.  Files in the original format (sha256 hash + 32-byte nonce
+	+ data, no size greater than ‘max_input_size’) may also be decrypted.
 	"""
 	def encrypt(self, infile: str, *, outfile='', hash_preset=''):
 		"encrypt a file"
-		data = get_data_from_file(self.cfg, infile, desc='data for encryption', binary=True)
-		enc_d = Crypto(self.cfg).mmgen_encrypt(data, desc='data', hash_preset=hash_preset)
-		if not outfile:
-			outfile = f'{os.path.basename(infile)}.{Crypto.mmenc_ext}'
-		write_data_to_file(self.cfg, outfile, enc_d, desc='encrypted data', binary=True)
+		self.cfg._util.qmsg(f'Getting data for encryption from file ‘{infile}’')
+		with _open_or_die(infile, 'rb') as fp:
+			enc_d = Crypto(self.cfg).mmgen_encrypt_stream(fp, desc='data', hash_preset=hash_preset)
+			if not outfile:
+				outfile = f'{os.path.basename(infile)}.{Crypto.mmenc_ext}'
+			write_data_to_file(self.cfg, outfile, enc_d, desc='encrypted data', binary=True)
 		return True
 
 	def decrypt(self, infile: str, *, outfile='', hash_preset=''):
 		"decrypt a file"
-		enc_d = get_data_from_file(self.cfg, infile, desc='encrypted data', binary=True)
-		while True:
-			dec_d = Crypto(self.cfg).mmgen_decrypt(enc_d, desc='data', hash_preset=hash_preset)
-			if dec_d:
-				break
-			from ..util import msg
-			msg('Trying again...')
-		if not outfile:
-			from ..util import remove_extension
-			o = os.path.basename(infile)
-			outfile = remove_extension(o, Crypto.mmenc_ext)
-			if outfile == o:
-				outfile += '.dec'
-		write_data_to_file(self.cfg, outfile, dec_d, desc='decrypted data', binary=True)
+		self.cfg._util.qmsg(f'Getting encrypted data from file ‘{infile}’')
+		with _open_or_die(infile, 'rb') as fp:
+			while True:
+				dec_d = Crypto(self.cfg).mmgen_decrypt_file(
+					fp,
+					desc           = 'data',
+					hash_preset    = hash_preset,
+					max_legacy_len = self.cfg.max_input_size)
+				if dec_d is not False:
+					break
+				from ..util import msg
+				msg('Trying again...')
+				fp.seek(0)
+			if not outfile:
+				from ..util import remove_extension
+				o = os.path.basename(infile)
+				outfile = remove_extension(o, Crypto.mmenc_ext)
+				if outfile == o:
+					outfile += '.dec'
+			write_data_to_file(self.cfg, outfile, dec_d, desc='decrypted data', binary=True)
 		return True
@@ -20,50 +20,95 @@
 tool.fileutil: File routines for the 'mmgen-tool' utility
 """
 
-import sys, os
+import os
 
 from .common import tool_cmd_base
 from ..util import msg, msg_r, die, suf, make_full_path
 from ..crypto import Crypto
 
+def _find_incog_data_in_region(state, region):
+	"""
+	return the offsets of all IVs in region ‘region’ of file ‘fn’ whose SHA256
+	hash begins with ‘id_bytes’
+	"""
+	import mmap
+	from hashlib import sha256
+	fn, id_bytes = state
+	start, end = region
+	ivsize = Crypto.aesctr_iv_len
+	map_start = start - start % mmap.ALLOCATIONGRANULARITY
+	with open(fn, 'rb') as fp:
+		with mmap.mmap(
+				fp.fileno(),
+				end + ivsize - 1 - map_start,
+				access = mmap.ACCESS_READ,
+				offset = map_start) as mm:
+			d = start - map_start
+			return [map_start + i for i in range(d, d + end - start)
+				if sha256(mm[i:i+ivsize]).digest()[:4] == id_bytes]
+
 class tool_cmd(tool_cmd_base):
 	"file utilities"
 
+	incog_search_region_size = 1 << 23 # size of file regions searched by find_incog_data worker processes
+
 	def find_incog_data(self,
 			filename: str,
 			incog_id: str,
 			*,
-			keep_searching: 'continue search after finding data (ID collisions can yield false positives)' = False):
-		"Use an Incog ID to find hidden incognito wallet data"
-
-		from hashlib import sha256
-
-		ivsize, bsize, mod = (Crypto.aesctr_iv_len, 4096, 4096*8)
-		n, carry = 0, b' '*ivsize
-		flgs = os.O_RDONLY|os.O_BINARY if sys.platform == 'win32' else os.O_RDONLY
-		f = os.open(filename, flgs)
-		for ch in incog_id:
-			if ch not in '0123456789ABCDEF':
-				die(2, f'{incog_id!r}: invalid Incog ID')
-		while True:
-			d = os.read(f, bsize)
-			if not d:
-				break
-			d = carry + d
-			for i in range(bsize):
-				if sha256(d[i:i+ivsize]).hexdigest()[:8].upper() == incog_id:
-					if n+i < ivsize:
-						continue
-					msg(f'\rIncog data for ID {incog_id} found at offset {n+i-ivsize}')
-					if not keep_searching:
-						sys.exit(0)
-			carry = d[len(d)-ivsize:]
-			n += bsize
-			if not n % mod:
-				msg_r(f'\rSearched: {n} bytes')
-
-		msg('')
-		os.close(f)
+			keep_searching: 'continue search after finding data (ID collisions can yield false positives)' = False,
+			start: 'offset at which to begin (or resume) the search' = 0,
+			jobs: 'number of worker processes (0: use all CPU cores)' = 0):
+		"""
+		Use an Incog ID to find hidden incognito wallet data
+
+		The file or device is memory-mapped and divided into regions, which are
+		searched in parallel by the worker processes.  If the search is interrupted,
+		it may be resumed by supplying the last reported offset as ‘start’.
+		"""
+		import time
+		from ..mproc import get_jobs, pool_imap
+
+		if len(incog_id) != 8 or incog_id.strip('0123456789ABCDEF'):
+			die(2, f'{incog_id!r}: invalid Incog ID')
+
+		ivsize = Crypto.aesctr_iv_len
+		region_size = self.incog_search_region_size
+
+		with open(filename, 'rb') as fp:
+			fsize = fp.seek(0, os.SEEK_END) # works for block devices too
+		last = fsize - ivsize + 1 # end of the range of possible IV offsets
+
+		regions = [(n, min(n + region_size, last)) for n in range(start, last, region_size)]
+		jobs = min(len(regions), get_jobs(self.cfg, jobs=jobs)) or 1
+		state = (filename, bytes.fromhex(incog_id))
+
+		t_start = time.time()
+		searched = start
+		found = False
+		try:
+			for region, offsets in zip(
+					regions,
+					pool_imap(_find_incog_data_in_region, regions, jobs=jobs, state=state) if jobs > 1 else
+					(_find_incog_data_in_region(state, r) for r in regions)):
+				for offset in offsets:
+					msg(f'\rIncog data for ID {incog_id} found at offset {offset}')
+					found = True
+				searched = region[1]
+				if found and not keep_searching:
+					break
+				msg_r(f'\rSearched: {searched} of {last} offsets ({searched * 100 // last}%)')
+		except KeyboardInterrupt:
+			msg(f'\nSearch interrupted.  To resume, use ‘start={searched}’')
+			return False
+
+		secs = time.time() - t_start
+		nbytes = searched - start
+		msg('\nSearched {} byte{} in {:.2f} seconds ({:.2f} MB/s)'.format(
+			nbytes,
+			suf(nbytes),
+			secs,
+			nbytes / secs / 1000000 if secs else 0))
 		return True
 
 	def rand2file(self, outfile: str, nbytes: str, *, threads=4, silent=False):
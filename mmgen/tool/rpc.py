@@ -208,6 +208,49 @@ class tool_cmd(tool_cmd_base):
 		await (await TwCtl(self.cfg, self.proto, mode='w')).rescan_blockchain(start_block, stop_block)
 		return True
 
+	async def discover_addrs(self, xkey: str, *, gap_limit=20, batch_size=0):
+		"""
+		find the funded addresses of a BIP-HD account using the ‘scantxoutset’ RPC call
+
+		NOTES:
+
+		  ‘xkey’ is an account-level extended key (an xpub suffices), e.g. the key
+		  for path m/84'/0'/0'.  Receive and change addresses are derived in batches
+		  of ‘batch_size’ (default: ‘gap_limit’) until ‘gap_limit’ consecutive
+		  unfunded addresses are found on each chain.  For BIP-44 keys, the address
+		  type is taken from the ‘--type’ option if specified.
+
+		  Only addresses currently holding unspent outputs are detected, since the
+		  UTXO set contains no transaction history.  Addresses whose funds have been
+		  fully spent are treated as unused, so a run of such addresses as long as
+		  ‘gap_limit’ ends discovery early, and funded addresses beyond it are
+		  missed.  If the account may contain spent addresses, use a larger
+		  ‘gap_limit’.
+
+		  Progress is saved after each batch, so an interrupted discovery may be
+		  resumed by repeating the command.
+		"""
+		from ..util import die
+		if self.proto.base_proto != 'Bitcoin':
+			die(1, f'Address discovery not supported for coin {self.proto.coin}')
+		if gap_limit < 1 or batch_size < 0:
+			die(1, '‘gap_limit’ must be positive and ‘batch_size’ non-negative')
+		from ..rpc import rpc_init
+		from ..proto.btc.addrdiscovery import BipHDAddrDiscovery
+		from ..util import ymsg
+		ymsg(
+			'Note: only addresses holding unspent outputs are detected.  Addresses with\n'
+			'spent outputs only are counted as unused when applying the gap limit.')
+		res = await BipHDAddrDiscovery(
+			self.cfg,
+			self.proto,
+			await rpc_init(self.cfg, self.proto, ignore_wallet=True),
+			xkey,
+			gap_limit  = gap_limit,
+			batch_size = batch_size,
+			addr_type  = self.cfg.type).run()
+		return tuple(f'{e.chain}/{e.idx} {e.addr} {e.amt}' for e in res) or 'No funded addresses found'
+
 	async def twexport(self, *,
 			include_amts = True,
 			pretty       = False,
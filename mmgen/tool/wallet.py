@@ -83,9 +83,17 @@ class tool_cmd(tool_cmd_base):
 		"generate a single MMGen address from default or specified wallet"
 		return self._gen_keyaddr(mmgen_addr, 'addr', wallet=wallet)
 
+	def clear_addr_cache(self, *, seed_id=''):
+		"remove the persistent address cache for all Seed IDs or for a specified Seed ID"
+		from ..addrcache import AddrCache
+		from ..util import msg
+		for path in AddrCache.clear(self.cfg, sid=seed_id or None):
+			msg(f'Removed ‘{path}’')
+		return True
+
 	def _gen_keyaddr(self, mmgen_addr, target, *, wallet=''):
 		from ..addr import MMGenID
-		from ..addrlist import AddrList, AddrIdxList
+		from ..addrlist import AddrList, KeyAddrList, AddrIdxList
 
 		addr = MMGenID(self.proto, mmgen_addr)
 		self.cfg._set_quiet(True)
@@ -95,7 +103,7 @@ class tool_cmd(tool_cmd_base):
 			from ..util import die
 			die(1, f'Seed ID of requested address ({addr.sid}) does not match wallet ({ss.seed.sid})')
 
-		d = AddrList(
+		d = (AddrList, KeyAddrList)[target == 'wif'](
 			cfg       = self.cfg,
 			proto     = self.proto,
 			seed      = ss.seed,
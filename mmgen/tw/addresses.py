@@ -136,8 +136,11 @@ class TwAddresses(TwView):
 		minconf = int(self.minconf)
 		block = self.twctl.rpc.get_block_from_minconf(minconf)
 
-		for e in await self.twctl.get_label_addr_pairs():
-			bal = await self.twctl.get_balance(e.coinaddr, block=block)
+		pairs = await self.twctl.get_label_addr_pairs()
+		bals = await self.twctl.get_balances([e.coinaddr for e in pairs], block=block)
+
+		for e in pairs:
+			bal = bals[e.coinaddr]
 			addrs[e.label.mmid] = {
 				'addr':    e.coinaddr,
 				'amt':     bal,
@@ -262,15 +265,9 @@ class TwAddresses(TwView):
 		if not self.dates_set:
 			bc = self.rpc.blockcount + 1
 			caddrs = [addr for addr in addrs if addr.confs]
-			hashes = await self.rpc.gathered_call(
-				'getblockhash',
-				[(n,) for n in [bc - a.confs for a in caddrs]])
-			dates = [d['time']
-				for d in await self.rpc.gathered_call(
-					'getblockheader',
-					[(h,) for h in hashes])]
-			for idx, addr in enumerate(caddrs):
-				addr.date = dates[idx]
+			times = await self.block_cache.get_times([bc - a.confs for a in caddrs])
+			for addr in caddrs:
+				addr.date = times[bc - addr.confs]
 			self.dates_set = True
 
 	sort_disp = {
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+#
+# MMGen Wallet, a terminal-based cryptocurrency wallet
+# Copyright (C)2013-2025 The MMGen Project <mmgen@tuta.io>
+# Licensed under the GNU General Public License, Version 3:
+#   https://www.gnu.org/licenses
+# Public project repositories:
+#   https://github.com/mmgen/mmgen-wallet
+#   https://gitlab.com/mmgen/mmgen-wallet
+
+"""
+tw.blockcache: Block time cache for tracking wallet views
+"""
+
+import os, json
+
+class TwBlockCache:
+	"""
+	Cache of block hashes and times by height, used to display the ages and dates of tracking
+	wallet view items
+
+	Uncached heights are fetched in one gathered RPC call per field.  With ‘block_cache’, blocks
+	at least ‘safe_confs’ deep are also saved to disk, one file per coin and network.  If the
+	highest saved block is no longer in the main chain when the cache is first used, the file’s
+	contents are discarded.
+	"""
+	subdir     = 'block_cache'
+	ext        = 'json'
+	version    = 1
+	safe_confs = 100
+
+	def __init__(self, cfg, proto, rpc):
+		self.cfg = cfg
+		self.rpc = rpc
+		self.path = os.path.join(
+			cfg.data_dir,
+			self.subdir,
+			f'{proto.coin.lower()}-{proto.network}.{self.ext}') if cfg.block_cache else None
+		self.blocks = {} # height -> [blockhash, time]
+		self.checked = False
+		self.changed = False
+		if self.path:
+			self.load()
+
+	def load(self):
+		try:
+			with open(self.path) as fp:
+				d = json.load(fp)
+		except FileNotFoundError:
+			return
+		except ValueError:
+			d = {}
+		if d.get('version') == self.version:
+			self.blocks = {int(k): v for k, v in d['blocks'].items()}
+			self.cfg._util.dmsg(f'Loaded {len(self.blocks)} cached blocks from ‘{self.path}’')
+		else:
+			from ..util import ymsg
+			ymsg(f'Warning: block cache file ‘{self.path}’ is invalid or corrupted, discarding')
+			self.changed = True
+
+	def save(self):
+		if not (self.path and self.changed):
+			return
+		max_height = self.rpc.blockcount + 1 - self.safe_confs
+		data = json.dumps({
+			'version': self.version,
+			'blocks': {str(k): self.blocks[k] for k in sorted(self.blocks) if k <= max_height}})
+		from ..fileutil import write_file_atomic
+		write_file_atomic(self.path, data + '\n')
+		self.changed = False
+
+	async def check_chain(self):
+		if self.blocks:
+			height = max(self.blocks)
+			if (height > self.rpc.blockcount
+					or await self.rpc.call('getblockhash', height) != self.blocks[height][0]):
+				self.cfg._util.dmsg('Chain reorganization detected, discarding cached blocks')
+				self.blocks = {}
+				self.changed = True
+		self.checked = True
+
+	async def get_times(self, heights):
+		"""
+		return a dict of block times keyed by height
+		"""
+		if not self.checked:
+			await self.check_chain()
+		if new := sorted({h for h in heights if h not in self.blocks}):
+			hashes = await self.rpc.gathered_call('getblockhash', [(h,) for h in new])
+			hdrs = await self.rpc.gathered_call('getblockheader', [(h,) for h in hashes])
+			for height, blockhash, hdr in zip(new, hashes, hdrs):
+				self.blocks[height] = [blockhash, hdr['time']]
+			self.changed = True
+		self.save()
+		return {h: self.blocks[h][1] for h in heights}
@@ -12,7 +12,7 @@
 tw.store: Tracking wallet control class with store
 """
 
-import json
+import os, json
 from pathlib import Path
 
 from ..base_obj import AsyncInit
@@ -23,12 +23,111 @@ from ..addr import is_coin_addr, is_mmgen_id, CoinAddr
 from .shared import TwMMGenID, TwLabel
 from .ctl import TwCtl, write_mode, label_addr_pair
 
+class TwStoreJournal:
+	"""
+	Append-only journal of incremental changes to a tracking wallet JSON file (the snapshot)
+
+	The first line of the journal identifies the snapshot it applies to.  Each following line
+	holds a single JSON-encoded operation, either ["set", path, value] or ["del", path].
+
+	A journal whose header doesn’t match the snapshot is left over from an interrupted
+	compaction and is ignored, as is a trailing partial line left by an interrupted append.
+	"""
+	magic = 'MMGenTwJournal'
+
+	def __init__(self, path, snapshot_path, snapshot_data):
+		from hashlib import sha256
+		self.path = path
+		self.snapshot_path = snapshot_path
+		self.snapshot_id = sha256(snapshot_data.encode()).hexdigest()[:16]
+		self.snapshot_stat = self.get_stat(snapshot_path)
+		self.disk_len = self.get_len()
+		self.valid_len = None # length of journal data applying to snapshot, None if no such data
+
+	@staticmethod
+	def get_stat(path):
+		try:
+			st = path.stat()
+		except FileNotFoundError:
+			return None
+		return (st.st_size, st.st_mtime_ns)
+
+	def get_len(self):
+		try:
+			return self.path.stat().st_size
+		except FileNotFoundError:
+			return 0
+
+	@property
+	def header(self):
+		return json.dumps({'magic': self.magic, 'snapshot': self.snapshot_id}) + '\n'
+
+	@staticmethod
+	def apply(data, op):
+		*keys, key = op[1]
+		for k in keys:
+			data = data[k]
+		match op[0]:
+			case 'set':
+				data[key] = op[2]
+			case 'del':
+				del data[key]
+
+	def replay(self, data):
+		"""
+		apply the journal to data loaded from the snapshot, returning the number of operations
+		"""
+		try:
+			jdata = self.path.read_bytes()
+		except FileNotFoundError:
+			return 0
+		lines = jdata.split(b'\n')[:-1] # drop trailing partial or empty line
+		if not lines or lines[0].decode() + '\n' != self.header:
+			return 0
+		try:
+			for n, line in enumerate(lines[1:], 2):
+				self.apply(data, json.loads(line))
+		except Exception as e:
+			die('WalletFileError', f'{self.path}: line {n}: invalid journal entry ({type(e).__name__}: {e})')
+		self.valid_len = sum(len(line) + 1 for line in lines)
+		return len(lines) - 1
+
+	def check(self, desc):
+		"""
+		die if the snapshot or journal has been altered by another program
+		"""
+		if self.get_stat(self.snapshot_path) != self.snapshot_stat or self.get_len() != self.disk_len:
+			die(3, f'{desc} has been altered by some other program! Aborting write')
+
+	def append(self, op, desc):
+		self.check(desc)
+		data = (json.dumps(op, separators=(',', ':')) + '\n').encode()
+		if self.valid_len is None:
+			data = self.header.encode() + data
+			flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC
+		else:
+			if self.disk_len > self.valid_len: # discard partial line
+				os.truncate(self.path, self.valid_len)
+			flags = os.O_WRONLY | os.O_APPEND
+		fd = os.open(self.path, flags, 0o600)
+		try:
+			os.write(fd, data) # single write, so an interrupted append leaves at most a partial line
+		finally:
+			os.close(fd)
+		self.valid_len = self.disk_len = (self.valid_len or 0) + len(data)
+
+	def remove(self):
+		self.path.unlink(missing_ok=True)
+		self.valid_len = None
+		self.disk_len = 0
+
 class TwCtlWithStore(TwCtl, metaclass=AsyncInit):
 
 	caps = ('batch',)
 	tw_subdir = None
 	tw_fn = 'tracking-wallet.json'
-	aggressive_sync = False
+	journal_ext = 'journal'
+	aggressive_sync = False # journal balance updates immediately instead of at exit
 
 	async def __init__(
 			self,
@@ -50,6 +149,7 @@ class TwCtlWithStore(TwCtl, metaclass=AsyncInit):
 
 		self.tw_dir = type(self).get_tw_dir(self.cfg, self.proto)
 		self.tw_path = self.tw_dir / self.tw_fn
+		self.journal_path = self.tw_dir / f'{self.tw_fn}.{self.journal_ext}'
 
 		if no_wallet_init:
 			return
@@ -116,11 +216,15 @@ class TwCtlWithStore(TwCtl, metaclass=AsyncInit):
 				self.tw_path.stat()
 			except:
 				self.orig_data = ''
+				self.journal = TwStoreJournal(self.journal_path, self.tw_path, self.orig_data)
 				self.init_empty()
 				self.force_write()
 			else:
 				die('WalletFileError', f'File ‘{self.tw_path}’ exists but does not contain valid JSON data')
 		else:
+			self.journal = TwStoreJournal(self.journal_path, self.tw_path, self.orig_data)
+			if n := self.journal.replay(self.data):
+				self.cfg._util.dmsg(f'Applied {n} journal entries from ‘{self.journal_path}’')
 			self.upgrade_wallet_maybe()
 
 		# ensure that wallet file is written when user exits via KeyboardInterrupt:
@@ -209,17 +313,21 @@ class TwCtlWithStore(TwCtl, metaclass=AsyncInit):
 	def data_root(self):
 		return self.data[self.data_key]
 
+	@property
+	def data_root_path(self):
+		return (self.data_key,)
+
 	@property
 	def data_root_desc(self):
 		return self.data_key
 
-	def cache_balance(self, addr, bal, *, session_cache, data_root, force=False):
+	def cache_balance(self, addr, bal, *, session_cache, data_root, data_path=None, force=False):
 		if force or addr not in session_cache:
 			session_cache[addr] = str(bal)
 			if addr in data_root:
 				data_root[addr]['balance'] = str(bal)
 				if self.aggressive_sync:
-					self.write()
+					self.journal_set((*(data_path or self.data_root_path), addr, 'balance'), str(bal))
 
 	def get_cached_balance(self, addr, session_cache, data_root):
 		if addr in session_cache:
@@ -237,15 +345,65 @@ class TwCtlWithStore(TwCtl, metaclass=AsyncInit):
 				self.cache_balance(addr, ret, session_cache=self.cur_balances, data_root=self.data_root)
 		return ret
 
+	async def rpc_get_balances(self, addrs, block='latest'):
+		return [await self.rpc_get_balance(addr, block=block) for addr in addrs]
+
+	async def get_balances(self, addrs, *, force_rpc=False, block='latest'):
+		"""
+		multi-address version of get_balance(), returning a dict keyed by address.  Uncached
+		balances are fetched in one batch via rpc_get_balances()
+		"""
+		return await self.prefetch_balances(
+			addrs,
+			self.rpc_get_balances,
+			session_cache = self.cur_balances,
+			data_root     = self.data_root,
+			data_path     = None,
+			force_rpc     = force_rpc,
+			block         = block)
+
+	async def prefetch_balances(
+			self,
+			addrs,
+			rpc_func,
+			*,
+			session_cache,
+			data_root,
+			data_path,
+			force_rpc,
+			block):
+		ret = {addr: None if force_rpc else self.get_cached_balance(addr, session_cache, data_root)
+			for addr in addrs}
+		if fetch_addrs := [addr for addr, bal in ret.items() if bal is None]:
+			for addr, bal in zip(fetch_addrs, await rpc_func(fetch_addrs, block=block)):
+				if bal is not None:
+					self.cache_balance(
+						addr,
+						bal,
+						session_cache = session_cache,
+						data_root     = data_root,
+						data_path     = data_path,
+						force         = force_rpc)
+				ret[addr] = bal
+		return ret
+
 	def force_write(self):
 		mode_save = self.mode
 		self.mode = 'w'
 		self.write()
 		self.mode = mode_save
 
+	@write_mode
+	def journal_set(self, path, value):
+		"""
+		record a change already made to self.data without rewriting the entire wallet file
+		"""
+		self.journal.append(['set', list(path), value], desc=f'{self.base_desc} data')
+
 	@write_mode
 	def write_changed(self, data, quiet):
 		from ..fileutil import write_data_to_file
+		self.journal.check(desc=f'{self.base_desc} data')
 		write_data_to_file(
 			self.cfg,
 			self.tw_path,
@@ -255,9 +413,13 @@ class TwCtlWithStore(TwCtl, metaclass=AsyncInit):
 			ignore_opt_outdir = True,
 			quiet             = quiet,
 			check_data        = True, # die if wallet has been altered by another program
-			cmp_data          = self.orig_data)
+			cmp_data          = self.orig_data,
+			atomic            = True)
 
 		self.orig_data = data
+		# journaled changes are now in the snapshot, so the journal can go:
+		self.journal = TwStoreJournal(self.journal_path, self.tw_path, data)
+		self.journal.remove()
 
 	def write(self, *, quiet=True):
 		self.cfg._util.dmsg(f'write(): checking if {self.desc} data has changed')
@@ -130,10 +130,11 @@ class TwUnspentOutputs(TwView):
 		block = self.twctl.rpc.get_block_from_minconf(minconf)
 		if self.addrs:
 			wl = [d for d in wl if d['addr'] in self.addrs]
+		bals = await self.twctl.get_balances([d['addr'] for d in wl], block=block)
 		return [{
 				'account': TwLabel(self.proto, d['mmid']+' '+d['comment']),
 				'address': d['addr'],
-				'amt': await self.twctl.get_balance(d['addr'], block=block),
+				'amt': bals[d['addr']],
 				'confirmations': minconf,
 				} for d in wl]
 
@@ -244,13 +245,11 @@ class TwUnspentOutputs(TwView):
 
 	async def set_dates(self, us):
 		if not self.dates_set:
-			# 'blocktime' differs from 'time', is same as getblockheader['time']
-			dates = [o.get('blocktime', 0)
-				for o in await self.rpc.gathered_icall(
-					'gettransaction',
-					[(o.txid, True, False) for o in us])]
-			for idx, o in enumerate(us):
-				o.date = dates[idx]
+			# the date is the block time (tx 'blocktime', same as getblockheader['time'])
+			bc = self.rpc.blockcount + 1
+			times = await self.block_cache.get_times([bc - o.confs for o in us if o.confs])
+			for o in us:
+				o.date = times[bc - o.confs] if o.confs else 0
 			self.dates_set = True
 
 	class sort_action(TwView.sort_action):
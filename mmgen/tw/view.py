@@ -27,7 +27,7 @@ from ..cfg import gv
 from ..objmethods import MMGenObject
 from ..obj import get_obj, MMGenIdx, MMGenList
 from ..color import nocolor, yellow, orange, green, red, blue
-from ..util import msg, msg_r, fmt, die, capfirst, suf, make_timestr, isAsync, is_int
+from ..util import msg, msg_r, fmt, die, capfirst, suf, make_timestr, isAsync, is_int, cached_property
 from ..rpc import rpc_init
 from ..base_obj import AsyncInit
 
@@ -218,6 +218,11 @@ class TwView(MMGenObject, metaclass=AsyncInit):
 			self.key_mappings.update({'h': 'd_addr_view_pref'})
 			self.addr_view_pref = 1 if not self.cfg.cashaddr else not self.proto.cashaddr
 
+	@cached_property
+	def block_cache(self):
+		from .blockcache import TwBlockCache
+		return TwBlockCache(self.cfg, self.proto, self.rpc)
+
 	@property
 	def age_w(self):
 		return self.age_col_params[self.age_fmt][0]
@@ -79,18 +79,20 @@ class TxKeys:
 			tx,
 			*,
 			seedfiles   = None,
+			seeds       = None,
 			keylist     = None,
 			keyaddrlist = None,
 			passwdfile  = None,
 			autosign    = False):
 		self.cfg         = cfg
 		self.tx          = tx
-		self.seedfiles   = seedfiles or pop_seedfiles(cfg)
+		self.seedfiles   = seedfiles or ([] if seeds else pop_seedfiles(cfg))
 		self.keylist     = keylist if autosign else keylist or get_keylist(cfg)
 		self.keyaddrlist = keyaddrlist if autosign else keyaddrlist or get_keyaddrlist(cfg, tx.proto)
 		self.passwdfile  = passwdfile
 		self.autosign    = autosign
-		self.saved_seeds = {}
+		self.saved_seeds = dict(seeds or {})
+		self.supplied_sids = tuple(self.saved_seeds) # not included in the unused Seed ID report
 
 	def get_keys_for_non_mmgen_inputs(self):
 		err_fs = 'ERROR: a key file must be supplied for the following non-{} address{}:{}'
@@ -108,7 +110,7 @@ class TxKeys:
 				kal.add_wifs(self.keylist)
 			if missing := kal.list_missing('sec'):
 				die(2, err_fs.format(gc.proj_name, suf(missing, 'es'), sep + sep.join(missing)))
-			return kal.data
+			return list(kal.data)
 		else:
 			return []
 
@@ -227,9 +229,9 @@ class TxKeys:
 		self.tx.delete_attrs('inputs', 'have_wif')
 		self.tx.delete_attrs('outputs', 'have_wif')
 
+		used_sids = self.tx.get_sids('inputs') + self.tx.get_sids('outputs')
 		if extra_sids := remove_dups(
-				(s for s in self.saved_seeds
-					if s not in self.tx.get_sids('inputs') + self.tx.get_sids('outputs')),
+				(s for s in self.saved_seeds if s not in used_sids and s not in self.supplied_sids),
 				quiet = True):
 			msg('Unused Seed ID{}: {}'.format(suf(extra_sids), ' '.join(extra_sids)))
 
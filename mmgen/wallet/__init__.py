@@ -122,7 +122,8 @@ def Wallet(
 	in_data       = None,
 	ignore_in_fmt = False,
 	in_fmt        = None,
-	passwd_file   = None):
+	passwd_file   = None,
+	params_from   = None):
 
 	in_fmt = in_fmt or cfg.in_fmt
 
@@ -136,6 +137,8 @@ def Wallet(
 		me = _get_me(ss_out or 'mmgen') # default to native wallet format
 		me.seed = seed or Seed(cfg, seed_bin=seed_bin)
 		me.op = 'new'
+		if params_from: # default to passphrase, hash preset and label of another new wallet
+			me.ss_in = params_from
 	elif ss:
 		me = _get_me(ss.type if passchg else (ss_out or 'mmgen'))
 		me.seed = ss.seed
@@ -63,5 +63,11 @@ setup(
 		libraries = ['gmp', 'secp256k1', 'bcrypt'] if sys.platform == 'win32' else ['secp256k1'],
 		include_dirs = ['/usr/local/include'] if sys.platform == 'darwin' else [],
 		library_dirs = ['/usr/local/lib'] if sys.platform == 'darwin' else [],
+	), Extension(
+		name      = 'mmgen.romix',
+		sources   = ['extmod/romixmod.c'],
+	), Extension(
+		name      = 'mmgen.proto.btc.base58',
+		sources   = ['extmod/base58mod.c'],
 	)]
 )
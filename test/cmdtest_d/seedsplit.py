@@ -68,6 +68,12 @@ class CmdTestSeedSplit(CmdTestBase):
 		('ss_3way_C_foobar_master7', '3-way seed split ‘φυβαρ’ with master share #7 (share C)'),
 		('ss_3way_join_foobar_master7', '3-way seed join ‘φυβαρ’ with master share #7'),
 		('ss_3way_join_foobar_master7_mix', '3-way seed join ‘φυβαρ’ with master share #7 (out of order)'),
+		('ss_3way_all_alice',        '3-way seed split ‘alice’ (all shares, parallel)'),
+		('ss_3way_join_all_alice',   '3-way seed join ‘alice’ (all shares)'),
+		('ss_3way_all_bob',          '3-way seed split ‘bob’ (all shares, encrypted)'),
+		('ss_3way_join_all_bob',     '3-way seed join ‘bob’ (all shares, encrypted)'),
+		('ss_3way_all_carol',        '3-way seed split ‘carol’ (all shares, parallel, encrypted, reused params)'),
+		('ss_3way_join_all_carol',   '3-way seed join ‘carol’ (all shares, encrypted)'),
 
 		('ss_3way_join_dfl_bad_invocation', 'bad invocation of ‘mmgen-seedjoin’ - --id-str with non-master join'),
 		('ss_bad_invocation1',       'bad invocation of ‘mmgen-seedsplit’ - no arguments'),
@@ -81,6 +87,8 @@ class CmdTestSeedSplit(CmdTestBase):
 		('ss_bad_invocation9',       'bad invocation of ‘mmgen-seedsplit’ - bad specifier'),
 		('ss_bad_invocation10',      'bad invocation of ‘mmgen-seedsplit’ - nonexistent file'),
 		('ss_bad_invocation11',      'bad invocation of ‘mmgen-seedsplit’ - invalid file extension'),
+		('ss_bad_invocation12',      'bad invocation of ‘mmgen-seedsplit’ - share index with --all-shares'),
+		('ss_bad_invocation13',      'bad invocation of ‘mmgen-seedsplit’ - --keep-passphrase without --all-shares'),
 	)
 
 	def get_tmp_subdir(self, subdir):
@@ -241,6 +249,84 @@ class CmdTestSeedSplit(CmdTestBase):
 		return self.ss_join(self.tdir2, 'seed', ['mmhex', 'bip39'],
 							['-H', self.get_hincog_arg(self.tdir2, '-master7')], master=7, id_str='φυβαρ')
 
+	def ss_3way_all_alice(self):
+		td = self.get_tmp_subdir('3way_all_alice')
+		os.mkdir(td)
+		t = self.spawn('mmgen-seedsplit',
+				['-q', '-d', td, '-r0', '-o', 'mmhex', '--all-shares', '--jobs=2', 'alice:3'])
+		t.passphrase(dfl_wcls.desc, wpasswd)
+		t.expect(r'Processing .*\b1\b of \b3\b of .* id .*‘alice’', regex=True)
+		for _ in range(3):
+			t.written_to_file(capfirst(get_wallet_cls(fmt_code='mmhex').desc))
+		t.expect('3 shares written')
+		return t
+
+	def ss_3way_join_all_alice(self):
+		td = self.get_tmp_subdir('3way_all_alice')
+		t = self.spawn('mmgen-seedjoin',
+				['-d', td, '-o', 'seed'] + sorted(os.path.join(td, fn) for fn in os.listdir(td)))
+		cmp_or_die(self.read_from_tmpfile('dfl.sid'), strip_ansi_escapes(t.expect_getend('Joined Seed ID: ')))
+		t.written_to_file(capfirst(get_wallet_cls(fmt_code='seed').desc))
+		return t
+
+	def ss_3way_all_bob(self):
+		td = self.get_tmp_subdir('3way_all_bob')
+		os.mkdir(td)
+		t = self.spawn('mmgen-seedsplit', ['-q', '-d', td, '-r0', '--all-shares', '--jobs=2', 'bob:3'])
+		t.passphrase(dfl_wcls.desc, wpasswd)
+		# each share gets its own passphrase, with the first share’s hash preset and label as defaults
+		pws = []
+		for n in (1, 2, 3):
+			t.expect(rf'\b{n}\b of \b3\b of .* id .*‘bob’', regex=True)
+			t.hash_preset('new '+dfl_wcls.desc, '1' if n == 1 else '')
+			t.passphrase_new('new '+dfl_wcls.desc, f'{sh1_passwd}{n}')
+			if n == 1:
+				t.label('Bob’s shares')
+			else:
+				t.expect('to reuse the label .*: ', '\n', regex=True)
+			pws.append(os.path.basename(t.written_to_file(capfirst(dfl_wcls.desc))) + f' {sh1_passwd}{n}')
+		t.expect('3 shares written')
+		self.write_to_tmpfile('3way_all_bob.pws', '\n'.join(pws))
+		return t
+
+	def ss_3way_join_all_bob(self):
+		td = self.get_tmp_subdir('3way_all_bob')
+		pws = dict(l.split() for l in self.read_from_tmpfile('3way_all_bob.pws').splitlines())
+		fns = sorted(pws)
+		t = self.spawn('mmgen-seedjoin', ['-d', td, '-o', 'seed'] + [os.path.join(td, fn) for fn in fns])
+		for fn in fns:
+			t.passphrase(dfl_wcls.desc, pws[fn])
+		cmp_or_die(self.read_from_tmpfile('dfl.sid'), strip_ansi_escapes(t.expect_getend('Joined Seed ID: ')))
+		t.written_to_file(capfirst(get_wallet_cls(fmt_code='seed').desc))
+		return t
+
+	def ss_3way_all_carol(self):
+		td = self.get_tmp_subdir('3way_all_carol')
+		os.mkdir(td)
+		t = self.spawn('mmgen-seedsplit', [
+			'-q', '-d', td, '-r0', '--all-shares', '--jobs=2',
+			'--keep-passphrase', '--keep-hash-preset', '--keep-label', 'carol:3'])
+		t.passphrase(dfl_wcls.desc, wpasswd)
+		t.expect(r'Processing .*\b1\b of \b3\b of .* id .*‘carol’', regex=True)
+		# passphrase, hash preset and label of first share are reused for the others
+		t.hash_preset('new '+dfl_wcls.desc, '1')
+		t.passphrase_new('new '+dfl_wcls.desc, sh1_passwd)
+		t.label('Carol’s shares')
+		for _ in range(3):
+			t.written_to_file(capfirst(dfl_wcls.desc))
+		t.expect('3 shares written')
+		return t
+
+	def ss_3way_join_all_carol(self):
+		td = self.get_tmp_subdir('3way_all_carol')
+		fns = sorted(os.path.join(td, fn) for fn in os.listdir(td))
+		t = self.spawn('mmgen-seedjoin', ['-d', td, '-o', 'seed'] + fns)
+		for _ in fns:
+			t.passphrase(dfl_wcls.desc, sh1_passwd)
+		cmp_or_die(self.read_from_tmpfile('dfl.sid'), strip_ansi_escapes(t.expect_getend('Joined Seed ID: ')))
+		t.written_to_file(capfirst(get_wallet_cls(fmt_code='seed').desc))
+		return t
+
 	def ss_bad_invocation(self, cmd, args, exit_val, errmsg):
 		t = self.spawn(cmd, args, exit_val=exit_val)
 		t.expect(errmsg, regex=True)
@@ -297,3 +383,11 @@ class CmdTestSeedSplit(CmdTestBase):
 	def ss_bad_invocation11(self):
 		return self.ss_bad_invocation(
 			'mmgen-seedsplit', [self.tmpdir+'/dfl.sid', '1:2'], 1, 'unrecognized .* extension')
+
+	def ss_bad_invocation12(self):
+		return self.ss_bad_invocation(
+			'mmgen-seedsplit', ['--all-shares', 'a:1:5'], 1, 'USAGE:')
+
+	def ss_bad_invocation13(self):
+		return self.ss_bad_invocation(
+			'mmgen-seedsplit', ['--keep-passphrase', '1:2'], 1, 'require --all-shares')
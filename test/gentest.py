@@ -30,11 +30,14 @@ except ImportError:
 # Import these _after_ local path's been added to sys.path
 from mmgen.cfg import gc, Config
 from mmgen.color import green, red, purple
-from mmgen.util import msg, ymsg, capfirst, is_int, die
+from mmgen.util import msg, ymsg, capfirst, is_int, die, suf
 
 results_file = 'gentest.out.json'
+bench_file = 'gentest.bench.json'
 
 rounds = 100
+bench_threshold = 10
+bench_coins = ('btc', 'ltc', 'bch', 'eth', 'etc', 'zec', 'xmr')
 opts_data = {
 	'text': {
 		'desc': 'Test key/address generation of the MMGen suite in various ways',
@@ -43,12 +46,22 @@ opts_data = {
 -h, --help         Print this help message
 --, --longhelp     Print help message for long (global) options
 -a, --all-coins    Test all coins supported by specified external tool
+                   (Bench test: all coins with built-in key generators)
+-b, --batch-size=n Speed and Bench tests: generate public keys and addresses
+                   in batches of 'n' using the key and address generators'
+                   batch APIs
+-C, --compare=f    Bench test: compare results with those saved in file 'f',
+                   reporting regressions
 -k, --use-internal-keccak-module Force use of the internal keccak module
+-o, --outfile=f    Bench test: save results in JSON format to file 'f'
+                   (default: {bf!r})
 -q, --quiet        Produce quieter output
 -s, --save-results Save output of external tool in Compare test to
                    {rf!r}
 -t, --type=t       Specify address type (e.g. 'compressed', 'segwit',
                    'zcash_z', 'bech32')
+-T, --threshold=n  Bench test: report a regression if the speed of a stage
+                   drops by more than 'n' percent (default: {th})
 -v, --verbose      Produce more verbose output
 """,
 	'notes': """
@@ -57,6 +70,7 @@ TEST TYPES:
   Compare: {prog} A:B <rounds>  (compare address generators A and B)
   Speed:   {prog} A <rounds>    (test speed of generator A)
   Dump:    {prog} A <dump file> (compare generator A to wallet dump)
+  Bench:   {prog} bench <rounds> (benchmark all generators)
 
   where:
 
@@ -90,6 +104,11 @@ EXAMPLES:
   external tool, 10 rounds + edge cases:
   $ {prog} --coin=xmr 3:ext 10
 
+  Compare the speed of single and batch address generation for 100,000 Bech32
+  addresses:
+  $ {prog} --type=bech32 1 100000
+  $ {prog} --type=bech32 --batch-size=1000 1 100000
+
   Test the speed of default Monero 'nacl' backend, 10,000 rounds:
   $ test/gentest.py --coin=xmr 1 10000
 
@@ -104,6 +123,15 @@ EXAMPLES:
   + edge cases:
   $ test/gentest.py --coin=xmr 1:2 10000
 
+  Benchmark key derivation, public key generation and address generation
+  separately for all coins, address types and keygen backends, 1,000 rounds,
+  saving the results and comparing them with those of an earlier run:
+  $ test/gentest.py --all-coins --outfile=new.json --compare=old.json bench 1000
+
+  The Bench test times the stages for each coin, address type and backend.
+  The results are saved together with information about the machine.  When
+  comparing, only entries present in both result sets are compared.
+
 SUPPORTED EXTERNAL TOOLS:
 
   + eth-keys (for ETH, ETC)
@@ -129,6 +157,8 @@ SUPPORTED EXTERNAL TOOLS:
 	'code': {
 		'options': lambda s: s.format(
 			rf   = results_file,
+			bf   = bench_file,
+			th   = bench_threshold,
 		),
 		'notes': lambda s: s.format(
 			prog = 'test/gentest.py',
@@ -428,26 +458,44 @@ def ab_test(proto, scfg):
 				cache_data = False)
 
 def speed_test(proto, kg, ag, rounds):
-	qmsg(green('Testing speed of address generator {!r} for coin {}'.format(
+	qmsg(green('Testing speed of address generator {!r} for coin {}{}'.format(
 		type(kg).__name__,
-		proto.coin)))
+		proto.coin,
+		f' (batch size {batch_size})' if batch_size else '')))
 	from struct import pack
 	seed = getrand(28)
 	qmsg('Incrementing key with each round')
 	qmsg('Starting key: {}'.format((seed + pack('I', 0)).hex()))
 	start = last_t = time.time()
 
-	for i in range(rounds):
-		if time.time() - last_t >= 0.1:
-			qmsg_r(f'\rRound {i+1}/{rounds} ')
-			last_t = time.time()
-		sec = PrivKey(proto, seed+pack('I', i), compressed=ag.compressed, pubkey_type=ag.pubkey_type)
-		addr = ag.to_addr(kg.gen_data(sec))
-		vmsg(f'\nkey:  {sec.wif}\naddr: {addr}\n')
+	def get_sec(i):
+		return PrivKey(proto, seed+pack('I', i), compressed=ag.compressed, pubkey_type=ag.pubkey_type)
+
+	if batch_size:
+		for i in range(0, rounds, batch_size):
+			if time.time() - last_t >= 0.1:
+				qmsg_r(f'\rRound {i+1}/{rounds} ')
+				last_t = time.time()
+			secs = [get_sec(j) for j in range(i, min(i + batch_size, rounds))]
+			addrs = ag.to_addrs(kg.gen_data_batch(secs))
+			if cfg.verbose:
+				for sec, addr in zip(secs, addrs):
+					vmsg(f'\nkey:  {sec.wif}\naddr: {addr}\n')
+		i = rounds - 1
+	else:
+		for i in range(rounds):
+			if time.time() - last_t >= 0.1:
+				qmsg_r(f'\rRound {i+1}/{rounds} ')
+				last_t = time.time()
+			sec = get_sec(i)
+			addr = ag.to_addr(kg.gen_data(sec))
+			vmsg(f'\nkey:  {sec.wif}\naddr: {addr}\n')
+
+	elapsed = time.time() - start
 	qmsg(
 		f'\rRound {i+1}/{rounds} ' +
 		f'\n{rounds} addresses generated' +
-		('' if cfg.test_suite_deterministic else f' in {time.time()-start:.2f} seconds')
+		('' if cfg.test_suite_deterministic else f' in {elapsed:.2f} seconds ({rounds/elapsed:.0f}/s)')
 	)
 
 def dump_test(proto, kg, ag, filename):
@@ -476,6 +524,133 @@ def dump_test(proto, kg, ag, filename):
 
 	qmsg(green(('\n', '')[bool(cfg.verbose)] + 'OK'))
 
+def get_machine_info():
+	import platform
+	return {
+		'date':      time.strftime('%Y-%m-%d %H:%M:%S UTC', time.gmtime()),
+		'platform':  platform.platform(),
+		'machine':   platform.machine(),
+		'processor': platform.processor(),
+		'cpu_count': os.cpu_count(),
+		'python':    platform.python_version(),
+		'version':   gc.version}
+
+def get_bench_combos(proto):
+
+	for coin in (bench_coins if cfg.all_coins else [proto.coin.lower()]):
+		if coin in ('eth', 'etc', 'xmr'):
+			from mmgen.util2 import load_cryptodome
+			load_cryptodome()
+		p = init_proto(cfg, coin, testnet=proto.testnet)
+		for mmtype in p.mmtypes:
+			addr_type = MMGenAddrType(p, mmtype)
+			if cfg.type and cfg.type not in (addr_type, addr_type.name):
+				continue
+			for n, backend in enumerate(get_backends(addr_type.pubkey_type), 1):
+				yield (p, addr_type, n, backend)
+
+def bench_one(proto, addr_type, backend_num, backend, rounds):
+	"""
+	time the derivation, keygen and addrgen stages for one coin, address type and
+	keygen backend, returning a dict of stage timings
+	"""
+	from mmgen.derive import derive_coin_privkey_bytes
+	from mmgen.addrlist import AddrIdxList
+
+	kg = KeyGenerator(cfg, proto, addr_type.pubkey_type, backend=backend_num, silent=True)
+	if type(kg).__name__ != backend.replace('-', '_'):
+		raise ValueError(f'backend unavailable (fell back to {type(kg).__name__!r})')
+	ag = AddrGenerator(cfg, proto, addr_type)
+
+	def do_batches(func, batch_func, data):
+		if batch_size:
+			return [e for i in range(0, len(data), batch_size) for e in batch_func(data[i:i+batch_size])]
+		else:
+			return [func(e) for e in data]
+
+	ret = {}
+
+	def timed(stage, func, *args):
+		start = time.perf_counter()
+		res = func(*args)
+		elapsed = time.perf_counter() - start
+		ret[stage] = {'seconds': round(elapsed, 6), 'per_sec': round(rounds / elapsed, 1)}
+		return res
+
+	secs = timed(
+		'derive',
+		lambda: [
+			PrivKey(proto, e.data, compressed=addr_type.compressed, pubkey_type=addr_type.pubkey_type)
+				for e in derive_coin_privkey_bytes(getrand(32), AddrIdxList(fmt_str=f'1-{rounds}'))])
+	datas = timed('keygen', do_batches, kg.gen_data, kg.gen_data_batch, secs)
+	timed('addrgen', do_batches, ag.to_addr, ag.to_addrs, datas)
+
+	return ret
+
+bench_stages = ('derive', 'keygen', 'addrgen')
+
+def bench_test(proto, rounds):
+
+	qmsg(green(f'Benchmarking key/address generation, {rounds} rounds' + (
+		f', batch size {batch_size}' if batch_size else '')))
+
+	results = {}
+	for p, addr_type, n, backend in get_bench_combos(proto):
+		key = f'{p.coin}:{addr_type.name}:{backend}'
+		try:
+			results[key] = bench_one(p, addr_type, n, backend, rounds)
+		except Exception as e:
+			ymsg(f'Skipping {key}: {e}')
+
+	fs = '{:32} {:>10} {:>10} {:>10}'
+	msg(fs.format('Generator', *(f'{s}/s' for s in bench_stages)))
+	for key, data in results.items():
+		msg(fs.format(key, *(f'{data[s]["per_sec"]:.0f}' for s in bench_stages)))
+
+	import json
+	fn = cfg.outfile or bench_file
+	with open(fn, 'w') as fp:
+		fp.write(json.dumps({
+			'machine':    get_machine_info(),
+			'rounds':     rounds,
+			'batch_size': batch_size,
+			'results':    results}, indent=4) + '\n')
+	qmsg(f'Results saved to {fn!r}')
+
+	if cfg.compare:
+		with open(cfg.compare) as fp:
+			baseline = json.load(fp)
+		if (baseline['rounds'], baseline['batch_size']) != (rounds, batch_size):
+			ymsg('Warning: baseline results were obtained with a different round count or batch size')
+		bench_compare(baseline, results)
+
+def bench_compare(baseline, results):
+
+	threshold = int(cfg.threshold or bench_threshold)
+	m = baseline['machine']
+	qmsg(green(f'Comparing with results from {cfg.compare!r}') + f' ({m["date"]}, {m["platform"]})')
+	fs = '{:32} {:8} {:>10} {:>10} {:>8}'
+	msg(fs.format('Generator', 'Stage', 'Old/s', 'New/s', 'Change'))
+
+	regressions = 0
+	for key, data in results.items():
+		if key not in baseline['results']:
+			continue
+		for stage in bench_stages:
+			old = baseline['results'][key][stage]['per_sec']
+			new = data[stage]['per_sec']
+			change = (new - old) / old * 100
+			line = fs.format(key, stage, f'{old:.0f}', f'{new:.0f}', f'{change:+.1f}%')
+			if change < -threshold:
+				regressions += 1
+				msg(red(line + '  REGRESSION'))
+			else:
+				msg(line)
+
+	if regressions:
+		die(1, f'{regressions} regression{suf(regressions)} found (threshold {threshold}%)')
+	qmsg(green('No regressions found'))
+
 def get_protos(proto, addr_type, toolname):
 
 	init_genonly_altcoins(testnet=proto.testnet)
@@ -493,6 +668,8 @@ def parse_args():
 	all_backends, gen2, tool = (False, None, None)
 
 	match cfg._args:
+		case ('bench', rounds) if is_int(rounds):
+			test, gen1, dumpfile = ('bench', None, None)
 		case (gen1, rounds) if is_int(gen1) and is_int(rounds):
 			test, dumpfile = ('speed', None)
 		case (gen1, dumpfile) if is_int(gen1) and os.access(dumpfile, os.R_OK):
@@ -539,6 +716,8 @@ def main():
 	addr_type = MMGenAddrType(proto=proto, id_str=cfg.type or proto.dfl_mmtype)
 
 	match scfg.test:
+		case 'bench':
+			bench_test(proto, scfg.rounds)
 		case 'ab':
 			protos = get_protos(proto, addr_type, scfg.tool) if cfg.all_coins else [proto]
 			for p in protos:
@@ -582,6 +761,14 @@ vmsg = cfg._util.vmsg
 
 proto = cfg._proto
 
+if cfg.batch_size and not (is_int(cfg.batch_size) and int(cfg.batch_size) > 0):
+	die(1, f'{cfg.batch_size!r}: invalid parameter for --batch-size (must be a positive integer)')
+
+batch_size = int(cfg.batch_size or 0)
+
+if cfg.threshold and not is_int(cfg.threshold):
+	die(1, f'{cfg.threshold!r}: invalid parameter for --threshold (must be a non-negative integer)')
+
 if proto.coin in ('ETH', 'ETC', 'XMR'):
 	from mmgen.util2 import load_cryptodome
 	load_cryptodome()
@@ -8,7 +8,7 @@ from mmgen.color import blue
 from mmgen.util import msg
 
 from mmgen.seed import Seed
-from mmgen.addr import MMGenAddrType
+from mmgen.addr import MMGenAddrType, AddrIdx
 from mmgen.addrlist import AddrIdxList, AddrList, KeyList, KeyAddrList, ViewKeyAddrList
 from mmgen.passwdlist import PasswordList
 from mmgen.protocol import init_proto
@@ -91,6 +91,336 @@ class unit_tests:
 
 		return True
 
+	def checkpoints(self, name, ut):
+		import os
+		from mmgen.cfg import Config
+		from mmgen.derive import DeriveCheckpoints, derive_coin_privkey_bytes
+		ck_cfg = Config({'derive_checkpoint_interval': 100, 'test_suite': True})
+		seed = bytes.fromhex('deadbeef' * 8)
+		idxs = AddrIdxList(fmt_str='3,99-101,250,777,1000')
+		ref = list(derive_coin_privkey_bytes(seed, idxs))
+
+		ck = DeriveCheckpoints(ck_cfg, seed, 'C')
+		if os.path.exists(ck.path):
+			os.unlink(ck.path)
+			ck = DeriveCheckpoints(ck_cfg, seed, 'C')
+		assert list(derive_coin_privkey_bytes(seed, idxs, checkpoints=ck)) == ref
+		assert sorted(ck.states) == list(range(100, 1001, 100)), sorted(ck.states)
+		ck.save()
+
+		ck = DeriveCheckpoints(ck_cfg, seed, 'C') # reload from disk
+		assert len(ck.states) == 10
+		assert list(derive_coin_privkey_bytes(seed, idxs, checkpoints=ck)) == ref
+		assert not ck.changed
+		vmsg(f'  Checkpoint file: {ck.path}')
+
+		# encrypted with a key derived from the seed: a different seed can’t read it
+		ck2 = DeriveCheckpoints(ck_cfg, bytes.fromhex('deadbeef' * 7 + 'deadbeee'), 'C')
+		assert ck2.path != ck.path and not ck2.states
+		os.unlink(ck.path)
+
+		proto = init_proto(ck_cfg, 'btc')
+		al_seed = Seed(ck_cfg, seed_bin=bytes.fromhex('feedbead'*8))
+		for _ in range(2): # second pass resumes from saved checkpoints
+			al = AddrList(
+				ck_cfg,
+				proto,
+				seed      = al_seed,
+				addr_idxs = AddrIdxList(fmt_str='199999,99-101,77-78,7,3,2-9'),
+				mmtype    = MMGenAddrType(proto, 'C'),
+				skip_chksum_msg = True)
+			assert al.chksum == '88FA B04B A380 C1CB', al.chksum
+		import shutil
+		shutil.rmtree(os.path.dirname(ck.path))
+		return True
+
+	def jobs(self, name, ut):
+		from mmgen.cfg import Config
+		mp_cfg = Config({'jobs': 3, 'test_suite': True})
+		seed = Seed(cfg, seed_bin=bytes.fromhex('feedbead'*8))
+		idxs = AddrIdxList(fmt_str=f'1-{AddrList.mproc_min_addrs+10},1000')
+		for list_type, coin, addrtype, add_kwargs in (
+				(AddrList,        'btc', 'C', {}),
+				(KeyAddrList,     'btc', 'S', {'add_p2pkh': True}),
+				(KeyAddrList,     'ltc', 'B', {}),
+				(KeyAddrList,     'eth', 'E', {}),
+				(KeyAddrList,     'zec', 'Z', {}),
+				(ViewKeyAddrList, 'xmr', 'M', {})):
+			proto = init_proto(cfg, coin)
+			vmsg(f'  {list_type.__name__} {proto.coin}:{addrtype}')
+			def gen(c):
+				return list_type(
+					c,
+					proto,
+					seed      = seed,
+					addr_idxs = idxs,
+					mmtype    = MMGenAddrType(proto, addrtype),
+					skip_chksum_msg = True,
+					**add_kwargs)
+			al_ref, al_mp = gen(cfg), gen(mp_cfg)
+			assert al_mp.chksum == al_ref.chksum, f'{al_mp.chksum} != {al_ref.chksum}'
+			assert [e._asdict() for e in al_mp.data] == [e._asdict() for e in al_ref.data]
+			assert al_mp.data[-1].addr.proto is proto
+		return True
+
+	def data(self, name, ut):
+		from mmgen.addrlist import AddrListData, AddrListEntry, _IdxColumn, _KeyColumn, _AddrColumn, _ObjColumn
+		seed = Seed(cfg, seed_bin=bytes.fromhex('feedbead'*8))
+
+		def check_equal(a, b):
+			assert a._asdict() == b._asdict(), f'{a._asdict()} != {b._asdict()}'
+			for k, v in a._asdict().items():
+				assert type(v) is type(b._asdict()[k])
+				assert getattr(v, '__dict__', None) == getattr(b._asdict()[k], '__dict__', None), k
+
+		for coin, addrtype, col_types in (
+				('btc', 'C', (_IdxColumn, _KeyColumn, _AddrColumn)),
+				('btc', 'B', (_IdxColumn, _KeyColumn, _AddrColumn)),
+				('bch', 'C', (_IdxColumn, _KeyColumn, _ObjColumn))): # multi-view addresses stored as-is
+			proto = init_proto(cfg, coin)
+			vmsg(f'  {proto.coin}:{addrtype}')
+			al = KeyAddrList(
+				cfg,
+				proto,
+				seed      = seed,
+				addr_idxs = AddrIdxList(fmt_str='1-5,77'),
+				mmtype    = MMGenAddrType(proto, addrtype),
+				skip_chksum_msg = True)
+			d = al.data
+			assert tuple(type(d.columns[k]) for k in ('idx', 'sec', 'addr')) == col_types, d.columns
+			assert len(d) == 6 and d[-1].idx == 77 and [e.idx for e in d[1:3]] == [2, 3]
+
+			# entries are reconstructed with all attributes intact
+			ref = [type(e)(proto, **e._asdict()) for e in d]
+			for a, b in zip(d, ref):
+				check_equal(a, b)
+			for a, b in zip(AddrListData(ref), d):
+				check_equal(a, b)
+
+			# changes to entry attributes are written back to the list
+			e = d[3]
+			e.comment = 'foo'
+			assert d[3].comment == 'foo' and d[2].comment is None
+			assert [r.comment for r in d.iter_rows()] == [None, None, None, 'foo', None, None]
+
+			# a value with no compact representation converts the column
+			wide = '漢字'
+			d[0].comment = wide
+			assert type(d.columns['comment']) is _ObjColumn
+			assert d[0].comment.screen_width == 4 and d[3].comment == 'foo'
+			check_equal(d[5], ref[5])
+
+		# an empty list has a usable entry type
+		d = AddrListData([])
+		assert d.entry_type is AddrListEntry and len(d) == 0 and list(d.iter_rows()) == []
+		d.append(AddrListEntry(proto=proto, idx=1))
+		assert d[0].idx == 1
+
+		# default WIF validation for keys initialized from bytes
+		from mmgen.key import PrivKey, is_wif
+		proto = init_proto(cfg, 'btc')
+		for check_wif in (True, False):
+			k = PrivKey(proto, bytes.fromhex('ab'*32), compressed=True, pubkey_type='std', check_wif=check_wif)
+			assert is_wif(proto, k.wif), k.wif
+
+		return True
+
+	def lookup(self, name, ut):
+		from mmgen.addrdata import AddrData
+		proto = init_proto(cfg, 'btc')
+		seed = Seed(cfg, seed_bin=bytes.fromhex('feedbead'*8))
+		al = AddrList(
+			cfg,
+			proto,
+			seed      = seed,
+			addr_idxs = AddrIdxList(fmt_str='1-20,500'),
+			mmtype    = MMGenAddrType(proto, 'C'),
+			skip_chksum_msg = True)
+		ref = {e.idx: e.addr for e in al.data}
+
+		assert al.entry(500).addr == al.coinaddr(500) == ref[500]
+		assert al.entry(21) is None and al.coinaddr(21) is None and al.comment(7) is None
+
+		# indexes are kept in sync with changes to the list
+		al.set_comment(7, 'seven')
+		al.data.add(idx=AddrIdx(600), addr=ref[1])
+		assert al.comment(7) == 'seven' and al.coinaddr(600) == ref[1]
+		d = al.make_reverse_dict_addrlist([ref[3], ref[7], 'foo'])
+		assert list(d) == [ref[3], ref[7]], d
+		assert d[ref[7]] == (f'{al.al_id}:7', 'seven')
+		assert d[ref[3]][0] == f'{al.al_id}:3' # first row wins for duplicate addresses
+		assert al.make_reverse_dict_addrlist([ref[1]])[ref[1]][0] == f'{al.al_id}:1'
+
+		ad = AddrData(proto)
+		ad.add(al)
+		sid = al.al_id.sid
+		assert ad.mmaddrs2coinaddrs([f'{sid}:C:5', f'{sid}:C:21', f'{sid}:S:5', f'{sid}:C:500']) == [
+			ref[5], None, None, ref[500]]
+		assert ad.mmaddr2coinaddr(f'{sid}:C:5') == ref[5]
+		assert ad.coinaddrs2mmaddrs([ref[500], 'foo', ref[2]]) == [f'{al.al_id}:500', None, f'{al.al_id}:2']
+		assert ad.coinaddr2mmaddr(ref[2]) == f'{al.al_id}:2'
+		return True
+
+	def stream(self, name, ut):
+		import os, tempfile
+		from mmgen.cfg import Config
+		seed = Seed(cfg, seed_bin=bytes.fromhex('feedbead'*8))
+		idxs = AddrIdxList(fmt_str='1-300,302,999')
+		with tempfile.TemporaryDirectory() as outdir:
+			s_cfg = Config({'test_suite': True, 'quiet': True, 'yes': True, 'outdir': outdir})
+			for list_type, coin, kwargs in (
+					(AddrList,        'btc', {'mmtype': 'C', 'addr_idxs': idxs}),
+					(KeyAddrList,     'btc', {'mmtype': 'S', 'addr_idxs': idxs}),
+					(ViewKeyAddrList, 'xmr', {'mmtype': 'M', 'addr_idxs': idxs}),
+					(PasswordList,    'btc', {'pw_idxs': idxs, 'pw_id_str': 'foo', 'pw_fmt': 'bip39'})):
+				proto = init_proto(cfg, coin)
+				vmsg(f'  {list_type.__name__} {proto.coin}')
+				if 'mmtype' in kwargs:
+					kwargs['mmtype'] = MMGenAddrType(proto, kwargs['mmtype'])
+				ref = list_type(s_cfg, proto, seed=seed, skip_chksum_msg=True, **kwargs)
+				ref.file.format()
+
+				# stream entries from generator to file
+				al = list_type(s_cfg, proto, seed=seed, skip_chksum_msg=True, stream=True, **kwargs)
+				assert not al.data and al.chksum is None and al.id_str == ref.id_str
+				al.file.write()
+				fn = os.path.join(outdir, al.file.filename)
+				with open(fn) as fp:
+					assert fp.read() == ref.file.fmt_data
+				assert al.chksum == ref.chksum
+				# secret data is formatted in memory rather than spooled to a temporary file
+				assert bool(al.file.fmt_data) == al.file.has_secrets == (list_type is not AddrList)
+
+				# stream entries from file
+				kw = {} if list_type is PasswordList else {'key_address_validity_check': True}
+				al = list_type(s_cfg, proto, infile=fn, skip_chksum_msg=True, stream=True, **kw)
+				assert al.id_str is None
+				assert [e.idx for e in al.iter_entries()] == list(idxs)
+				assert (al.chksum, al.id_str, al.num_addrs) == (ref.chksum, ref.id_str, len(idxs))
+
+			# input size limit applies to non-streamed reads only
+			lim_cfg = Config({'test_suite': True, 'quiet': True, 'max_input_size': 1000})
+			al = list_type(lim_cfg, proto, infile=fn, skip_chksum_msg=True, stream=True)
+			assert al.al_id.sid == seed.sid
+			ut.process_bad_data((
+				('max_input_size', 'MaxInputSizeExceeded', 'Max input data size',
+					lambda: list_type(lim_cfg, proto, infile=fn, skip_chksum_msg=True)),
+			), pfx='')
+		return True
+
+	def addr_cache(self, name, ut):
+		import json
+		from mmgen.cfg import Config
+		from mmgen.addrcache import AddrCache
+		c_cfg = Config({'addr_cache': True, 'test_suite': True, 'quiet': True})
+		seed = Seed(cfg, seed_bin=bytes.fromhex('feedbead'*8))
+		AddrCache.clear(c_cfg, sid=seed.sid)
+
+		for coin, addrtype in (('btc', 'C'), ('btc', 'B'), ('bch', 'C'), ('eth', 'E')):
+			proto = init_proto(cfg, coin)
+			vmsg(f'  {proto.coin}:{addrtype}')
+			def gen(c, idx_spec):
+				return AddrList(
+					c,
+					proto,
+					seed      = seed,
+					addr_idxs = AddrIdxList(fmt_str=idx_spec),
+					mmtype    = MMGenAddrType(proto, addrtype),
+					skip_chksum_msg = True)
+			ref = gen(cfg, '1-20,500')
+			for idx_spec in ('3-10', '1-20,500', '1-20,500'): # partial, then complete cache hits
+				al = gen(c_cfg, idx_spec)
+				assert al.chksum == gen(cfg, idx_spec).chksum
+			assert [e.addr for e in al.data] == [e.addr for e in ref.data]
+			assert al.data[0].sec is None # no keys in cached lists
+
+			cache = AddrCache(c_cfg, proto, al.al_id, al.scramble_seed(seed.data))
+			assert len(cache.addrs) == 21
+			assert cache.chksum == ref.chksum
+
+			# a modified cache is discarded
+			with open(cache.path) as fp:
+				d = json.load(fp)
+			d['addrs']['5'] = d['addrs']['6']
+			with open(cache.path, 'w') as fp:
+				json.dump(d, fp)
+			assert not AddrCache(c_cfg, proto, al.al_id, al.scramble_seed(seed.data)).addrs
+			assert gen(c_cfg, '1-20,500').chksum == ref.chksum
+
+		# the address view is part of the cache key
+		vmsg('  BCH:C (legacy)')
+		def gen_bch(c):
+			return AddrList(
+				c,
+				init_proto(c, 'bch'),
+				seed      = seed,
+				addr_idxs = AddrIdxList(fmt_str='1-20,500'),
+				skip_chksum_msg = True)
+		l_cfg = Config({'addr_cache': True, 'cashaddr': False, 'test_suite': True, 'quiet': True})
+		ref = gen_bch(Config({'cashaddr': False, 'test_suite': True, 'quiet': True}))
+		assert ref.data[0].addr.view_pref == 1
+		assert ref.chksum != gen_bch(c_cfg).chksum # cached cashaddr list
+		for _ in range(2): # uncached, then cached
+			al = gen_bch(l_cfg)
+			assert al.chksum == ref.chksum
+			assert [e.addr.view_pref for e in al.data] == [1] * 21
+
+		assert len(AddrCache.clear(c_cfg, sid=seed.sid)) == 6
+		return True
+
+	def verify_keys(self, name, ut):
+		import os, tempfile
+		from mmgen.cfg import Config
+		from mmgen.exception import MMGenError
+		from mmgen.addrfile import get_key_sample_size
+
+		assert get_key_sample_size(1000, 0.99) == 370
+		assert get_key_sample_size(100000, 0.99) == 460
+		assert get_key_sample_size(50, 0.99) == 50
+		assert get_key_sample_size(10, 0.5) == 5
+
+		seed = Seed(cfg, seed_bin=bytes.fromhex('feedbead'*8))
+		proto = init_proto(cfg, 'btc')
+		with tempfile.TemporaryDirectory() as outdir:
+			k_cfg = Config({'test_suite': True, 'quiet': True, 'outdir': outdir})
+			kal = KeyAddrList(
+				k_cfg,
+				proto,
+				seed            = seed,
+				addr_idxs       = AddrIdxList(fmt_str='1-500'),
+				mmtype          = MMGenAddrType(proto, 'C'),
+				skip_chksum_msg = True)
+			kal.file.write()
+			fn = os.path.join(outdir, kal.file.filename)
+			with open(fn) as fp:
+				text = fp.read()
+			bad_fn = os.path.join(outdir, 'bad.akeys')
+			with open(bad_fn, 'w') as fp: # swap the keys of entries 300 and 301
+				fp.write(text.replace(kal.data[299].sec.wif, 'FOO').replace(
+					kal.data[300].sec.wif, kal.data[299].sec.wif).replace('FOO', kal.data[300].sec.wif))
+
+			for opts in ({}, {'jobs': 2}, {'key_verify_confidence': 99}, {'jobs': 2, 'key_verify_confidence': 99}):
+				vmsg(f'  {opts}')
+				v_cfg = Config({'test_suite': True, 'quiet': True} | opts)
+				al = KeyAddrList(v_cfg, proto, infile=fn, skip_chksum_msg=True, key_address_validity_check=True)
+				assert al.chksum == kal.chksum
+				if not opts.get('key_verify_confidence'):
+					try:
+						KeyAddrList(v_cfg, proto, infile=bad_fn, skip_chksum_msg=True, key_address_validity_check=True)
+					except MMGenError as e:
+						assert 'Key doesn’t match address' in str(e), str(e)
+					else:
+						raise AssertionError('bad key not detected')
+
+			try:
+				al = KeyAddrList(k_cfg, proto, infile=bad_fn, stream=True, key_address_validity_check=True)
+				list(al.iter_entries())
+			except MMGenError as e:
+				assert 'Key doesn’t match address' in str(e), str(e)
+			else:
+				raise AssertionError('bad key not detected in streaming mode')
+		return True
+
 	def addr(self, name, ut):
 		return (
 			do_test(AddrList, 'BCE8 082C 0973 A525', '1-3') and
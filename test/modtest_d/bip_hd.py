@@ -6,7 +6,7 @@ test.modtest_d.bip_hd: bip_hd unit test for the MMGen suite
 
 from mmgen.color import gray, pink, blue
 from mmgen.util import fmt
-from mmgen.bip_hd import Bip32ExtendedKey, BipHDConfig, BipHDNode, MasterNode, get_chain_params
+from mmgen.bip_hd import Bip32ExtendedKey, BipHDConfig, BipHDNode, MasterNode, get_chain_params, parse_version_bytes
 
 from ..include.common import cfg, vmsg
 
@@ -186,6 +186,19 @@ class unit_tests:
 			assert res.addr_cls == addr_cls
 			vmsg(f'  {res}')
 		vmsg('')
+		for vb_hex, bipnum, chain in (
+				('0488b21e', None, '-'),
+				('049d7cb2', 49,   'BTC'),
+				('04b2430c', 84,   'BTC'),
+				('043587cf', 86,   'BTC'),
+				('02fac398', 49,   'DOGE'),
+				('0f4331d4', 44,   'ADA'),
+			):
+			res = parse_version_bytes(vb_hex)
+			assert res[0] == bipnum, res[0]
+			assert res[1].chain == chain, res[1].chain
+			vmsg(f'  {vb_hex}: {res}')
+		vmsg('')
 		return True
 
 	def derive(self, name, ut):
@@ -276,6 +289,140 @@ class unit_tests:
 
 		return True
 
+	def derive_range(self, name, ut):
+		from mmgen.bip_hd import BipHDNodeCache
+
+		m = MasterNode(cfg, self._seed)
+		for addr_type in ('bech32', 'compressed', 'legacy'):
+			vmsg(f'  {addr_type}')
+			chain_prv = m.to_chain(idx=0, coin='btc', addr_type=addr_type)
+			chain_pub = m.to_chain(idx=0, coin='btc', addr_type=addr_type, public=True)
+			for chain, public in ((chain_prv, False), (chain_prv, True), (chain_pub, True)):
+				res = chain.derive_range(5, 20, public=public)
+				assert [e.idx for e in res] == list(range(5, 25))
+				for e in (res[0], res[7], res[-1]):
+					ref = chain.derive(e.idx, hardened=False, public=public)
+					assert (e.address, e.xpub, e.par_print) == (ref.address, ref.xpub, ref.par_print)
+					if not public:
+						assert e.xprv == ref.xprv
+			if addr_type == 'bech32':
+				assert [e.address for e in chain_pub.derive_range(0, 3, public=True)] == list(vectors_derive['bech32'].values())
+				ref_addrs = [e.address for e in chain_pub.derive_range(0, 9, public=True)]
+
+		# nodes on a path are cached, so derivation of a sibling path reuses the parent
+		node_cache = BipHDNodeCache()
+		path = "m/84'/0'/0'/0"
+		a = BipHDNode.from_path(cfg, self._seed, path + '/7', addr_type='bech32', node_cache=node_cache)
+		assert len(node_cache) == 5
+		b = BipHDNode.from_path(cfg, self._seed, path + '/8', addr_type='bech32', node_cache=node_cache)
+		assert len(node_cache) == 6
+		c = BipHDNode.from_path(cfg, self._seed, path + '/7', addr_type='bech32', node_cache=node_cache)
+		assert c is not a and (c.xprv, c.address) == (a.xprv, a.address)
+		assert (a.address, b.address) == (ref_addrs[7], ref_addrs[8])
+		d = BipHDNode.from_path(cfg, self._seed, path + '/2', addr_type='bech32')
+		assert len(node_cache) == 6 and d.address == ref_addrs[2]
+		node_cache.clear()
+		assert not node_cache
+		return True
+
+	def addr_discovery(self, name, ut):
+		import os, asyncio
+		from collections import namedtuple
+		from tempfile import TemporaryDirectory
+		from mmgen.cfg import Config
+		from mmgen.protocol import init_proto
+		from mmgen.addr import CoinAddr
+		from mmgen.proto.btc.tx.base import addr2scriptPubKey
+		from mmgen.proto.btc.addrdiscovery import BipHDAddrDiscovery
+		from mmgen.tool.rpc import tool_cmd
+		from ..include.common import silence, end_silence
+
+		class ScanStandIn:
+			"""
+			stand-in for a coin daemon’s ‘scantxoutset’ call, optionally failing on call ‘fail_on’
+			"""
+			backend = namedtuple('backend', ['name'])('stand-in')
+
+			def __init__(self, funded, fail_on=None):
+				self.funded = funded
+				self.fail_on = fail_on
+				self.scans = []
+
+			async def call(self, method, action, descs=None, timeout=None):
+				assert method == 'scantxoutset'
+				if action == 'status':
+					return None
+				if len(self.scans) + 1 == self.fail_on:
+					raise ConnectionError('connection lost')
+				addrs = [d[5:-1] for d in descs] # addr(...)
+				self.scans.append(len(addrs))
+				return {
+					'success': True,
+					'unspents': [
+						{'scriptPubKey': addr2scriptPubKey(proto, CoinAddr(proto, a)), 'amount': amt}
+							for a in addrs if a in self.funded for amt in self.funded[a]]}
+
+		xpub = BipHDNode.from_path(cfg, self._seed, "m/84'/0'/0'", addr_type='bech32').xpub
+		chains = [BipHDNode.from_extended_key(cfg, 'btc', xpub).derive(n, hardened=False, public=True)
+			for n in (0, 1)]
+		def addr(chain, idx):
+			return chains[chain].derive(idx, hardened=False, public=True).address
+
+		# gap limit 5, batch size 3: receive address 9 lies beyond the gap following address 2
+		funded = {addr(0, 2): ['0.1', '0.2'], addr(0, 9): ['1'], addr(1, 4): ['0.05']}
+		chk = [(0, 2, addr(0, 2), '0.3'), (1, 4, addr(1, 4), '0.05')]
+
+		def discover(d_cfg, rpc):
+			return asyncio.run(
+				BipHDAddrDiscovery(d_cfg, proto, rpc, xpub, gap_limit=5, batch_size=3).run())
+
+		with TemporaryDirectory() as data_dir:
+			d_cfg = Config({'data_dir': data_dir, 'test_suite': True})
+			proto = init_proto(d_cfg, 'btc', need_amt=True)
+
+			vmsg('  Gap-limit termination on both chains')
+			rpc = ScanStandIn(funded)
+			silence()
+			res = discover(d_cfg, rpc)
+			end_silence()
+			assert [(e.chain, e.idx, e.addr, str(e.amt)) for e in res] == chk, res
+			assert rpc.scans == [6, 6, 6, 3], rpc.scans # change chain needs one more round
+
+			vmsg('  Resuming interrupted discovery')
+			rpc = ScanStandIn(funded, fail_on=3)
+			silence()
+			try:
+				discover(d_cfg, rpc)
+			except ConnectionError:
+				pass
+			end_silence()
+			state_dir = os.path.join(data_dir, BipHDAddrDiscovery.subdir)
+			assert len(os.listdir(state_dir)) == 1
+			rpc = ScanStandIn(funded)
+			silence()
+			res = discover(d_cfg, rpc)
+			end_silence()
+			assert rpc.scans == [6, 3], rpc.scans
+			assert [(e.chain, e.idx, e.addr, str(e.amt)) for e in res] == chk, res
+
+			vmsg('  Removal of state file on completion')
+			assert os.listdir(state_dir) == []
+
+			vmsg('  Invalid arguments')
+			tool = tool_cmd(d_cfg, proto=proto)
+			eth_tool = tool_cmd(d_cfg, proto=init_proto(d_cfg, 'eth', need_amt=True))
+			chain_xpub = chains[0].xpub
+			ut.process_bad_data((
+				('gap_limit',   'MMGenSystemExit', 'must be positive',
+					lambda: asyncio.run(tool.discover_addrs(xpub, gap_limit=0))),
+				('coin',        'MMGenSystemExit', 'not supported',
+					lambda: asyncio.run(eth_tool.discover_addrs(xpub))),
+				('key depth',   'ValueError',      'account-level key',
+					lambda: BipHDAddrDiscovery(d_cfg, proto, None, chain_xpub)),
+			), pfx='')
+
+		return True
+
 	def parse_extended(self, name, ut):
 		vmsg('Parsing and validating extended keys:\n')
 
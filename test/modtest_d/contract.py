@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+
+"""
+test.modtest_d.contract: Ethereum contract unit tests for the MMGen suite
+"""
+
+import asyncio
+from collections import namedtuple
+
+from mmgen.cfg import Config
+from mmgen.protocol import init_proto
+from mmgen.proto.eth.contract import Token, Multicall
+
+from ..include.common import vmsg
+
+token_addr     = 'deadbeef' * 5
+multicall_addr = 'ca11bde05977b3631167028862be2a173976ca11'
+
+def word(n):
+	return '{:064x}'.format(n)
+
+class DevChainStandIn:
+	"""
+	stand-in for a dev chain node with a token and a Multicall contract deployed
+	"""
+	daemon = namedtuple('daemon', ['id'])('geth')
+
+	def __init__(self, balances):
+		self.balances = balances
+		self.reqs = []
+
+	def eth_call(self, args):
+		to, data = args['to'][2:], args['input'][2:]
+		match to:
+			case x if x == token_addr:
+				assert data[:8] == '70a08231', data[:8] # balanceOf(address)
+				return '0x' + word(self.balances.get(data[32:72], 0))
+			case x if x == multicall_addr:
+				assert data[:8] == '252dba42', data[:8] # aggregate((address,bytes)[])
+				d = bytes.fromhex(data[8:])
+				def w(pos):
+					return int.from_bytes(d[pos:pos+32], 'big')
+				start = w(0) + 32
+				ret = []
+				for i in range(w(start - 32)):
+					pos = start + w(start + 32 * i)
+					cd_pos = pos + w(pos + 32)
+					ret.append(self.eth_call({
+						'to':    '0x' + d[pos+12:pos+32].hex(),
+						'input': '0x' + d[cd_pos+32:cd_pos+32+w(cd_pos)].hex()})[2:])
+				tails = [word(len(r) // 2) + r.ljust(-(-len(r) // 64) * 64, '0') for r in ret]
+				heads = [word(32 * len(ret) + sum(len(t) // 2 for t in tails[:i])) for i in range(len(ret))]
+				return '0x' + word(1234) + word(64) + word(len(ret)) + ''.join(heads) + ''.join(tails)
+			case _:
+				return '0x'
+
+	async def call(self, method, args, block):
+		assert method == 'eth_call'
+		self.reqs.append('call')
+		return self.eth_call(args)
+
+	async def batch_call(self, method, param_list):
+		assert method == 'eth_call'
+		self.reqs.append(('batch', len(param_list)))
+		return [self.eth_call(args) for args, block in param_list]
+
+class unit_tests:
+
+	altcoin_deps = ('multicall_encoding', 'token_balances')
+
+	def multicall_encoding(self, name, ut, desc='Multicall aggregate() encoding and decoding'):
+		cfg = Config({'coin': 'eth', 'test_suite': True})
+		proto = init_proto(cfg, 'eth', need_amt=True)
+		mc = Multicall(cfg, proto, '0xcA11bde05977b3631167028862bE2a173976CA11')
+		assert mc.addr == multicall_addr
+
+		data = mc.create_aggregate_data([(token_addr, '70a08231' + word(0xab)), (token_addr, '06fdde03')])
+		vmsg(data)
+		assert data == (
+			'252dba42' + word(32) + word(2) + word(64) + word(64 + 160)
+			+ token_addr.rjust(64, '0') + word(64) + word(36) + '70a08231' + word(0xab) + '0' * 56
+			+ token_addr.rjust(64, '0') + word(64) + word(4) + '06fdde03' + '0' * 56)
+
+		res = '0x' + word(77) + word(64) + word(2) + word(64) + word(128) + word(32) + word(5) + word(3) + 'ab' * 3
+		assert mc.parse_aggregate_result(res) == [word(5), 'ababab']
+		return True
+
+	def token_balances(self, name, ut, desc='batched token balance queries'):
+
+		async def run():
+			cfg = Config({'coin': 'eth', 'test_suite': True})
+			proto = init_proto(cfg, 'eth', need_amt=True)
+			accts = [f'{n:040x}' for n in range(1, 1201)]
+			rpc = DevChainStandIn({a: n * 10**15 for n, a in enumerate(accts, 1) if n % 3})
+			chk = [proto.coin_amt(f'{n/1000:.3f}' if n % 3 else '0') for n in range(1, 1201)]
+			token = Token(cfg, proto, token_addr, rpc=rpc, decimals=18)
+
+			vmsg('Fetching balances via JSON-RPC batch requests')
+			assert await token.get_balances(accts) == chk
+			assert rpc.reqs == [('batch', 1000), ('batch', 200)], rpc.reqs
+
+			vmsg('Fetching balances via Multicall contract')
+			rpc.reqs.clear()
+			mc_cfg = Config({'coin': 'eth', 'eth_mainnet_multicall_addr': multicall_addr, 'test_suite': True})
+			mc_proto = init_proto(mc_cfg, 'eth', need_amt=True)
+			assert mc_proto.multicall_addr == multicall_addr
+			mc_token = Token(mc_cfg, mc_proto, token_addr, rpc=rpc, decimals=18)
+			assert await mc_token.get_balances(accts) == chk
+			assert rpc.reqs == ['call'] * 3, rpc.reqs
+
+			vmsg('Checking single-account query')
+			assert await token.get_balance(accts[4]) == chk[4]
+
+			return (cfg, proto, mc_cfg, mc_proto, rpc, accts[:2])
+
+		cfg, proto, mc_cfg, mc_proto, rpc, accts = asyncio.run(run())
+
+		def get_bad_balances(cfg, proto):
+			return asyncio.run(Token(cfg, proto, 'ab' * 20, rpc=rpc, decimals=18).get_balances(accts))
+
+		vmsg('Checking failed calls')
+		ut.process_bad_data((
+			('no contract',             'RPCFailure', 'call to token', lambda: get_bad_balances(cfg, proto)),
+			('no contract (Multicall)', 'RPCFailure', 'call to token', lambda: get_bad_balances(mc_cfg, mc_proto)),
+		), pfx='')
+		return True
@@ -6,7 +6,9 @@ test.modtest_d.ecc: elliptic curve unit test for the MMGen suite
 
 from mmgen.proto.secp256k1.secp256k1 import (
 	pubkey_gen,
+	pubkey_gen_batch,
 	pubkey_tweak_add,
+	pubkey_tweak_add_batch,
 	pubkey_check,
 	sign_msghash,
 	pubkey_recover,
@@ -128,6 +130,66 @@ class unit_tests:
 
 		return True
 
+	def pubkey_gen_batch(self, name, ut):
+		vmsg('  Generating pubkeys in batch mode:')
+		privkeys = [bytes.fromhex(k) for k in (
+			'beadcafe' * 8,
+			f'{1:064x}',
+			f'{secp256k1_group_order-1:x}',
+			'0123456789abcdef' * 4)]
+		for compressed, length in ((False, 65), (True, 33)):
+			vmsg(f'    {compressed=}')
+			res = pubkey_gen_batch(b''.join(privkeys), int(compressed))
+			assert len(res) == length * len(privkeys)
+			for n, privkey in enumerate(privkeys):
+				assert res[n*length:(n+1)*length] == pubkey_gen(privkey, int(compressed))
+		assert pubkey_gen_batch(b'', 1) == b''
+		assert pubkey_gen_batch(bytearray(privkeys[0]), 1) == pubkey_gen(privkeys[0], 1)
+
+		def batch1(): pubkey_gen_batch(privkeys[0] + bytes(32), 1)
+		def batch2(): pubkey_gen_batch(privkeys[0] + bytes.fromhex('ab'*31), 1)
+		def batch3(): pubkey_gen_batch(1, 1)
+
+		bad_data = (
+			('privkey #1 == 0',   'ValueError', 'Private key #1 not in allowable range', batch1),
+			('buffer len == 63',  'ValueError', 'not a multiple of 32 bytes',            batch2),
+			('bad args',          'ValueError', 'Unable to parse',                       batch3),
+		)
+
+		ut.process_bad_data(bad_data, pfx='')
+		return True
+
+	def pubkey_tweak_add_batch(self, name, ut):
+		vmsg('  Adding tweaks to a pubkey in batch mode:')
+		tweaks = [bytes.fromhex(k) for k in (
+			'beadcafe' * 8,
+			f'{1:064x}',
+			f'{secp256k1_group_order-1:x}',
+			'0123456789abcdef' * 4)]
+		for compressed, length in ((False, 65), (True, 33)):
+			vmsg(f'    {compressed=}')
+			pubkey = pubkey_gen(bytes.fromhex('deadbeef' * 8), int(compressed))
+			res = pubkey_tweak_add_batch(pubkey, b''.join(tweaks))
+			assert len(res) == length * len(tweaks)
+			for n, tweak in enumerate(tweaks):
+				assert res[n*length:(n+1)*length] == pubkey_tweak_add(pubkey, tweak)
+		assert pubkey_tweak_add_batch(pubkey, b'') == b''
+
+		def batch1(): pubkey_tweak_add_batch(pubkey, tweaks[0] + bytes(32))
+		def batch2(): pubkey_tweak_add_batch(pubkey, tweaks[0] + bytes.fromhex('ab'*31))
+		def batch3(): pubkey_tweak_add_batch(bytes.fromhex('03'*64), tweaks[0])
+		def batch4(): pubkey_tweak_add_batch(pubkey, 1)
+
+		bad_data = (
+			('tweak #1 == 0',     'ValueError', 'Tweak #1 not in allowable range',        batch1),
+			('buffer len == 63',  'ValueError', 'not a multiple of 32 bytes',             batch2),
+			('bad pubkey',        'ValueError', 'length not 33 or 65 bytes',              batch3),
+			('bad args',          'ValueError', 'Unable to parse',                        batch4),
+		)
+
+		ut.process_bad_data(bad_data, pfx='')
+		return True
+
 	def pubkey_errors(self, name, ut):
 		vmsg('  Testing error handling for public key ops')
 
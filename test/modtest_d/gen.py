@@ -85,6 +85,31 @@ def do_tests(coin, internal_keccak=False):
 		do_test(proto, wif, addr, addr_type, internal_keccak)
 	return True
 
+def do_batch_tests(coin, addr_types, *, network='mainnet'):
+	proto = init_proto(cfg, coin, network=network)
+	import hashlib
+	for addr_type in addr_types:
+		at = MMGenAddrType(proto, addr_type)
+		privkeys = [PrivKey(
+				proto,
+				hashlib.sha256(str(i).encode()).digest(),
+				compressed  = at.compressed,
+				pubkey_type = at.pubkey_type)
+			for i in range(50)]
+		for n, backend in enumerate(get_backends(at.pubkey_type)):
+			qmsg(blue(f'  Testing batch API of backend {backend!r} for {proto.coin} {network} addr type {at.name!r}'))
+			kg = KeyGenerator(cfg, proto, at.pubkey_type, backend=n+1, silent=True)
+			ag = AddrGenerator(cfg, proto, at)
+			data = [kg.gen_data(k) for k in privkeys]
+			assert kg.gen_data_batch(privkeys) == data
+			assert kg.gen_data_batch([]) == []
+			addrs = [ag.to_addr(d) for d in data]
+			addrs_batch = ag.to_addrs(data)
+			assert addrs_batch == addrs
+			for a, b in zip(addrs_batch, addrs):
+				assert type(a) is type(b) and a.__dict__ == b.__dict__, f'{a.__dict__} != {b.__dict__}'
+	return True
+
 class unit_tests:
 
 	altcoin_deps = ('eth', 'xmr', 'zec')
@@ -92,6 +117,46 @@ class unit_tests:
 	def btc(self, name, ut):
 		return do_tests('btc')
 
+	def batch(self, name, ut):
+		return (
+			do_batch_tests('btc', ('L', 'C', 'S', 'B')) and
+			do_batch_tests('btc', ('C', 'S', 'B'), network='testnet') and
+			do_batch_tests('ltc', ('C', 'S', 'B')) and
+			do_batch_tests('bch', ('C',)) and
+			do_batch_tests('bch', ('C',), network='regtest'))
+
+	def base58(self, name, ut):
+		import os
+		from mmgen.proto.btc import common
+		data = [b'', b'\x00', b'\x00\x00\x01', b'\x00' * 25, b'\xff' * 64] + [
+			b'\x00' * (n % 3) + os.urandom(n % 40) for n in range(500)]
+		ext = common.b58encode_batch_ext
+		if ext:
+			qmsg(blue('  Testing Base58 extension module'))
+			ref = common.b58chk_encode_batch(data)
+			assert [common.b58chk_encode(d) for d in data] == ref
+			common.b58encode_batch_ext = None
+		try:
+			qmsg(blue('  Testing pure-Python Base58 encoders'))
+			if ext:
+				assert common.b58chk_encode_batch(data) == ref
+			assert [common.b58chk_decode(s) for s in common.b58chk_encode_batch(data)] == data
+			assert [common.b58chk_decode(common.b58chk_encode(d)) for d in data] == data
+		finally:
+			common.b58encode_batch_ext = ext
+
+		qmsg(blue('  Testing round-trip check of batch-encoded addresses'))
+		proto = init_proto(cfg, 'btc')
+		for fmt, addrs in (
+				('p2pkh',  proto.pubhashes2addrs([bytes([n]) * 20 for n in range(100)], 'p2pkh')),
+				('bech32', proto.pubhashes2bech32addrs([bytes([n]) * 20 for n in range(100)]))):
+			bad = addrs.copy()
+			bad[64] = proto.make_coinaddr(bad[64], bad[65].bytes, bad[64].ver_bytes, fmt)
+			ut.process_bad_data((
+				(f'bad {fmt} address', 'MMGenError', 'round-trip check', lambda: proto.check_batch_addrs(bad)),
+			), pfx='')
+		return True
+
 	def eth(self, name, ut):
 		do_tests('eth')
 		return do_tests('eth', internal_keccak=True)
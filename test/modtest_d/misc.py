@@ -10,6 +10,17 @@ from collections import namedtuple
 from mmgen.color import yellow, blue, brown
 from ..include.common import vmsg
 
+def _mproc_worker(state, item):
+	from mmgen.util import die
+	match item:
+		case 'exit':
+			die(2, 'worker exiting')
+		case 'sysexit':
+			raise SystemExit(3)
+		case 'keyerror':
+			raise KeyError('foo')
+	return state + item
+
 class unit_tests:
 
 	def format_elapsed_hr(self, name, ut, desc='function util.format_elapsed_hr()'):
@@ -192,3 +203,136 @@ class unit_tests:
 			assert dec_enc == out, f'{dec_enc} != {out}'
 
 		return True
+
+	def mproc(self, name, ut, desc='multi-process work distribution'):
+		import sys
+		from mmgen.mproc import pool_imap
+
+		if sys.platform != 'linux': # fork() start method required
+			return True
+
+		def run(items):
+			return list(pool_imap(_mproc_worker, items, jobs=2, state='x'))
+
+		assert run(['a', 'b', 'c']) == ['xa', 'xb', 'xc']
+
+		vmsg('Re-raising worker exceptions in the parent process')
+		for item, exc_type, chk in (
+				('exit',     'MMGenSystemExit', lambda e: e.mmcode == 2 and str(e) == 'worker exiting'),
+				('sysexit',  'SystemExit',      lambda e: e.code == 3),
+				('keyerror', 'KeyError',        lambda e: e.args == ('foo',))):
+			try:
+				run(['a', item])
+			except BaseException as e:
+				vmsg(f'  {type(e).__name__}: {e!r}')
+				assert type(e).__name__ == exc_type, type(e).__name__
+				assert chk(e), repr(e)
+			else:
+				raise AssertionError(f'{item}: no exception raised')
+
+		return True
+
+	def find_incog_data(self, name, ut, desc='incog data search across file regions'):
+		import os
+		from io import StringIO
+		from hashlib import sha256
+		from tempfile import TemporaryDirectory
+		from mmgen.cfg import Config
+		from mmgen.util import gv
+		from mmgen.tool.fileutil import tool_cmd
+
+		rs = 1 << 12
+		iv = bytes.fromhex('a5' * 16)
+		incog_id = sha256(iv).hexdigest()[:8].upper()
+
+		class tool(tool_cmd):
+			incog_search_region_size = rs
+
+		def run(fn, **kwargs):
+			stderr_save, gv.stderr = gv.stderr, StringIO()
+			try:
+				tool(Config({'test_suite': True})).find_incog_data(fn, incog_id, keep_searching=True, **kwargs)
+				return [int(m) for m in re.findall(r'found at offset (\d+)', gv.stderr.getvalue())]
+			finally:
+				gv.stderr = stderr_save
+
+		with TemporaryDirectory() as tmpdir:
+			fn = os.path.join(tmpdir, 'incog-data')
+			for start in (0, 1000):
+				b = start + rs # first region boundary
+				offsets = [b - 20, b - 3] # ending before the boundary, straddling it
+				data = bytearray(os.urandom(start + 3 * rs + 100))
+				for ofs in offsets:
+					data[ofs:ofs+16] = iv
+				with open(fn, 'wb') as fp:
+					fp.write(data)
+				for jobs in (1, 2):
+					vmsg(f'  start={start} jobs={jobs}')
+					assert run(fn, start=start, jobs=jobs) == offsets
+				assert run(fn, start=offsets[1], jobs=2) == offsets[1:] # resumed search
+		return True
+
+	def mmenc_stream(self, name, ut, desc='streaming MMGen encryption format'):
+		from io import BytesIO
+		from mmgen.cfg import Config
+		from mmgen.crypto import Crypto
+		from ..include.common import silence, end_silence
+
+		crypto = Crypto(Config({'usr_randchars': 0, 'quiet': True, 'test_suite': True}))
+		chunk_exp = 10
+		chunk_len = 1 << chunk_exp
+		pw = 'φυβαρ'
+
+		def encrypt(data):
+			return b''.join(crypto.mmgen_encrypt_stream(
+				BytesIO(data), passwd=pw, hash_preset='1', chunk_exp=chunk_exp))
+
+		def decrypt(enc_data, *, passwd=pw, max_legacy_len=None):
+			ret = crypto.mmgen_decrypt_file(
+				BytesIO(enc_data), passwd=passwd, hash_preset='1', max_legacy_len=max_legacy_len)
+			return ret if ret is False or isinstance(ret, bytes) else b''.join(ret)
+
+		def altered(enc_data, pos):
+			d = bytearray(enc_data)
+			d[pos] ^= 1
+			return bytes(d)
+
+		silence()
+
+		hdr_len = crypto.mmenc_salt_len + crypto.aesctr_iv_len + len(crypto.mmenc_stream_magic) + 2
+		tag_len = crypto.mmenc_stream_tag_len
+		for data_len in (0, 1, chunk_len - 1, chunk_len, 3 * chunk_len + 5):
+			vmsg(f'  data length: {data_len}')
+			data = crypto.get_random(data_len)
+			enc_data = encrypt(data)
+			assert len(enc_data) == hdr_len + data_len + tag_len * (data_len // chunk_len + 1)
+			assert decrypt(enc_data) == data
+			assert crypto.mmgen_decrypt(enc_data, passwd=pw, hash_preset='1') == data
+
+		legacy_data = b'legacy data\n'
+		legacy_enc_data = crypto.mmgen_encrypt(legacy_data, passwd=pw, hash_preset='1')
+		assert decrypt(legacy_enc_data) == legacy_data
+		assert decrypt(legacy_enc_data, max_legacy_len=len(legacy_enc_data)) == legacy_data
+		assert decrypt(enc_data, passwd='foo') is False
+		assert decrypt(enc_data, passwd='foo', max_legacy_len=len(enc_data)) is False
+		assert decrypt(enc_data, passwd='foo', max_legacy_len=chunk_len) is False # oversized, bad pw
+		assert decrypt(legacy_enc_data, max_legacy_len=16) is False # oversized legacy
+		assert decrypt(altered(enc_data, 0)) is False # altered salt is indistinguishable from bad passphrase
+
+		end_silence()
+
+		bad_data = (
+			('altered chunk',    'EncryptedDataAuthError', 'altered',   lambda: decrypt(altered(enc_data, hdr_len + 5))),
+			('altered tag',      'EncryptedDataAuthError', 'altered',   lambda: decrypt(altered(enc_data, -1))),
+			('truncated chunk',  'EncryptedDataAuthError', 'altered',   lambda: decrypt(enc_data[:-1])),
+			('truncated file',   'EncryptedDataAuthError', 'truncated', lambda: decrypt(enc_data[:hdr_len + chunk_len + tag_len])),
+			('appended data',    'EncryptedDataAuthError', 'altered',   lambda: decrypt(enc_data + b'\x00')),
+		)
+
+		silence()
+		try:
+			ut.process_bad_data(bad_data, pfx='')
+		finally:
+			end_silence()
+
+		return True
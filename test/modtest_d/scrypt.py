@@ -78,6 +78,38 @@ class unit_test:
 		vmsg('Hash presets (force standalone scrypt module):')
 		test_presets((1, 2, 3))
 
+		cfg.force_standalone_scrypt_module = False
+		cfg.scrypt_jobs = 3
+		vmsg('Hash presets (parallel lanes):')
+		test_presets((2, 3, 4) if cfg.fast else (2, 3, 4, 5))
+		cfg.scrypt_jobs = 0
+
+		# default job count is limited by available memory
+		import sys
+		from mmgen.mproc import get_jobs, get_avail_mem
+		if sys.platform == 'linux' and (mem := get_avail_mem()):
+			ps = crypto.get_hash_params('7')
+			assert crypto.get_scrypt_mem(ps) == 256 * 2**20
+			assert get_jobs(cfg, jobs=0, job_mem=mem) == 1
+			assert get_jobs(cfg, jobs=3, job_mem=mem) == 3 # explicit value not limited
+			assert crypto.get_scrypt_jobs(ps) <= max(1, mem // 2 // crypto.get_scrypt_mem(ps))
+
+		# cheap presets and multi-threaded processes are never parallelized
+		cfg.scrypt_jobs = 3
+		assert crypto.get_scrypt_jobs(crypto.get_hash_params('2')) == 1
+		ps = crypto.get_hash_params('3')
+		if sys.platform == 'linux' and crypto.get_scrypt_jobs(ps) == 3: # romix extension available
+			import threading
+			ev = threading.Event()
+			th = threading.Thread(target=ev.wait)
+			th.start()
+			try:
+				assert crypto.get_scrypt_jobs(ps) == 1
+			finally:
+				ev.set()
+				th.join()
+		cfg.scrypt_jobs = 0
+
 		if cfg.quiet:
 			end_silence()
 
@@ -190,3 +190,62 @@ class unit_tests:
 		vmsg(f'{collisions} collisions, last_sid {last_sid}')
 
 		return True
+
+	def index(self, name, ut, desc='parallel generation and on-disk index'):
+		import os, shutil
+		from mmgen.cfg import Config
+
+		seed_bin = bytes.fromhex('12abcdef' * 8) # 95B3D78D
+		ss_count = 2000 if cfg.fast else 5000
+
+		ref = Seed(cfg, seed_bin=seed_bin).subseeds
+		ref._generate(ss_count)
+
+		vmsg('Testing parallel generation')
+		mp_cfg = Config({'jobs': 3, 'test_suite': True})
+		ss = Seed(mp_cfg, seed_bin=seed_bin).subseeds
+		ss._generate(ss_count)
+		for k in ('long', 'short'):
+			assert ss.data[k].keys == ref.data[k].keys
+			assert dict(ss.data[k]) == dict(ref.data[k])
+
+		sid = ref.data['short'].keys[ss_count-10]
+		ss = Seed(mp_cfg, seed_bin=seed_bin).subseeds
+		assert ss.get_subseed_by_seed_id(sid, last_idx=ss_count).sid == sid
+		assert len(ss) == ss_count - 9, len(ss)
+
+		vmsg('Testing subseed index')
+		ix_cfg = Config({'subseed_index': True, 'jobs': 3, 'test_suite': True})
+		ss = Seed(ix_cfg, seed_bin=seed_bin).subseeds
+		if os.path.exists(ss._get_index().path):
+			os.unlink(ss._get_index().path)
+			ss = Seed(ix_cfg, seed_bin=seed_bin).subseeds
+		ss._generate(ss_count)
+		path = ss.index.path
+		vmsg(f'  Index file: {path}')
+
+		ss = Seed(ix_cfg, seed_bin=seed_bin).subseeds # reload from disk
+		subseed = ss.get_subseed_by_seed_id(sid) # found beyond default range
+		assert subseed.sid == sid and subseed.idx == ss_count - 9, subseed.idx
+		assert len(ss) == ss_count - 9, len(ss)
+		assert ss.index.saved_len == ss_count, ss.index.saved_len
+		ss = Seed(ix_cfg, seed_bin=seed_bin).subseeds
+		assert ss.get_subseed_by_seed_id(sid, last_idx=10) is None # explicit range is respected
+		assert len(ss) == 10, len(ss)
+
+		ss = Seed(ix_cfg, seed_bin=seed_bin).subseeds
+		assert ss.format(1, ss_count) == ref.format(1, ss_count)
+		assert ss.get_subseed_by_seed_id('EEEEEEEE', last_idx=ss_count + 100) is None
+		assert len(ss) == ss_count + 100, len(ss)
+
+		ss = Seed(ix_cfg, seed_bin=seed_bin).subseeds # index extended by previous search
+		assert ss._get_index().saved_len == ss_count + 100, ss.index.saved_len
+		for k in ('long', 'short'):
+			assert ss.data[k].keys == [] # data loaded on demand only
+
+		# encrypted with a key derived from the parent seed: a different seed can’t read it
+		ss2 = Seed(ix_cfg, seed_bin=bytes.fromhex('12abcdef' * 7 + '12abcdee')).subseeds
+		assert ss2._get_index().path != path and ss2.index.saved_len == 0
+
+		shutil.rmtree(os.path.dirname(path))
+		return True
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+
+"""
+test.modtest_d.tw: tracking wallet unit tests for the MMGen suite
+"""
+
+import json, asyncio
+from tempfile import TemporaryDirectory
+
+from mmgen.cfg import Config
+from mmgen.protocol import init_proto
+from mmgen.tw.ctl import TwCtl
+from mmgen.tw.shared import TwLabel
+from mmgen.proto.btc.tw.txcache import BitcoinTwTxCache
+from mmgen.tw.blockcache import TwBlockCache
+
+from ..include.common import vmsg, silence, end_silence
+
+addrs = [f'{n:040x}' for n in range(1, 6)]
+
+class ChainStandIn:
+	"""
+	stand-in for a coin daemon: block hashes by height, with reorgs
+	"""
+	def __init__(self, height):
+		self.hashes = [f'{n:064x}' for n in range(height + 1)]
+		self.ncalls = 0
+
+	@property
+	def blockcount(self):
+		return len(self.hashes) - 1
+
+	def reorg(self, height, new_height):
+		self.hashes[height:] = [f'{n:062x}ff' for n in range(height, new_height + 1)]
+
+	async def call(self, method, arg):
+		self.ncalls += 1
+		match method:
+			case 'getblockhash':
+				return self.hashes[arg]
+			case 'getblockheader':
+				return {'time': 1_700_000_000 + self.hashes.index(arg) * 600 + (arg[-2:] == 'ff')}
+
+	async def gathered_call(self, method, args_list):
+		return [await self.call(method, *args) for args in args_list]
+
+	def mktx(self, n, height):
+		return {
+			'txid': f'{n:064x}',
+			'blockhash': self.hashes[height],
+			'confirmations': self.blockcount + 1 - height}
+
+async def open_twctl(cfg, proto, mode):
+	return await TwCtl(cfg, proto, mode=mode, no_rpc=True)
+
+class unit_tests:
+
+	altcoin_deps = ('store_journal', 'balance_prefetch')
+
+	def store_journal(self, name, ut, desc='tracking wallet store journal'):
+
+		async def run(data_dir):
+			cfg = Config({'coin': 'eth', 'network': 'regtest', 'data_dir': data_dir, 'test_suite': True})
+			proto = init_proto(cfg, 'eth', network='regtest', need_amt=True)
+
+			vmsg('Creating wallet and importing addresses')
+			tw = await open_twctl(cfg, proto, 'i')
+			for n, addr in enumerate(addrs, 1):
+				await tw.import_address(addr, label=TwLabel(proto, f'98831F3A:E:{n} label{n}'))
+			tw.write()
+			snapshot = tw.tw_path.read_text()
+			assert not tw.journal_path.exists()
+
+			vmsg('Journaling balance updates')
+			tw.aggressive_sync = True
+			for n, addr in enumerate(addrs, 1):
+				tw.cache_balance(addr, proto.coin_amt(f'{n}.5'), session_cache={}, data_root=tw.data_root)
+			tw.cache_balance(addrs[0], proto.coin_amt('7'), session_cache={}, data_root=tw.data_root)
+			assert tw.tw_path.read_text() == snapshot, 'snapshot was rewritten'
+			assert len(tw.journal_path.read_text().splitlines()) == len(addrs) + 2
+
+			vmsg('Replaying journal in read-only instance')
+			tw_ro = await open_twctl(cfg, proto, 'r')
+			assert tw_ro.data_root[addrs[0]]['balance'] == '7'
+			assert tw_ro.data_root[addrs[4]]['balance'] == '5.5'
+			del tw_ro
+
+			vmsg('Ignoring partial trailing line')
+			with open(tw.journal_path, 'a') as fp:
+				fp.write('["set",["accounts"')
+			tw_ro = await open_twctl(cfg, proto, 'r')
+			assert tw_ro.data_root[addrs[0]]['balance'] == '7'
+			del tw_ro
+
+			vmsg('Detecting journal altered by another program')
+			ut.process_bad_data((
+				('altered journal', 'MMGenError', 'altered by some other program',
+					lambda: tw.cache_balance(
+						addrs[1], proto.coin_amt('1'), session_cache={}, data_root=tw.data_root)),
+			), pfx='')
+
+			vmsg('Compacting journal into snapshot')
+			tw2 = await open_twctl(cfg, proto, 'w')
+			tw2.aggressive_sync = True
+			tw2.cache_balance(addrs[1], proto.coin_amt('8'), session_cache={}, data_root=tw2.data_root)
+			tw2.write()
+			assert not tw2.journal_path.exists()
+			data = json.loads(tw2.tw_path.read_text())
+			assert data['accounts'][addrs[0]]['balance'] == '7'
+			assert data['accounts'][addrs[1]]['balance'] == '8'
+
+			vmsg('Ignoring stale journal')
+			tw2.journal_path.write_text(
+				json.dumps({'magic': 'MMGenTwJournal', 'snapshot': '0' * 16}) + '\n' +
+				json.dumps(['set', ['accounts', addrs[2], 'balance'], '99']) + '\n')
+			tw_ro = await open_twctl(cfg, proto, 'r')
+			assert tw_ro.data_root[addrs[2]]['balance'] == '3.5'
+			del tw_ro
+
+			tw.mode = tw2.mode = 'r' # prevent write on exit
+			return True
+
+		with TemporaryDirectory() as data_dir:
+			return asyncio.run(run(data_dir))
+
+	def balance_prefetch(self, name, ut, desc='tracking wallet balance prefetch'):
+
+		async def run(data_dir):
+			cfg = Config({
+				'coin': 'eth',
+				'network': 'regtest',
+				'data_dir': data_dir,
+				'test_suite': True})
+			proto = init_proto(cfg, 'eth', network='regtest', need_amt=True)
+
+			tw = await open_twctl(cfg, proto, 'i')
+			for n, addr in enumerate(addrs, 1):
+				await tw.import_address(addr, label=TwLabel(proto, f'98831F3A:E:{n} label{n}'))
+			tw.cur_balances[addrs[0]] = '0.25' # balance fetched earlier in session
+
+			calls = []
+			async def rpc_get_balances(fetch_addrs, block='latest'):
+				calls.append(fetch_addrs)
+				return [proto.coin_amt(str(addrs.index(a) + 1)) for a in fetch_addrs]
+			tw.rpc_get_balances = rpc_get_balances
+
+			vmsg('Fetching uncached balances in a single batch')
+			bals = await tw.get_balances(addrs)
+			assert calls == [addrs[1:]], calls
+			assert bals[addrs[0]] == proto.coin_amt('0.25')
+			assert bals[addrs[4]] == proto.coin_amt('5')
+			assert tw.cur_balances[addrs[4]] == '5'
+			assert tw.data_root[addrs[4]]['balance'] == '5'
+
+			vmsg('Serving repeated lookups from the session cache')
+			bals = await tw.get_balances(addrs[2:])
+			assert len(calls) == 1, calls
+			assert await tw.get_balance(addrs[3]) == proto.coin_amt('4')
+
+			vmsg('Refreshing the session cache with ‘force_rpc’')
+			bals = await tw.get_balances(addrs[:2], force_rpc=True)
+			assert calls[1] == addrs[:2], calls
+			assert bals[addrs[0]] == proto.coin_amt('1')
+			assert tw.cur_balances[addrs[0]] == '1'
+
+			tw.mode = 'r' # prevent write on exit
+			return True
+
+		with TemporaryDirectory() as data_dir:
+			return asyncio.run(run(data_dir))
+
+	def txhist_cache(self, name, ut, desc='transaction history cache'):
+
+		async def run(data_dir):
+			cfg = Config({'coin': 'btc', 'data_dir': data_dir, 'test_suite': True})
+			proto = init_proto(cfg, 'btc', need_amt=True)
+			rpc = ChainStandIn(100)
+
+			vmsg('Caching confirmed transactions')
+			tc = BitcoinTwTxCache(cfg, proto, 'mmgen-tracking-wallet')
+			await tc.check_chain(rpc)
+			for n, height in ((1, 50), (2, 90), (3, 99)):
+				tc.add('prevout', rpc.mktx(n, height))
+			tc.add('wallet', rpc.mktx(4, 95))
+			tc.add('wallet', {'txid': 'ab' * 32, 'confirmations': 0}) # unconfirmed, not cached
+			tc.save()
+
+			vmsg('Updating confirmations')
+			rpc.hashes.extend(f'{n:064x}' for n in range(101, 111))
+			tc = BitcoinTwTxCache(cfg, proto, 'mmgen-tracking-wallet')
+			await tc.check_chain(rpc)
+			assert tc.get('prevout', f'{1:064x}')['confirmations'] == 61
+			assert tc.get('wallet', f'{4:064x}', blockhash=rpc.hashes[95])['confirmations'] == 16
+			assert tc.get('wallet', f'{4:064x}', blockhash=rpc.hashes[96]) is None
+			assert tc.get('wallet', 'ab' * 32) is None
+			tc.save()
+
+			vmsg('Discarding transactions from orphaned blocks')
+			rpc.reorg(92, 112)
+			rpc.ncalls = 0
+			tc = BitcoinTwTxCache(cfg, proto, 'mmgen-tracking-wallet')
+			await tc.check_chain(rpc)
+			assert rpc.ncalls == 2 + 4, rpc.ncalls # tip, saved tip, block of each cached tx
+			assert tc.get('prevout', f'{1:064x}')['confirmations'] == 63
+			assert tc.get('prevout', f'{2:064x}')['confirmations'] == 23
+			assert tc.get('prevout', f'{3:064x}') is None
+			assert tc.get('wallet', f'{4:064x}') is None
+			tc.save()
+
+			vmsg('Discarding corrupted cache')
+			with open(tc.path, 'w') as fp:
+				fp.write('{')
+			silence()
+			tc = BitcoinTwTxCache(cfg, proto, 'mmgen-tracking-wallet')
+			end_silence()
+			assert tc.get('prevout', f'{1:064x}') is None
+			return True
+
+		with TemporaryDirectory() as data_dir:
+			return asyncio.run(run(data_dir))
+
+	def block_cache(self, name, ut, desc='tracking wallet view block cache'):
+
+		async def run(data_dir):
+			cfg = Config({'coin': 'btc', 'data_dir': data_dir, 'block_cache': True, 'test_suite': True})
+			proto = init_proto(cfg, 'btc', need_amt=True)
+			rpc = ChainStandIn(300)
+
+			def chk_times(times, *, reorged=()):
+				for h, t in times.items():
+					assert t == 1_700_000_000 + h * 600 + (h in reorged), (h, t)
+
+			vmsg('Fetching block times')
+			bc = TwBlockCache(cfg, proto, rpc)
+			chk_times(await bc.get_times([5, 150, 150, 250, 299]))
+			assert rpc.ncalls == 8, rpc.ncalls # two calls per distinct height
+			chk_times(await bc.get_times([5, 299]))
+			assert rpc.ncalls == 8, rpc.ncalls
+
+			vmsg('Loading deep blocks from disk')
+			rpc.ncalls = 0
+			bc = TwBlockCache(cfg, proto, rpc)
+			assert sorted(bc.blocks) == [5, 150], sorted(bc.blocks)
+			chk_times(await bc.get_times([5, 150, 250]))
+			assert rpc.ncalls == 1 + 2, rpc.ncalls # chain check, one uncached height
+
+			vmsg('Discarding cached blocks after deep reorganization')
+			rpc.reorg(120, 300)
+			bc = TwBlockCache(cfg, proto, rpc)
+			chk_times(await bc.get_times([5, 150]), reorged=[150])
+
+			vmsg('Checking disabled on-disk cache')
+			cfg2 = Config({'coin': 'btc', 'data_dir': data_dir, 'test_suite': True})
+			bc = TwBlockCache(cfg2, proto, rpc)
+			assert bc.path is None and not bc.blocks
+			chk_times(await bc.get_times([5]))
+			return True
+
+		with TemporaryDirectory() as data_dir:
+			return asyncio.run(run(data_dir))
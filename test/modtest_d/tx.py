@@ -100,6 +100,42 @@ class unit_tests:
 			)
 		)
 
+	async def txkeys(self, name, ut, desc='transaction signing keys from seeds'):
+		from io import StringIO
+		from mmgen.tx.keys import TxKeys
+		from mmgen.wallet import Wallet
+		from mmgen.util import gv
+		from ..include.common import silence, end_silence
+
+		k_cfg = Config({'quiet': True, 'test_suite': True})
+		fn = 'test/ref/0B8D5A[15.31789,14,tl=1320969600].rawtx'
+		wallets = ('test/ref/1378FC64.mmwords', 'test/ref/98831F3A.mmwords')
+
+		async def get_keys(**kwargs):
+			tx = UnsignedTX(cfg=k_cfg, filename=fn, quiet_open=True)
+			stderr_save, gv.stderr = gv.stderr, StringIO()
+			try:
+				keys = TxKeys(k_cfg, tx, passwdfile='', autosign=True, **kwargs).keys
+				return (keys, gv.stderr.getvalue())
+			finally:
+				gv.stderr = stderr_save
+
+		silence()
+		seeds = {s.sid: s for s in (Wallet(k_cfg, fn=wf).seed for wf in wallets)}
+		end_silence()
+
+		vmsg('  Seeds from wallet files')
+		keys, out = await get_keys(seedfiles=list(wallets))
+		vmsg(out)
+		assert keys and 'Unused Seed ID: 1378FC64' in out, out
+
+		vmsg('  Seeds supplied by caller')
+		keys_chk, out = await get_keys(seeds=seeds)
+		vmsg(out)
+		assert [k.sec.wif for k in keys_chk] == [k.sec.wif for k in keys]
+		assert 'Unused Seed ID' not in out, out
+		return True
+
 	def errors(self, name, ut, desc='reading transaction files (error handling)'):
 		async def bad1():
 			await CompletedTX(cfg, filename='foo')
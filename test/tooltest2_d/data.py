@@ -378,6 +378,10 @@ tests = {
 				(md5_hash_strip, '996c047e8543d5dde6f82efc3214a6a1')
 			),
 		],
+		'clear_addr_cache': [
+			(['seed_id=98831F3A'], None),
+			([], None),
+		],
 		'list_shares': [
 			(
 				['3', 'wallet=test/ref/98831F3A.bip39'],
@@ -607,6 +611,22 @@ tests = {
 				([btc_wif2], (redeem_script1, btc_addr3), ['--type=segwit'], 'segwit'),
 			],
 		},
+		'xkey2addrs': {
+			'btc_mainnet': [
+				(
+					[
+						'xpub6EE7ftZshXVADG8giVGtSHebMjX8xH8Vgy1xxfw2iTHdMaNgDidBnUNwBSzLuj52NuWpBnBrCCgCTqHRBSStGdsfCX1xo9mD7WxuGhyJRya',
+						'start=1',
+						'count=3'
+					],
+					(
+						'1KWhuYfNXuUg5Vt8PXE3567B55MzEAs5F3',
+						'15NxQALjwhUovcB8AbuGCsFFXTELrv6ZAt',
+						'16UzFt9iHSKgBRFUFnX24efrmWP2jSygjx'
+					)
+				),
+			],
+		},
 	},
 	# TODO: compressed address files are missing
 	#		'addrfile_compressed_chk':